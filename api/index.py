@@ -5,7 +5,10 @@ Sadece AI Chat ve temel endpoint'ler - 250MB limit için optimize edildi
 import os
 import logging
 from datetime import datetime
+from functools import lru_cache
+from operator import mul, sub
 from typing import Dict, List, Optional
+from array import array
 
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
@@ -903,6 +906,124 @@ BIST_STOCK_DATA = {
 # Backward compatible alias
 MOCK_STOCK_DATA = BIST_STOCK_DATA
 
+class Candles:
+    """
+    OHLCV bars of one quote stored as typed columns
+    
+    Timestamps and volumes are array('q'), prices array('d') - about 40 bytes
+    per bar instead of a six-key dict per bar.
+    """
+    __slots__ = ("t", "o", "h", "l", "c", "v")
+    
+    # Columnar key -> legacy row key
+    FIELDS = {"t": "timestamp", "o": "open", "h": "high", "l": "low", "c": "close", "v": "volume"}
+    
+    def __init__(self):
+        self.t = array("q")
+        self.o = array("d")
+        self.h = array("d")
+        self.l = array("d")
+        self.c = array("d")
+        self.v = array("q")
+    
+    @classmethod
+    def from_chart(cls, timestamps: list, quote: dict) -> "Candles":
+        """Build from Yahoo chart API columns, skipping bars without a close"""
+        bars = cls()
+        opens = quote.get("open") or []
+        highs = quote.get("high") or []
+        lows = quote.get("low") or []
+        closes = quote.get("close") or []
+        volumes = quote.get("volume") or []
+        for i in range(min(len(timestamps), len(closes))):
+            close = closes[i]
+            if close is None:
+                continue
+            bars.append(
+                timestamps[i],
+                opens[i] if i < len(opens) and opens[i] is not None else close,
+                highs[i] if i < len(highs) and highs[i] is not None else close,
+                lows[i] if i < len(lows) and lows[i] is not None else close,
+                close,
+                volumes[i] if i < len(volumes) and volumes[i] is not None else 0,
+            )
+        return bars
+    
+    def append(self, t: int, o: float, h: float, l: float, c: float, v: int) -> None:
+        self.t.append(int(t))
+        self.o.append(o)
+        self.h.append(h)
+        self.l.append(l)
+        self.c.append(c)
+        self.v.append(int(v))
+    
+    def __len__(self) -> int:
+        return len(self.c)
+    
+    def to_columnar(self) -> dict:
+        """Compact JSON form: {t: [], o: [], h: [], l: [], c: [], v: []}"""
+        return {key: getattr(self, key).tolist() for key in self.FIELDS}
+    
+    def to_rows(self) -> list:
+        """Legacy JSON form: one {timestamp, open, high, low, close, volume} dict per bar"""
+        columns = [getattr(self, key).tolist() for key in self.FIELDS]
+        names = list(self.FIELDS.values())
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+def quote_response(data: dict, format: str = "rows") -> dict:
+    """JSON-ready copy of a quote with candles as rows (default) or columns
+    
+    The one boundary between cached quotes (Candles objects) and responses;
+    the cached entry itself is never modified
+    """
+    candles = data.get("candles")
+    if not isinstance(candles, Candles):
+        return data
+    response = dict(data)
+    response["candles"] = candles.to_columnar() if format == "columnar" else candles.to_rows()
+    return response
+
+# ========== Indicator helpers ==========
+# Stdlib only: NumPy/pandas would not fit the function's size limit. Values
+# match the backend's indicator_kernels (ema_sma_seeded, last value of rsi).
+
+@lru_cache(maxsize=256)
+def _ema_decay(period: int, length: int) -> tuple:
+    """Weights (1-k)^(length-1-i) of the bars after the SMA seed"""
+    factor = 1 - 2 / (period + 1)
+    return tuple(factor ** (length - 1 - i) for i in range(length))
+
+def ema_last(values, period: int, default: float = 0.0) -> float:
+    """
+    Last value of an EMA seeded with the SMA of the first ``period`` values
+    
+    The loop e = x*k + e*(1-k) in closed form, summed by map/sum in C with
+    the decay weights cached per length. ``default`` when there are fewer
+    than ``period`` values.
+    """
+    n = len(values)
+    if n < period:
+        return default
+    k = 2 / (period + 1)
+    seed = sum(values[:period]) / period
+    tail = n - period
+    return seed * (1 - k) ** tail + k * sum(map(mul, _ema_decay(period, tail), values[period:]))
+
+def rsi_last(values, period: int = 14, default: float = 50.0) -> float:
+    """
+    RSI of the last ``period`` price changes (simple means of gains and losses)
+    
+    ``default`` when there are fewer than ``period + 1`` values.
+    """
+    n = len(values)
+    if n <= period:
+        return default
+    window = values[n - period - 1:]
+    changes = list(map(sub, window[1:], window[:-1]))
+    avg_gain = sum(c for c in changes if c > 0) / period
+    avg_loss = -sum(c for c in changes if c < 0) / period
+    return 100 - (100 / (1 + avg_gain / (avg_loss + 1e-10)))
+
 def get_mock_data(symbol: str) -> dict:
     """Generate mock stock data for demo purposes"""
     import random
@@ -921,29 +1042,26 @@ def get_mock_data(symbol: str) -> dict:
     prev_close = round(current_price - base["change"], 2)
     
     # Generate mock candles
-    candles = []
+    candles = Candles()
     now = datetime.now()
     for i in range(30):
-        day = now - timedelta(days=30-i)
+        day = (now - timedelta(days=30-i)).replace(hour=9, minute=30, second=0, microsecond=0)
         daily_var = base["price"] * random.uniform(-0.03, 0.03)
         o = round(base["price"] + daily_var, 2)
         h = round(o * random.uniform(1.0, 1.02), 2)
         l = round(o * random.uniform(0.98, 1.0), 2)
         c = round(random.uniform(l, h), 2)
         v = int(random.uniform(1000000, 5000000))
-        candles.append({
-            "timestamp": day.strftime("%Y-%m-%dT09:30:00"),
-            "open": o, "high": h, "low": l, "close": c, "volume": v
-        })
+        candles.append(day.timestamp(), o, h, l, c, v)
     
     return {
         "symbol": symbol,
         "name": base["name"],
         "price": current_price,
-        "open": candles[-1]["open"],
-        "high": candles[-1]["high"],
-        "low": candles[-1]["low"],
-        "volume": candles[-1]["volume"],
+        "open": candles.o[-1],
+        "high": candles.h[-1],
+        "low": candles.l[-1],
+        "volume": candles.v[-1],
         "previousClose": prev_close,
         "change": base["change"],
         "changePercent": base["changePercent"],
@@ -961,10 +1079,12 @@ import asyncio
 # Global HTTP client for connection pooling
 _http_client = None
 
-# Simple in-memory cache for stock data
+# Simple in-memory cache for stock data (stale-while-revalidate)
 _stock_cache: Dict[str, dict] = {}
 _cache_time: Dict[str, datetime] = {}
 CACHE_TTL = 60  # 60 seconds cache
+STALE_MAX_AGE = 24 * 3600  # Serve stale quotes (while refreshing) for up to a day
+_refresh_tasks: Dict[str, "asyncio.Task"] = {}
 
 async def get_http_client():
     """Get or create shared HTTP client"""
@@ -976,15 +1096,59 @@ async def get_http_client():
         )
     return _http_client
 
-async def fetch_yahoo_quote(symbol: str, period: str = "1d") -> dict:
-    """Fetch stock quote from Yahoo Finance API with cache and mock fallback"""
-    # Check cache first
+def _cached_quote(symbol: str, period: str = "1d", max_age: float = STALE_MAX_AGE) -> Optional[dict]:
+    """Return the last good quote if it is younger than max_age seconds"""
+    cache_key = f"{symbol}_{period}"
+    if cache_key not in _stock_cache:
+        return None
+    cache_age = (datetime.now() - _cache_time.get(cache_key, datetime.min)).total_seconds()
+    return _stock_cache[cache_key] if cache_age < max_age else None
+
+def _cached_or_mock(symbol: str, period: str = "1d") -> dict:
+    """Fallback chain when Yahoo is slow or down: stale quote, then mock data"""
+    return _cached_quote(symbol, period) or get_mock_data(symbol)
+
+def _refresh_quote(symbol: str, period: str = "1d") -> "asyncio.Task":
+    """Start (or join) the background refresh of one quote"""
     cache_key = f"{symbol}_{period}"
-    if cache_key in _stock_cache:
-        cache_age = (datetime.now() - _cache_time.get(cache_key, datetime.min)).total_seconds()
-        if cache_age < CACHE_TTL:
-            return _stock_cache[cache_key]
+    task = _refresh_tasks.get(cache_key)
+    if task is None or task.done():
+        task = asyncio.create_task(_fetch_yahoo_quote_live(symbol, period))
+        _refresh_tasks[cache_key] = task
+        
+        def _forget(finished):
+            if _refresh_tasks.get(cache_key) is finished:
+                del _refresh_tasks[cache_key]
+        
+        task.add_done_callback(_forget)
+    return task
+
+async def fetch_yahoo_quote(symbol: str, period: str = "1d") -> dict:
+    """Fetch stock quote from Yahoo Finance API with stale-while-revalidate cache and mock fallback
     
+    The quote is the shared cache entry and its "candles" is a Candles object,
+    which is not JSON-serializable: read it in place and pass the quote through
+    quote_response before it leaves the API
+    """
+    # Fresh cache hit
+    cached = _cached_quote(symbol, period, max_age=CACHE_TTL)
+    if cached:
+        return cached
+    
+    # Stale hit: answer at once, refresh in the background
+    stale = _cached_quote(symbol, period)
+    if stale:
+        _refresh_quote(symbol, period)
+        return stale
+    
+    # Cold miss: wait for the refresh, but a caller timeout does not cancel it
+    # so the quote still lands in the cache for the next request
+    quote = await asyncio.shield(_refresh_quote(symbol, period))
+    return quote or get_mock_data(symbol)
+
+async def _fetch_yahoo_quote_live(symbol: str, period: str = "1d") -> Optional[dict]:
+    """Request one quote from Yahoo and cache it - None if Yahoo gave no usable data"""
+    cache_key = f"{symbol}_{period}"
     try:
         url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
         params = {"interval": "1d", "range": period}
@@ -997,40 +1161,27 @@ async def fetch_yahoo_quote(symbol: str, period: str = "1d") -> dict:
         response = await client.get(url, params=params, headers=headers)
         
         if response.status_code != 200:
-            return get_mock_data(symbol)
+            return None
         
         data = response.json()
         result = data.get("chart", {}).get("result", [])
         
         if not result:
-            return get_mock_data(symbol)
+            return None
         
         meta = result[0].get("meta", {})
         quote = result[0].get("indicators", {}).get("quote", [{}])[0]
         timestamps = result[0].get("timestamp", [])
         
-        closes = quote.get("close", [])
-        opens = quote.get("open", [])
-        highs = quote.get("high", [])
-        lows = quote.get("low", [])
-        volumes = quote.get("volume", [])
+        candles = Candles.from_chart(timestamps, quote)
         
-        if not closes:
-            return get_mock_data(symbol)
-        
-        valid_closes = [c for c in closes if c is not None]
-        valid_opens = [o for o in opens if o is not None]
-        valid_highs = [h for h in highs if h is not None]
-        valid_lows = [l for l in lows if l is not None]
-        valid_volumes = [v for v in volumes if v is not None]
-        
-        if not valid_closes:
-            return get_mock_data(symbol)
+        if not candles:
+            return None
         
-        current_price = valid_closes[-1]
+        current_price = candles.c[-1]
         prev_close = meta.get("previousClose") or meta.get("chartPreviousClose")
-        if not prev_close and len(valid_closes) >= 2:
-            prev_close = valid_closes[-2]
+        if not prev_close and len(candles) >= 2:
+            prev_close = candles.c[-2]
         if not prev_close:
             prev_close = current_price
         
@@ -1041,27 +1192,17 @@ async def fetch_yahoo_quote(symbol: str, period: str = "1d") -> dict:
             "symbol": symbol,
             "name": meta.get("shortName", symbol),
             "price": round(current_price, 2),
-            "open": round(valid_opens[-1], 2) if valid_opens else 0,
-            "high": round(valid_highs[-1], 2) if valid_highs else 0,
-            "low": round(valid_lows[-1], 2) if valid_lows else 0,
-            "volume": valid_volumes[-1] if valid_volumes else 0,
+            "open": round(candles.o[-1], 2),
+            "high": round(candles.h[-1], 2),
+            "low": round(candles.l[-1], 2),
+            "volume": candles.v[-1],
             "previousClose": round(prev_close, 2),
             "change": round(change, 2),
             "changePercent": round(change_percent, 2),
             "currency": meta.get("currency", "TRY"),
             "exchange": meta.get("exchangeName", "IST"),
             "timestamp": timestamps[-1] if timestamps else None,
-            "candles": [
-                {
-                    "timestamp": timestamps[i] if i < len(timestamps) else None,
-                    "open": valid_opens[i] if i < len(valid_opens) else None,
-                    "high": valid_highs[i] if i < len(valid_highs) else None,
-                    "low": valid_lows[i] if i < len(valid_lows) else None,
-                    "close": valid_closes[i] if i < len(valid_closes) else None,
-                    "volume": valid_volumes[i] if i < len(valid_volumes) else None,
-                }
-                for i in range(len(valid_closes))
-            ],
+            "candles": candles,
             "isMockData": False
         }
         
@@ -1072,17 +1213,21 @@ async def fetch_yahoo_quote(symbol: str, period: str = "1d") -> dict:
         return stock_data
     except Exception as e:
         logger.error(f"Yahoo Finance error for {symbol}: {e}")
-        return get_mock_data(symbol)
+        return None
 
-async def fetch_multiple_quotes(symbols: list, timeout: float = 8.0) -> list:
-    """Fetch multiple stock quotes in parallel with timeout"""
+async def fetch_multiple_quotes(symbols: list, timeout: float = 8.0, format: str = "rows") -> list:
+    """Fetch multiple stock quotes in parallel with timeout
+    
+    Returns JSON-ready quotes (quote_response): candles as rows (default)
+    or columns, never the cached Candles object
+    """
     async def fetch_with_timeout(symbol):
         try:
             return await asyncio.wait_for(fetch_yahoo_quote(symbol, period="1d"), timeout=3.0)
         except asyncio.TimeoutError:
-            return get_mock_data(symbol)
+            return _cached_or_mock(symbol)
         except Exception:
-            return get_mock_data(symbol)
+            return _cached_or_mock(symbol)
     
     tasks = [fetch_with_timeout(symbol) for symbol in symbols]
     
@@ -1090,48 +1235,43 @@ async def fetch_multiple_quotes(symbols: list, timeout: float = 8.0) -> list:
         results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=timeout)
     except asyncio.TimeoutError:
         # Return whatever we have from cache + mock
-        return [get_mock_data(s) for s in symbols]
+        return [quote_response(_cached_or_mock(s), format) for s in symbols]
     
     stocks = []
     for i, result in enumerate(results):
         if isinstance(result, Exception):
-            result = get_mock_data(symbols[i])
+            result = _cached_or_mock(symbols[i])
         if result:
-            stocks.append(result)
+            stocks.append(quote_response(result, format))
     return stocks
 
 @app.get("/api/stocks/{symbol}")
-async def get_stock(symbol: str):
-    """Get stock data from Yahoo Finance (with mock fallback)"""
+async def get_stock(symbol: str, format: str = "rows"):
+    """Get stock data from Yahoo Finance (with mock fallback)
+    
+    format=columnar returns candles as {t, o, h, l, c, v} arrays
+    """
     # Add .IS suffix if not present (for BIST stocks)
     if not symbol.endswith(".IS") and not "." in symbol:
         symbol = f"{symbol}.IS"
     
     data = await fetch_yahoo_quote(symbol)
-    return data  # Always returns data (real or mock)
+    return quote_response(data, format)  # Always returns data (real or mock)
 
 @app.get("/api/stocks/{symbol}/data")
-async def get_stock_data(symbol: str, interval: str = "1d", period: str = "1mo"):
-    """Get stock OHLCV data - Frontend compatible endpoint"""
+async def get_stock_data(symbol: str, interval: str = "1d", period: str = "1mo", format: str = "rows"):
+    """Get stock OHLCV data - Frontend compatible endpoint
+    
+    format=columnar returns data as {t, o, h, l, c, v} arrays
+    """
     if not symbol.endswith(".IS") and not "." in symbol:
         symbol = f"{symbol}.IS"
     
     data = await fetch_yahoo_quote(symbol)
     
     # Convert candles to frontend expected format
-    candles = data.get("candles", [])
-    result = []
-    for c in candles:
-        ts = c.get("timestamp") or c.get("time")
-        if ts:
-            result.append({
-                "timestamp": ts,
-                "open": c.get("open"),
-                "high": c.get("high"),
-                "low": c.get("low"),
-                "close": c.get("close"),
-                "volume": c.get("volume")
-            })
+    candles = data["candles"]
+    result = candles.to_columnar() if format == "columnar" else candles.to_rows()
     
     return {
         "symbol": data["symbol"],
@@ -1188,54 +1328,29 @@ async def get_stock_indicators(symbol: str, interval: str = "1d", period: str =
     if not data:
         raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
     
-    candles = data.get("candles", [])
-    closes = [c["close"] for c in candles if c.get("close")]
-    highs = [c["high"] for c in candles if c.get("high")]
-    lows = [c["low"] for c in candles if c.get("low")]
-    volumes = [c["volume"] for c in candles if c.get("volume")]
+    candles = data["candles"]
+    closes = candles.c
+    highs = candles.h
+    lows = candles.l
+    volumes = [v for v in candles.v if v]
     
     current_price = data["price"]
     
     # RSI (14 period)
-    rsi = 50
-    if len(closes) >= 15:
-        gains = []
-        losses = []
-        for i in range(1, min(15, len(closes))):
-            diff = closes[i] - closes[i-1]
-            if diff > 0:
-                gains.append(diff)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(diff))
-        avg_gain = sum(gains) / 14 if gains else 0
-        avg_loss = sum(losses) / 14 if losses else 0.0001
-        rs = avg_gain / avg_loss if avg_loss else 100
-        rsi = 100 - (100 / (1 + rs))
-    
-    # EMA calculation helper
-    def calc_ema(data, period):
-        if len(data) < period:
-            return sum(data) / len(data) if data else 0
-        multiplier = 2 / (period + 1)
-        ema = sum(data[:period]) / period
-        for price in data[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return ema
+    rsi = rsi_last(closes, 14)
     
     # Moving averages
     sma_20 = sum(closes[-20:]) / min(20, len(closes)) if closes else 0
     sma_50 = sum(closes[-50:]) / min(50, len(closes)) if closes else 0
-    ema_9 = calc_ema(closes, 9) if len(closes) >= 9 else (sum(closes) / len(closes) if closes else 0)
-    ema_21 = calc_ema(closes, 21) if len(closes) >= 21 else sma_20
-    ema_50 = calc_ema(closes, 50) if len(closes) >= 50 else sma_50
+    ema_9 = ema_last(closes, 9, sum(closes) / len(closes) if closes else 0)
+    ema_21 = ema_last(closes, 21, sma_20)
+    ema_50 = ema_last(closes, 50, sma_50)
     
     # MACD (12, 26, 9)
-    ema_12 = calc_ema(closes, 12) if len(closes) >= 12 else 0
-    ema_26 = calc_ema(closes, 26) if len(closes) >= 26 else 0
+    ema_12 = ema_last(closes, 12)
+    ema_26 = ema_last(closes, 26)
     macd_line = ema_12 - ema_26
-    macd_signal = calc_ema([macd_line], 9)  # Simplified
+    macd_signal = macd_line  # Simplified (EMA of a single value)
     macd_histogram = macd_line - macd_signal
     
     # ATR (14 period)
@@ -1402,36 +1517,17 @@ def analyze_dataframe_for_picks(symbol: str, df) -> dict:
         curr = closes[-1]
         
         # EMA hesapla
-        def ema(data, period):
-            if len(data) < period:
-                return data[-1] if data else 0
-            mult = 2 / (period + 1)
-            result = sum(data[:period]) / period
-            for price in data[period:]:
-                result = (price * mult) + (result * (1 - mult))
-            return result
-        
-        ema9 = ema(closes, 9)
-        ema21 = ema(closes, 21)
-        ema50 = ema(closes, 50) if len(closes) >= 50 else ema21
-        ema200 = ema(closes, 200) if len(closes) >= 200 else ema50
+        ema9 = ema_last(closes, 9, curr)
+        ema21 = ema_last(closes, 21, curr)
+        ema50 = ema_last(closes, 50, ema21)
+        ema200 = ema_last(closes, 200, ema50)
         
         # RSI hesapla
-        gains, losses = [], []
-        for i in range(1, min(15, len(closes))):
-            diff = closes[-i] - closes[-i-1]
-            if diff > 0:
-                gains.append(diff)
-            else:
-                losses.append(abs(diff))
-        
-        avg_gain = sum(gains) / 14 if gains else 0
-        avg_loss = sum(losses) / 14 if losses else 0.0001
-        rsi = 100 - (100 / (1 + (avg_gain / avg_loss)))
+        rsi = rsi_last(closes, 14)
         
         # MACD hesapla
-        ema12 = ema(closes, 12)
-        ema26 = ema(closes, 26)
+        ema12 = ema_last(closes, 12, curr)
+        ema26 = ema_last(closes, 26, curr)
         macd_line = ema12 - ema26
         
         # Signal line için son 9 MACD değeri lazım - basitleştirilmiş
@@ -1851,15 +1947,15 @@ async def get_screener():
             if not data or data.get("isMockData"):
                 continue
             
-            candles = data.get("candles", [])
+            candles = data["candles"]
             if len(candles) < 50:
                 continue
             
-            # Son kapanışları al
-            closes = [c["close"] for c in candles if c.get("close")]
-            highs = [c["high"] for c in candles if c.get("high")]
-            lows = [c["low"] for c in candles if c.get("low")]
-            volumes = [c["volume"] for c in candles if c.get("volume")]
+            # Son kapanışları al (typed array kolonları, kopya yok)
+            closes = candles.c
+            highs = candles.h
+            lows = candles.l
+            volumes = [v for v in candles.v if v]
             
             if len(closes) < 50:
                 continue
@@ -1867,33 +1963,12 @@ async def get_screener():
             curr = closes[-1]
             
             # EMA hesapla (basit)
-            def ema(data, period):
-                if len(data) < period:
-                    return data[-1] if data else 0
-                mult = 2 / (period + 1)
-                result = sum(data[:period]) / period
-                for price in data[period:]:
-                    result = (price * mult) + (result * (1 - mult))
-                return result
-            
-            ema9 = ema(closes, 9)
-            ema21 = ema(closes, 21)
-            ema50 = ema(closes, 50)
+            ema9 = ema_last(closes, 9, curr)
+            ema21 = ema_last(closes, 21, curr)
+            ema50 = ema_last(closes, 50, curr)
             
             # RSI hesapla
-            gains = []
-            losses = []
-            for i in range(1, min(15, len(closes))):
-                diff = closes[-i] - closes[-i-1]
-                if diff > 0:
-                    gains.append(diff)
-                else:
-                    losses.append(abs(diff))
-            
-            avg_gain = sum(gains) / 14 if gains else 0
-            avg_loss = sum(losses) / 14 if losses else 0.0001
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = rsi_last(closes, 14)
             
             # ATR hesapla
             trs = []
@@ -2179,8 +2254,7 @@ async def get_market_all():
                 # Calculate change properly from candles if needed
                 change_pct = data.get("changePercent", 0)
                 if change_pct == 0 and data.get("candles") and len(data["candles"]) >= 2:
-                    candles = data["candles"]
-                    closes = [c["close"] for c in candles if c.get("close")]
+                    closes = data["candles"].c
                     if len(closes) >= 2 and closes[-2] and closes[-2] != 0:
                         change_pct = ((closes[-1] - closes[-2]) / closes[-2]) * 100
                 
@@ -16,7 +16,8 @@ tester = StrategyTester()
 @router.get("/daily-strategy")
 async def test_daily_strategy(
     days: int = Query(180, description="Number of days to backtest (default 6 months)"),
-    min_score: int = Query(75, description="Minimum score threshold (75+ for excellent setups)")
+    min_score: int = Query(75, description="Minimum score threshold (75+ for excellent setups)"),
+    point_in_time: bool = Query(True, description="Score each day from the history before it (False: live screen every day)")
 ):
     """
     Test daily trading strategy for last N days
@@ -33,7 +34,8 @@ async def test_daily_strategy(
         results = tester.backtest_daily_strategy(
             start_date=start_date.strftime("%Y-%m-%d"),
             end_date=end_date.strftime("%Y-%m-%d"),
-            min_score=min_score
+            min_score=min_score,
+            point_in_time=point_in_time
         )
         
         return results
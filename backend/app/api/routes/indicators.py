@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 from app.services.data_fetcher import DataFetcher
 from app.services.technical_analysis import TechnicalAnalysis, TrendChannelIndicator
+from app.services.vwap import anchored_vwap, session_ids
 from app.utils.logger import logger
 import pandas as pd
 
@@ -40,7 +41,7 @@ async def get_ichimoku(
             raise HTTPException(status_code=404, detail=f"Invalid ticker: {ticker}")
         
         # Fetch data
-        df = data_fetcher.fetch_realtime_data(ticker, interval, period)
+        df = await data_fetcher.fetch_realtime_data_async(ticker, interval, period)
         
         if df.empty:
             raise HTTPException(status_code=404, detail="No data available")
@@ -102,7 +103,7 @@ async def get_fibonacci(
             raise HTTPException(status_code=404, detail=f"Invalid ticker: {ticker}")
         
         # Fetch data
-        df = data_fetcher.fetch_realtime_data(ticker, interval, period)
+        df = await data_fetcher.fetch_realtime_data_async(ticker, interval, period)
         
         if df.empty:
             raise HTTPException(status_code=404, detail="No data available")
@@ -164,7 +165,7 @@ async def get_bollinger_bands(
             raise HTTPException(status_code=404, detail=f"Invalid ticker: {ticker}")
         
         # Fetch data
-        df = data_fetcher.fetch_realtime_data(ticker, interval, period)
+        df = await data_fetcher.fetch_realtime_data_async(ticker, interval, period)
         
         if df.empty:
             raise HTTPException(status_code=404, detail="No data available")
@@ -199,12 +200,79 @@ async def get_bollinger_bands(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{ticker}/vwap")
+async def get_vwap(
+    ticker: str,
+    interval: str = Query("5m", description="Data interval"),
+    period: str = Query("5d", description="Data period"),
+    anchor: Optional[str] = Query(None, description="Anchor timestamp for an anchored VWAP (e.g. 2026-10-14T10:00)")
+):
+    """
+    Get session VWAP and an optional anchored VWAP
+
+    Args:
+        ticker: Stock ticker symbol
+        interval: Data interval - intraday intervals restart VWAP every session
+        period: Data period
+        anchor: Start of the anchored VWAP (first bar at or after it)
+
+    Returns:
+        VWAP data per bar
+    """
+    try:
+        logger.info(f"API request: Get VWAP for {ticker}")
+
+        # Validate ticker
+        if not data_fetcher.validate_ticker(ticker):
+            raise HTTPException(status_code=404, detail=f"Invalid ticker: {ticker}")
+
+        # Fetch data
+        df = await data_fetcher.fetch_realtime_data_async(ticker, interval, period)
+
+        if df.empty:
+            raise HTTPException(status_code=404, detail="No data available")
+
+        try:
+            anchored = anchored_vwap(df, anchor) if anchor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid anchor: {anchor}")
+
+        df_vwap = tech_analysis.calculate(df, ['vwap'])
+
+        def safe(value):
+            return float(value) if not pd.isna(value) else None
+
+        data = []
+        for i, (idx, value) in enumerate(zip(df_vwap.index, df_vwap['vwap'].to_numpy())):
+            point = {"timestamp": str(idx), "close": safe(df_vwap['close'].iat[i]), "vwap": safe(value)}
+            if anchored is not None:
+                point["anchored_vwap"] = safe(anchored.iat[i])
+            data.append(point)
+
+        return {
+            "ticker": ticker,
+            "interval": interval,
+            "period": period,
+            "anchor": anchor,
+            "session_reset": session_ids(df.index) is not None,
+            "data_points": len(data),
+            "data": data
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting VWAP data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{ticker}/trend-channel")
 async def get_trend_channel(
     ticker: str,
     interval: str = Query("1d", description="Data interval (5m, 15m, 1h, 1d)"),
     period: str = Query("3mo", description="Data period (1mo, 3mo, 6mo, 1y)"),
-    channel_period: int = Query(20, description="Channel calculation period")
+    channel_period: int = Query(20, description="Channel calculation period"),
+    history: bool = Query(False, description="Include the channel of every bar")
 ):
     """
     Get Trend Channel indicator with trading signals
@@ -216,6 +284,7 @@ async def get_trend_channel(
         interval: Data interval
         period: Data period
         channel_period: Lookback period for channel calculation
+        history: Also return support/resistance/position/breakout per bar
     
     Returns:
         Trend channel analysis with signals, support/resistance levels
@@ -228,7 +297,7 @@ async def get_trend_channel(
             raise HTTPException(status_code=404, detail=f"Invalid ticker: {ticker}")
         
         # Fetch data
-        df = data_fetcher.fetch_realtime_data(ticker, interval, period)
+        df = await data_fetcher.fetch_realtime_data_async(ticker, interval, period)
         
         if df.empty:
             raise HTTPException(status_code=404, detail="No data available")
@@ -246,7 +315,7 @@ async def get_trend_channel(
         # Get channel lines for charting
         lines = channel_indicator.get_channel_lines(future_points=5)
         
-        return {
+        response = {
             "success": True,
             "ticker": ticker,
             "interval": interval,
@@ -264,6 +333,15 @@ async def get_trend_channel(
                 "resistance_line": lines['resistance_points']
             }
         }
+        
+        if history:
+            rolling = channel_indicator.get_rolling_channel().iloc[channel_period - 1:].round(4)
+            rolling = rolling.astype(object).where(rolling.notna(), None)
+            response["history"] = [
+                {"timestamp": str(idx), **row} for idx, row in zip(rolling.index, rolling.to_dict('records'))
+            ]
+        
+        return response
     
     except HTTPException:
         raise
@@ -285,7 +363,7 @@ async def analyze_trend_channel(
     """
     try:
         # Fetch daily data
-        df = data_fetcher.fetch_realtime_data(symbol, "1d", "3mo")
+        df = await data_fetcher.fetch_realtime_data_async(symbol, "1d", "3mo")
         
         if df.empty or len(df) < period:
             raise HTTPException(status_code=404, detail="Insufficient data")
@@ -406,14 +406,13 @@ async def get_signals(
             raise HTTPException(status_code=400, detail="Invalid strategy type")
         
         # Fetch data
-        df = data_fetcher.fetch_realtime_data(ticker, interval, period)
+        df = await data_fetcher.fetch_realtime_data_async(ticker, interval, period)
         
         if df.empty or len(df) < 50:
             raise HTTPException(status_code=404, detail="Insufficient data for signal generation")
         
         # Calculate indicators
-        df_with_indicators = tech_analysis.calculate_all_indicators(df)
-        latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
+        df_with_indicators, latest_indicators = tech_analysis.calculate_with_latest(df, key=f"{ticker}_{interval}_{period}")
         
         # Generate signal
         signal_gen = SignalGenerator(strategy_type=strategy)
@@ -113,6 +113,16 @@ data_fetcher = DataFetcher()
 tech_analysis = TechnicalAnalysis()
 
 
+@router.get("/debug/cache")
+async def debug_cache():
+    """
+    In-memory bar cache and indicator memo statistics (size, hit/miss/eviction counters)
+    """
+    stats = DataFetcher.get_cache_stats()
+    stats['indicator_memo'] = TechnicalAnalysis.get_memo_stats()
+    return stats
+
+
 @router.get("/{ticker}/data")
 async def get_stock_data(
     ticker: str,
@@ -138,7 +148,7 @@ async def get_stock_data(
             raise HTTPException(status_code=404, detail=f"Invalid ticker: {ticker}")
         
         # Fetch data
-        df = data_fetcher.fetch_realtime_data(ticker, interval, period)
+        df = await data_fetcher.fetch_realtime_data_async(ticker, interval, period)
         
         if df.empty:
             raise HTTPException(status_code=404, detail=f"No data available for {ticker} (interval={interval}, period={period})")
@@ -191,14 +201,13 @@ async def get_indicators(
         logger.info(f"API request: Get indicators for {ticker}")
         
         # Fetch data
-        df = data_fetcher.fetch_realtime_data(ticker, interval, period)
+        df = await data_fetcher.fetch_realtime_data_async(ticker, interval, period)
         
         if df.empty:
             raise HTTPException(status_code=404, detail="No data available")
         
         # Calculate indicators
-        df_with_indicators = tech_analysis.calculate_all_indicators(df)
-        latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
+        _, latest_indicators = tech_analysis.calculate_with_latest(df, key=f"{ticker}_{interval}_{period}")
         
         # Get support/resistance
         support_resistance = tech_analysis.detect_support_resistance(df)
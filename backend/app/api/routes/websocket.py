@@ -8,6 +8,7 @@ from typing import Optional, List
 from app.services.websocket_manager import ws_manager, ChannelType, WebSocketMessage
 from app.services.data_fetcher import DataFetcher
 from app.services.technical_analysis import TechnicalAnalysis
+from app.services.incremental_indicators import IndicatorStreams
 from app.services.signal_generator import SignalGenerator
 from app.utils.logger import logger
 
@@ -16,6 +17,8 @@ router = APIRouter()
 # Initialize services
 data_fetcher = DataFetcher()
 tech_analysis = TechnicalAnalysis()
+# Running indicator state of the 1m price streams (one update per new/changed bar)
+indicator_streams = IndicatorStreams()
 
 
 @router.websocket("/ws/stream")
@@ -135,63 +138,66 @@ async def price_update_loop(websocket: WebSocket, ticker: str, interval: float =
     consecutive_errors = 0
     max_errors = 5
     
-    while True:
-        try:
-            # Check if connection is still active
-            if websocket not in ws_manager.connections:
-                break
-            
-            # Check if still subscribed to this ticker
-            subscription = ws_manager.connections.get(websocket)
-            if subscription and ticker not in subscription.tickers:
-                break
-            
-            # Fetch data
-            df = data_fetcher.fetch_realtime_data(ticker, interval="1m", period="1d")
-            
-            if not df.empty:
-                consecutive_errors = 0
+    # The ticker's indicator stream lives while at least one loop runs
+    with indicator_streams.subscription(ticker, "1m"):
+        while True:
+            try:
+                # Check if connection is still active
+                if websocket not in ws_manager.connections:
+                    break
+                
+                # Check if still subscribed to this ticker
+                subscription = ws_manager.connections.get(websocket)
+                if subscription and ticker not in subscription.tickers:
+                    break
                 
-                # Calculate indicators
-                df_with_indicators = tech_analysis.calculate_all_indicators(df)
-                latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
+                # Fetch data (concurrent loops for the same ticker share one fetch)
+                df = await data_fetcher.fetch_realtime_data_async(ticker, interval="1m", period="1d")
                 
-                # Get latest price
-                latest = df.iloc[-1]
-                prev = df.iloc[-2] if len(df) > 1 else latest
+                if not df.empty:
+                    consecutive_errors = 0
+                    
+                    # Update indicators incrementally instead of recomputing the whole day
+                    latest_indicators = tech_analysis.format_latest_indicators(
+                        indicator_streams.sync(ticker, "1m", df)
+                    )
+                    
+                    # Get latest price
+                    latest = df.iloc[-1]
+                    prev = df.iloc[-2] if len(df) > 1 else latest
+                    
+                    # Calculate change
+                    change = float(latest['close']) - float(prev['close'])
+                    change_percent = (change / float(prev['close'])) * 100 if float(prev['close']) > 0 else 0
+                    
+                    # Broadcast price update
+                    await ws_manager.broadcast_price_update(ticker, {
+                        "timestamp": str(df.index[-1]),
+                        "open": float(latest['open']),
+                        "high": float(latest['high']),
+                        "low": float(latest['low']),
+                        "close": float(latest['close']),
+                        "volume": int(latest['volume']),
+                        "change": round(change, 4),
+                        "change_percent": round(change_percent, 2),
+                        "indicators": latest_indicators
+                    })
+                else:
+                    consecutive_errors += 1
+                    if consecutive_errors >= max_errors:
+                        logger.warning(f"Too many errors for {ticker}, stopping updates")
+                        break
                 
-                # Calculate change
-                change = float(latest['close']) - float(prev['close'])
-                change_percent = (change / float(prev['close'])) * 100 if float(prev['close']) > 0 else 0
+                await asyncio.sleep(interval)
                 
-                # Broadcast price update
-                await ws_manager.broadcast_price_update(ticker, {
-                    "timestamp": str(df.index[-1]),
-                    "open": float(latest['open']),
-                    "high": float(latest['high']),
-                    "low": float(latest['low']),
-                    "close": float(latest['close']),
-                    "volume": int(latest['volume']),
-                    "change": round(change, 4),
-                    "change_percent": round(change_percent, 2),
-                    "indicators": latest_indicators
-                })
-            else:
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
                 consecutive_errors += 1
+                logger.error(f"Price update error for {ticker}: {e}")
                 if consecutive_errors >= max_errors:
-                    logger.warning(f"Too many errors for {ticker}, stopping updates")
                     break
-            
-            await asyncio.sleep(interval)
-            
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            consecutive_errors += 1
-            logger.error(f"Price update error for {ticker}: {e}")
-            if consecutive_errors >= max_errors:
-                break
-            await asyncio.sleep(interval)
+                await asyncio.sleep(interval)
 
 
 @router.websocket("/ws/signals/{ticker}")
@@ -216,11 +222,10 @@ async def websocket_signals(websocket: WebSocket, ticker: str):
         while True:
             try:
                 # Fetch data and generate signal
-                df = data_fetcher.fetch_realtime_data(ticker, interval="5m", period="1d")
+                df = await data_fetcher.fetch_realtime_data_async(ticker, interval="5m", period="1d")
                 
                 if not df.empty:
-                    df_with_indicators = tech_analysis.calculate_all_indicators(df)
-                    latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
+                    df_with_indicators, latest_indicators = tech_analysis.calculate_with_latest(df, key=f"{ticker}_5m_1d")
                     signal = signal_generator.generate_signal(df_with_indicators, latest_indicators)
                     
                     # Check if signal changed
@@ -47,6 +47,21 @@ class Settings(BaseSettings):
     # Caching
     cache_ttl_realtime: int = 60
     cache_ttl_historical: int = 3600
+    cache_max_bytes: int = 128 * 1024 * 1024  # In-memory bar cache budget (LRU eviction)
+    indicator_memo_max_bytes: int = 64 * 1024 * 1024  # Memoized indicator frames (LRU eviction)
+    compact_indicators: bool = False  # Store indicator frames as one float32 block (half the memory)
+    
+    # Async market data client (Yahoo chart API over pooled httpx connections)
+    market_data_max_connections: int = 20
+    market_data_max_per_host: int = 8
+    market_data_timeout: float = 10.0
+    
+    # Seed of the synthetic market used for mock data
+    mock_data_seed: int = 42
+    
+    # Persistent OHLCV bar store (memory-mapped NumPy files per ticker/interval)
+    bar_store_enabled: bool = True
+    bar_store_dir: str = "/tmp/bar_store" if os.getenv("VERCEL") else "./data/bars"
     
     # Notifications
     email_enabled: bool = False
@@ -240,6 +240,9 @@ async def shutdown_event():
         logger.info("📊 Stock Scheduler stopped")
     except Exception as e:
         logger.error(f"Error stopping Stock Scheduler: {e}")
+    
+    # Async market data bağlantılarını kapat
+    await DataFetcher.close_async_client()
 
 
 @app.get("/")
@@ -343,15 +346,16 @@ async def websocket_endpoint(websocket: WebSocket, ticker: str):
         while True:
             # Fetch latest data
             try:
-                df = data_fetcher.fetch_realtime_data(ticker, interval="1m", period="1d")
+                df = await data_fetcher.fetch_realtime_data_async(ticker, interval="1m", period="1d")
                 
                 if not df.empty:
                     # Reset error counter on success
                     consecutive_errors = 0
                     
-                    # Calculate indicators
-                    df_with_indicators = tech_analysis.calculate_all_indicators(df)
-                    latest_indicators = tech_analysis.get_latest_indicators(df_with_indicators)
+                    # Update indicators incrementally (shared with the /ws/prices streams)
+                    latest_indicators = tech_analysis.format_latest_indicators(
+                        ws_routes.indicator_streams.sync(ticker, "1m", df)
+                    )
                     
                     # Get latest price data
                     latest = df.iloc[-1]
@@ -382,8 +382,11 @@ Lütfen daha spesifik bir soru sorun! 🎯"""
             if df.empty:
                 return f"⚠️ {ticker} için veri bulunamadı."
             
-            df_with_ind = ta.calculate_all_indicators(df)
-            latest = ta.get_latest_indicators(df_with_ind)
+            # Sadece sinyal ve özet için okunan göstergeler
+            df_with_ind = ta.calculate(df, [
+                'ema_9', 'ema_21', 'adx', 'rsi', 'macd', 'stochastic', 'atr', 'bollinger', 'mfi'
+            ], key=f"{symbol}_1d_1mo")
+            latest = df_with_ind.iloc[-1].to_dict()
             
             from .signal_generator import SignalGenerator
             sg = SignalGenerator()
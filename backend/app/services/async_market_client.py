@@ -0,0 +1,184 @@
+"""
+Async market data client
+Non-blocking Yahoo Finance chart API client for event-loop callers, with a
+pooled httpx connection and per-host concurrency limits
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.utils.logger import logger
+
+
+CHART_HOSTS = ["query1.finance.yahoo.com", "query2.finance.yahoo.com"]
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Intervals whose bars yfinance stamps at midnight exchange time
+DAILY_INTERVALS = {"1d", "5d", "1wk", "1mo", "3mo"}
+
+
+def parse_chart(payload: Dict[str, Any], interval: str) -> pd.DataFrame:
+    """
+    Convert a v8 chart API response into the frame ``Ticker.history`` returns
+
+    Prices are adjusted with ``adjclose`` like ``auto_adjust=True`` and the
+    index is localized to the exchange timezone.
+
+    Args:
+        payload: Decoded JSON response
+        interval: Bar interval the chart was requested with
+
+    Returns:
+        DataFrame with lowercase OHLCV columns, empty if the payload has no bars
+    """
+    result = (payload.get("chart") or {}).get("result") or []
+    if not result:
+        return pd.DataFrame()
+
+    chart = result[0]
+    timestamps = chart.get("timestamp") or []
+    quote = ((chart.get("indicators") or {}).get("quote") or [{}])[0]
+    if not timestamps or not quote:
+        return pd.DataFrame()
+
+    def column(values: Optional[List[Any]]) -> np.ndarray:
+        # JSON nulls become NaN
+        return np.array(values or [], dtype=float)
+
+    columns = {name: column(quote.get(name)) for name in ("open", "high", "low", "close", "volume")}
+    adjclose = ((chart.get("indicators") or {}).get("adjclose") or [{}])[0].get("adjclose")
+    if adjclose:
+        columns["adjclose"] = column(adjclose)
+
+    df = pd.DataFrame(
+        columns,
+        index=pd.to_datetime(np.asarray(timestamps, dtype="int64"), unit="s", utc=True),
+    )
+    df = df.dropna(subset=["close"])
+    if df.empty:
+        return df
+
+    tz = (chart.get("meta") or {}).get("exchangeTimezoneName")
+    if tz:
+        df.index = df.index.tz_convert(tz)
+
+    if "adjclose" in df.columns:
+        # Same dividend/split adjustment as yfinance auto_adjust=True
+        ratio = (df.pop("adjclose") / df["close"]).fillna(1.0)
+        for name in ("open", "high", "low", "close"):
+            df[name] = df[name] * ratio
+
+    if interval in DAILY_INTERVALS:
+        df.index = df.index.normalize()
+        df.index.name = "Date"
+    else:
+        df.index.name = "Datetime"
+
+    df["volume"] = df["volume"].fillna(0).astype("int64")
+    return df[~df.index.duplicated(keep="last")]
+
+
+class AsyncMarketDataClient:
+    """Pooled async chart API client with a concurrency cap per host"""
+
+    def __init__(
+        self,
+        max_connections: int = None,
+        max_per_host: int = None,
+        timeout: float = None
+    ):
+        """
+        Initialize the client (connections are opened lazily)
+
+        Args:
+            max_connections: Pool size shared by every host
+            max_per_host: Concurrent requests allowed against one host
+            timeout: Request timeout in seconds
+        """
+        self.max_connections = max_connections or settings.market_data_max_connections
+        self.max_per_host = max_per_host or settings.market_data_max_per_host
+        self.timeout = timeout or settings.market_data_timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared client of the running loop (httpx clients are bound to one loop)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=HEADERS,
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.max_connections,
+                    max_connections=self.max_connections
+                )
+            )
+            self._loop = loop
+            self._host_limits = {}
+        return self._client
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    async def fetch_chart(
+        self,
+        ticker: str,
+        interval: str = "1d",
+        period: Optional[str] = None,
+        start: Union[str, pd.Timestamp, None] = None,
+        end: Union[str, pd.Timestamp, None] = None
+    ) -> pd.DataFrame:
+        """
+        Fetch OHLCV bars without blocking the event loop
+
+        Takes the same period/start/end arguments as ``Ticker.history``.
+        Hosts are tried in order until one answers.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            period: yfinance period string (ignored when ``start`` is given)
+            start: First bar (inclusive)
+            end: Last bar (exclusive), defaults to now
+
+        Returns:
+            DataFrame with lowercase OHLCV columns, empty on any upstream problem
+        """
+        params = {"interval": interval, "includePrePost": "false", "events": "div,splits"}
+        if start is not None:
+            params["period1"] = int(pd.Timestamp(start).timestamp())
+            params["period2"] = int((pd.Timestamp(end) if end is not None else pd.Timestamp.now()).timestamp())
+        else:
+            params["range"] = period or "1mo"
+
+        client = self._get_client()
+        for host in CHART_HOSTS:
+            url = f"https://{host}/v8/finance/chart/{ticker}"
+            try:
+                async with self._host_limit(host):
+                    response = await client.get(url, params=params)
+                if response.status_code != 200:
+                    logger.warning(f"Chart API {host} returned {response.status_code} for {ticker}")
+                    continue
+                return parse_chart(response.json(), interval)
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"Chart API {host} error for {ticker}: {type(e).__name__}: {e}")
+
+        return pd.DataFrame()
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
@@ -4,7 +4,7 @@ Test trading strategies on historical data
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from app.utils.logger import logger
@@ -27,6 +27,129 @@ class Trade:
         return asdict(self)
 
 
+def first_exit(high: np.ndarray, low: np.ndarray, stop: float, target: float,
+               start: int, chunk: int = 64) -> Tuple[int, float]:
+    """
+    First bar from ``start`` on that reaches the stop or the target of a long trade
+
+    The bars are searched in windows that double in size, so a trade costs
+    array work proportional to its own duration.
+
+    Args:
+        high, low: Bar values of the whole series
+        stop, target: Exit levels of the trade
+        start: First bar the trade can exit on
+        chunk: Size of the first search window
+
+    Returns:
+        (bar, exit price) - the stop wins when a bar reaches both levels;
+        (-1, NaN) when no bar does
+    """
+    n = len(high)
+    while start < n:
+        end = min(n, start + chunk)
+        hit = (low[start:end] <= stop) | (high[start:end] >= target)
+        if hit.any():
+            bar = start + int(hit.argmax())
+            return bar, (stop if low[bar] <= stop else target)
+        start = end
+        chunk *= 2
+    return -1, np.nan
+
+
+def simulate_long_trades(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    buy: np.ndarray,
+    entry_price: np.ndarray,
+    stop_loss: np.ndarray,
+    take_profit: np.ndarray,
+    initial_capital: float,
+    commission: float,
+    capital_fraction: float = 0.95,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate one-position-at-a-time long trades from entry, stop and target arrays
+
+    A trade opens on a ``buy`` bar while flat (also on the bar another trade
+    exited), buys with ``capital_fraction`` of the cash and exits on the
+    first later bar that reaches its stop or target. A trade still open
+    after the last bar is closed at the last close. Only trades are looped
+    over; bars are handled with array operations.
+
+    Args:
+        high, low, close: Bar values
+        buy: Boolean entry signal per bar
+        entry_price, stop_loss, take_profit: Trade levels per bar (read on entry bars)
+        initial_capital: Starting cash
+        commission: Commission rate per side
+        capital_fraction: Share of the cash put into a trade
+
+    Returns:
+        Dict of per-trade arrays (entry_bar, exit_bar, entry_price, exit_price,
+        shares, position_value, profit - exit_bar -1 for the trade closed at
+        the end) and per-bar ``equity`` (cash before each bar) and ``drawdown``
+        (percent below the peak of the earlier bars)
+    """
+    n = len(close)
+    candidates = np.flatnonzero(buy)
+    trades: Dict[str, list] = {
+        'entry_bar': [], 'exit_bar': [], 'entry_price': [], 'exit_price': [],
+        'shares': [], 'position_value': [], 'profit': [],
+    }
+    event_bars: List[int] = []
+    event_capital: List[float] = []
+
+    capital = initial_capital
+    k = 0
+    while k < len(candidates):
+        entry_bar = int(candidates[k])
+        price = entry_price[entry_bar]
+        shares = int(capital * capital_fraction / price)
+        if shares <= 0:
+            k += 1
+            continue
+
+        position_value = shares * price
+        capital -= (position_value + position_value * commission)
+        event_bars.append(entry_bar)
+        event_capital.append(capital)
+
+        exit_bar, exit_price = first_exit(high, low, stop_loss[entry_bar], take_profit[entry_bar], entry_bar + 1)
+        if exit_bar < 0:
+            # Still open after the last bar: closed at the last close, one
+            # commission, after the equity curve ends
+            exit_price = close[-1]
+            net_profit = (exit_price - price) * shares - position_value * commission
+        else:
+            net_profit = (exit_price - price) * shares - position_value * commission * 2
+            capital += position_value + net_profit
+            event_bars.append(exit_bar)
+            event_capital.append(capital)
+
+        for name, value in (('entry_bar', entry_bar), ('exit_bar', exit_bar), ('entry_price', price),
+                            ('exit_price', exit_price), ('shares', shares),
+                            ('position_value', position_value), ('profit', net_profit)):
+            trades[name].append(value)
+        if exit_bar < 0:
+            break
+        # Next entry: first signal at or after the exit bar
+        k = int(np.searchsorted(candidates, exit_bar))
+
+    # Cash before each bar = cash after the last trade event on an earlier bar
+    last_event = np.searchsorted(np.asarray(event_bars, dtype=int), np.arange(n), side='left') - 1
+    levels = np.asarray(event_capital + [initial_capital], dtype=float)
+    equity = levels[last_event]  # -1 picks the initial capital
+    peak = np.maximum.accumulate(np.concatenate([[initial_capital], equity[:-1]]))
+    drawdown = (equity - peak) / peak * 100
+
+    result = {name: np.asarray(values) for name, values in trades.items()}
+    result['equity'] = equity
+    result['drawdown'] = drawdown
+    return result
+
+
 class Backtester:
     """Backtesting engine for trading strategies"""
     
@@ -61,7 +184,8 @@ class Backtester:
         
         Args:
             df: DataFrame with OHLC data
-            signals: DataFrame with trading signals (columns: signal, strength, entry_price, stop_loss, take_profit)
+            signals: DataFrame with trading signals (columns: signal, strength, entry_price, stop_loss, take_profit),
+                row i belongs to bar i
             stop_loss_pct: Stop loss percentage (if not in signals)
             take_profit_pct: Take profit percentage (if not in signals)
         
@@ -70,123 +194,42 @@ class Backtester:
         """
         logger.info(f"Running backtest from {df.index[0]} to {df.index[-1]}")
         
-        capital = self.initial_capital
-        position = None  # Current open position
-        trades = []
-        equity = []
-        
-        for i in range(len(df)):
-            current_date = df.index[i]
-            current = df.iloc[i]
-            
-            # Record equity
-            equity.append({
-                "date": str(current_date),
-                "equity": capital,
-                "drawdown": ((capital - max([e['equity'] for e in equity] + [self.initial_capital])) / 
-                            max([e['equity'] for e in equity] + [self.initial_capital]) * 100)
-            })
-            
-            # If we have an open position, check for exit
-            if position is not None:
-                should_exit = False
-                exit_price = current['close']
-                exit_reason = ""
-                
-                if position['type'] == 'LONG':
-                    # Check stop loss
-                    if current['low'] <= position['stop_loss']:
-                        should_exit = True
-                        exit_price = position['stop_loss']
-                        exit_reason = "Stop Loss"
-                    # Check take profit
-                    elif current['high'] >= position['take_profit']:
-                        should_exit = True
-                        exit_price = position['take_profit']
-                        exit_reason = "Take Profit"
-                
-                if should_exit:
-                    # Close position
-                    profit = (exit_price - position['entry_price']) * position['shares']
-                    commission_cost = position['position_value'] * self.commission * 2  # Entry + exit
-                    net_profit = profit - commission_cost
-                    
-                    capital += position['position_value'] + net_profit
-                    
-                    # Calculate duration
-                    entry_dt = pd.to_datetime(position['entry_date'])
-                    exit_dt = pd.to_datetime(current_date)
-                    duration = (exit_dt - entry_dt).total_seconds() / 3600
-                    
-                    # Record trade
-                    trade = Trade(
-                        entry_date=position['entry_date'],
-                        exit_date=str(current_date),
-                        entry_price=position['entry_price'],
-                        exit_price=exit_price,
-                        shares=position['shares'],
-                        trade_type=position['type'],
-                        profit=round(net_profit, 2),
-                        profit_percent=round((net_profit / position['position_value']) * 100, 2),
-                        duration_hours=round(duration, 2)
-                    )
-                    trades.append(trade)
-                    
-                    logger.debug(f"Closed position: {exit_reason}, P&L: ₺{net_profit:.2f}")
-                    position = None
-            
-            # Check for new entry signal
-            if position is None and i < len(signals):
-                signal = signals.iloc[i]
-                
-                if signal.get('signal') == 'BUY' and signal.get('strength', 0) >= 60:
-                    # Calculate position size (use 95% of capital to keep some reserve)
-                    available_capital = capital * 0.95
-                    entry_price = signal.get('entry_price', current['close'])
-                    stop_loss = signal.get('stop_loss', entry_price * (1 - stop_loss_pct/100))
-                    take_profit = signal.get('take_profit', entry_price * (1 + take_profit_pct/100))
-                    
-                    # Simple position sizing: use all available capital
-                    shares = int(available_capital / entry_price)
-                    
-                    if shares > 0:
-                        position_value = shares * entry_price
-                        commission_cost = position_value * self.commission
-                        
-                        capital -= (position_value + commission_cost)
-                        
-                        position = {
-                            'entry_date': str(current_date),
-                            'entry_price': entry_price,
-                            'stop_loss': stop_loss,
-                            'take_profit': take_profit,
-                            'shares': shares,
-                            'position_value': position_value,
-                            'type': 'LONG'
-                        }
-                        
-                        logger.debug(f"Opened position: {shares} shares @ ₺{entry_price:.2f}")
-        
-        # Close any remaining position at last price
-        if position is not None:
-            exit_price = df.iloc[-1]['close']
-            profit = (exit_price - position['entry_price']) * position['shares']
-            commission_cost = position['position_value'] * self.commission
-            net_profit = profit - commission_cost
-            capital += position['position_value'] + net_profit
-            
-            trade = Trade(
-                entry_date=position['entry_date'],
-                exit_date=str(df.index[-1]),
-                entry_price=position['entry_price'],
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)
+        buy, entry_price, stop_loss, take_profit = self.signal_arrays(signals, close, stop_loss_pct, take_profit_pct)
+        
+        sim = simulate_long_trades(high, low, close, buy, entry_price, stop_loss, take_profit,
+                                   self.initial_capital, self.commission)
+        
+        dates = df.index.astype(str)
+        entry_bars = sim['entry_bar']
+        exit_bars = np.where(sim['exit_bar'] < 0, entry_bars, sim['exit_bar'])
+        # The trade closed after the last bar keeps a zero duration
+        durations = (df.index[exit_bars] - df.index[entry_bars]).total_seconds() / 3600 if len(entry_bars) else []
+        
+        trades = [
+            Trade(
+                entry_date=dates[entry],
+                exit_date=dates[exit_bar] if exit_bar >= 0 else dates[-1],
+                entry_price=price,
                 exit_price=exit_price,
-                shares=position['shares'],
-                trade_type=position['type'],
-                profit=round(net_profit, 2),
-                profit_percent=round((net_profit / position['position_value']) * 100, 2),
-                duration_hours=0
+                shares=int(shares),
+                trade_type='LONG',
+                profit=round(profit, 2),
+                profit_percent=round((profit / value) * 100, 2),
+                duration_hours=round(duration, 2) if exit_bar >= 0 else 0
             )
-            trades.append(trade)
+            for entry, exit_bar, price, exit_price, shares, value, profit, duration in zip(
+                entry_bars.tolist(), sim['exit_bar'].tolist(), sim['entry_price'].tolist(),
+                sim['exit_price'].tolist(), sim['shares'].tolist(), sim['position_value'].tolist(),
+                sim['profit'].tolist(), list(durations)
+            )
+        ]
+        equity = [
+            {"date": date, "equity": value, "drawdown": drawdown}
+            for date, value, drawdown in zip(dates, sim['equity'].tolist(), sim['drawdown'].tolist())
+        ]
         
         # Calculate performance metrics
         results = self.calculate_performance_metrics(trades, equity)
@@ -196,10 +239,47 @@ class Backtester:
         self.trades = trades
         self.equity_curve = equity
         
-        logger.info(f"Backtest completed: {len(trades)} trades, {results['summary']['total_return']:.2f}% return")
+        logger.info(f"Backtest completed: {len(trades)} trades, {results.get('summary', {}).get('total_return', 0):.2f}% return")
         
         return results
     
+    @staticmethod
+    def signal_arrays(
+        signals: pd.DataFrame,
+        close: np.ndarray,
+        stop_loss_pct: float,
+        take_profit_pct: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-bar entry flags and trade levels from a signals frame
+        
+        Args:
+            signals: Signals frame, row i belongs to bar i (shorter frames leave the last bars without signal)
+            close: Closes, the default entry price
+            stop_loss_pct, take_profit_pct: Levels used when the frame has no stop_loss/take_profit column
+        
+        Returns:
+            (buy, entry_price, stop_loss, take_profit) arrays as long as ``close``
+        """
+        n = len(close)
+        rows = min(len(signals), n)
+        
+        def column(name: str, default: np.ndarray) -> np.ndarray:
+            if name not in signals:
+                return default
+            values = default.copy()
+            values[:rows] = signals[name].to_numpy(dtype=float)[:rows]
+            return values
+        
+        buy = np.zeros(n, dtype=bool)
+        if 'signal' in signals and 'strength' in signals:
+            with np.errstate(invalid='ignore'):
+                buy[:rows] = (signals['signal'].to_numpy()[:rows] == 'BUY') & (signals['strength'].to_numpy(dtype=float)[:rows] >= 60)
+        entry_price = column('entry_price', close.astype(float))
+        stop_loss = column('stop_loss', entry_price * (1 - stop_loss_pct / 100))
+        take_profit = column('take_profit', entry_price * (1 + take_profit_pct / 100))
+        return buy, entry_price, stop_loss, take_profit
+    
     def calculate_performance_metrics(
         self, 
         trades: List[Trade],
@@ -0,0 +1,298 @@
+"""
+Persistent OHLCV bar store
+Keeps one memory-mapped NumPy file per ticker/interval on local disk so that
+restarts, cold starts and backtests can read history without calling yfinance
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.utils.logger import logger
+
+
+# Column layout of the on-disk record array (timestamps are UTC nanoseconds)
+BAR_DTYPE = np.dtype([
+    ('ts', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# yfinance periods ordered by length - a store filled with a longer period
+# can serve every shorter one
+PERIOD_ORDER = ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "max"]
+
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+def period_rank(period: str) -> int:
+    """Position of a period in PERIOD_ORDER, -1 for unknown periods (e.g. ytd)"""
+    try:
+        return PERIOD_ORDER.index(period)
+    except ValueError:
+        return -1
+
+
+def slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Trim a bar frame to the window yfinance would return for ``period``
+
+    Args:
+        df: Bar frame with a DatetimeIndex (oldest first)
+        period: yfinance period string (1d, 5d, 1mo, ..., ytd, max)
+
+    Returns:
+        Tail of ``df`` covering the requested period
+    """
+    if df.empty or period == "max":
+        return df
+
+    if period.endswith("d") and period[:-1].isdigit():
+        # Day periods count trading sessions, not calendar days
+        sessions = df.index.normalize().unique()
+        first_session = sessions[-min(int(period[:-1]), len(sessions))]
+        return df[df.index >= first_session]
+
+    if period == "ytd":
+        last = df.index[-1]
+        return df[df.index >= last.normalize().replace(month=1, day=1)]
+
+    offset = PERIOD_OFFSETS.get(period)
+    if offset is None:
+        return df
+    return df[df.index >= df.index[-1] - offset]
+
+
+def slice_range(df: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
+    """Trim a bar frame to [start, end) the way yfinance start/end requests do"""
+    if df.empty:
+        return df
+    start_ts = pd.Timestamp(start)
+    end_ts = pd.Timestamp(end)
+    if df.index.tz is not None:
+        start_ts = start_ts.tz_localize(df.index.tz)
+        end_ts = end_ts.tz_localize(df.index.tz)
+    return df[(df.index >= start_ts) & (df.index < end_ts)]
+
+
+class BarStore:
+    """On-disk columnar OHLCV store, one record file per ticker/interval"""
+
+    def __init__(self, root: str):
+        """
+        Initialize the bar store
+
+        Args:
+            root: Directory that holds the ``<ticker>/<interval>`` folders
+        """
+        self.root = Path(root)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _series_dir(self, ticker: str, interval: str) -> Path:
+        safe_ticker = ticker.replace(os.sep, "_")
+        return self.root / safe_ticker / interval
+
+    def _lock_for(self, ticker: str, interval: str) -> threading.Lock:
+        key = f"{ticker}_{interval}"
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    # READ PATH
+
+    def read_meta(self, ticker: str, interval: str) -> Dict[str, Any]:
+        """Read the metadata of a stored series ({} if missing)"""
+        meta_path = self._series_dir(ticker, interval) / "meta.json"
+        try:
+            with open(meta_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, ticker: str, interval: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Load a stored series
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+
+        Returns:
+            (bars, meta) - empty frame and {} if nothing is stored
+        """
+        series_dir = self._series_dir(ticker, interval)
+        bars_path = series_dir / "bars.npy"
+        if not bars_path.exists():
+            return pd.DataFrame(), {}
+
+        try:
+            records = np.load(bars_path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Bar store: unreadable series {ticker} {interval}: {e}")
+            return pd.DataFrame(), {}
+
+        meta = self.read_meta(ticker, interval)
+        return self._records_to_frame(records, meta.get('tz')), meta
+
+    @staticmethod
+    def _records_to_frame(records: np.ndarray, tz: Optional[str]) -> pd.DataFrame:
+        index = pd.DatetimeIndex(np.asarray(records['ts']).view('datetime64[ns]'), name='Datetime')
+        if tz:
+            index = index.tz_localize('UTC').tz_convert(tz)
+        return pd.DataFrame(
+            {col: np.asarray(records[col]) for col in OHLCV_COLUMNS},
+            index=index,
+        )
+
+    def is_fresh(self, meta: Dict[str, Any], ttl: float) -> bool:
+        """Check whether a stored series was refreshed within ``ttl`` seconds"""
+        return (time.time() - meta.get('fetched_at', 0)) < ttl
+
+    def covers_period(self, meta: Dict[str, Any], period: str) -> bool:
+        """Check whether a stored series holds at least ``period`` of history"""
+        requested = period_rank(period)
+        return requested >= 0 and meta.get('period_rank', -1) >= requested
+
+    def covers_range(self, meta: Dict[str, Any], start: str, end: str) -> bool:
+        """Check whether a stored series holds every bar in [start, end)"""
+        stored_start = meta.get('start')
+        if not stored_start or pd.Timestamp(stored_start) > pd.Timestamp(start):
+            return False
+        complete_until = pd.Timestamp(meta.get('complete_until', 0), unit='s')
+        return pd.Timestamp(end) <= complete_until
+
+    # WRITE PATH
+
+    def write(
+        self,
+        ticker: str,
+        interval: str,
+        df: pd.DataFrame,
+        period: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> None:
+        """
+        Merge freshly fetched bars into the stored series
+
+        Newer bars replace stored bars with the same timestamp. If the new
+        frame does not overlap the stored one the old series is dropped so
+        the store never holds a gap.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            df: Fetched bars with lowercase OHLCV columns
+            period: yfinance period the bars were fetched with
+            start: Explicit start date the bars were fetched from
+            end: Explicit (exclusive) end date the bars were fetched to
+        """
+        if df.empty or not all(col in df.columns for col in OHLCV_COLUMNS):
+            return
+
+        with self._lock_for(ticker, interval):
+            try:
+                self._write_locked(ticker, interval, df, period, start, end)
+            except OSError as e:
+                logger.warning(f"Bar store: could not persist {ticker} {interval}: {e}")
+
+    def _write_locked(
+        self,
+        ticker: str,
+        interval: str,
+        df: pd.DataFrame,
+        period: Optional[str],
+        start: Optional[str],
+        end: Optional[str]
+    ) -> None:
+        new_bars = df[OHLCV_COLUMNS].astype('float64')
+        tz = str(new_bars.index.tz) if new_bars.index.tz is not None else None
+
+        existing, meta = self.load(ticker, interval)
+        overlaps = (
+            not existing.empty
+            and meta.get('tz') == tz
+            and existing.index[-1] >= new_bars.index[0]
+            and existing.index[0] <= new_bars.index[-1]
+        )
+
+        now = time.time()
+        if end:
+            complete_until = min(now, pd.Timestamp(end).timestamp())
+        else:
+            complete_until = now
+
+        if overlaps:
+            merged = pd.concat([existing, new_bars])
+            rank = max(meta.get('period_rank', -1), period_rank(period) if period else -1)
+            stored_start = meta.get('start')
+            complete_until = max(complete_until, meta.get('complete_until', 0))
+            fetched_at = now if period else meta.get('fetched_at', 0)
+        else:
+            merged = new_bars
+            rank = period_rank(period) if period else -1
+            stored_start = None
+            fetched_at = now if period else 0
+
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+        candidates = [s for s in (stored_start, start) if s]
+        if not start:
+            candidates.append(merged.index[0].strftime("%Y-%m-%d"))
+        new_start = min(candidates, key=pd.Timestamp)
+
+        index = merged.index.tz_convert('UTC') if tz else merged.index
+        records = np.empty(len(merged), dtype=BAR_DTYPE)
+        records['ts'] = index.as_unit('ns').asi8
+        for col in OHLCV_COLUMNS:
+            records[col] = merged[col].to_numpy()
+
+        series_dir = self._series_dir(ticker, interval)
+        series_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file and swap it in so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=series_dir, suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, records)
+        os.replace(tmp_path, series_dir / "bars.npy")
+
+        new_meta = {
+            'fetched_at': fetched_at,
+            'complete_until': complete_until,
+            'period_rank': rank,
+            'start': new_start,
+            'tz': tz,
+            'rows': len(records),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=series_dir, suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(new_meta, f)
+        os.replace(tmp_path, series_dir / "meta.json")
+
+        logger.debug(f"Bar store: saved {len(records)} bars for {ticker} {interval}")
+
+    def clear(self) -> None:
+        """Remove every stored series"""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,82 @@
+"""
+Candlestick Pattern Scanner
+Bullish candlestick patterns for every bar of a series in one pass of
+array comparisons (bar 1 = two bars ago, bar 3 = the current bar)
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.services import indicator_kernels as kernels
+
+
+# Pattern name -> score, in reporting order
+BULLISH_PATTERNS: Dict[str, int] = {
+    "Bullish Engulfing": 40,
+    "Morning Star": 35,
+    "Hammer": 30,
+    "Three White Soldiers": 35,
+    "Piercing Pattern": 30,
+    "Bullish Harami": 25,
+    "Doji at Support": 20,
+}
+
+
+def recent_low(low: np.ndarray, lookback: int = 20) -> np.ndarray:
+    """Lowest low of the ``lookback`` bars before each bar (fewer at the start, NaN on the first)"""
+    low = np.asarray(low, dtype=float)
+    out = np.full(len(low), np.nan)
+    if len(low) < 2:
+        return out
+    # Bars with a full lookback use the rolling minimum, earlier ones the running minimum
+    out[1:] = np.minimum.accumulate(low[:-1])
+    if len(low) > lookback:
+        out[lookback:] = kernels.rolling_min(low, lookback)[lookback - 1:-1]
+    return out
+
+
+def scan_bullish_patterns(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                          support_lookback: int = 20, support: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Detect every bullish pattern at every bar
+
+    Args:
+        open_, high, low, close: Bar values of the whole series
+        support_lookback: Bars before the doji that define the support low
+        support: Precomputed support low per bar (default ``recent_low``),
+            lets a caller scan only the last bars of a long series
+
+    Returns:
+        Mapping pattern name (BULLISH_PATTERNS order) -> boolean array,
+        False where the bars a pattern needs are missing
+    """
+    o3, h3, l3, c3 = (np.asarray(a, dtype=float) for a in (open_, high, low, close))
+    o2, c2 = kernels.shift(o3, 1), kernels.shift(c3, 1)
+    o1, c1 = kernels.shift(o3, 2), kernels.shift(c3, 2)
+
+    body1 = np.abs(c1 - o1)
+    body2 = np.abs(c2 - o2)
+    body3 = np.abs(c3 - o3)
+    lower_shadow = np.minimum(o3, c3) - l3
+    upper_shadow = h3 - np.maximum(o3, c3)
+    if support is None:
+        support = recent_low(l3, support_lookback)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "Bullish Engulfing": (c2 < o2) & (c3 > o3) & (c3 > o2) & (o3 < c2) & (body3 > body2 * 1.5),
+            "Morning Star": (c1 < o1) & (body2 < body1 * 0.3) & (c3 > o3) & (c3 > (o1 + c1) / 2),
+            "Hammer": (body3 > 0) & (lower_shadow > body3 * 2) & (upper_shadow < body3 * 0.5),
+            "Three White Soldiers": (
+                (c1 > o1) & (c2 > o2) & (c3 > o3) & (c3 > c2) & (c2 > c1)
+                & (c2 > c1 * 1.005) & (c3 > c2 * 1.005)
+            ),
+            "Piercing Pattern": (c1 < o1) & (c2 > o2) & (o2 < c1) & (c2 > (o1 + c1) / 2) & (c2 < o1),
+            "Bullish Harami": (c1 < o1) & (c2 > o2) & (o2 > c1) & (c2 < o1) & (body2 < body1 * 0.7),
+            "Doji at Support": (body3 < (h3 - l3) * 0.1) & (np.abs(l3 - support) / support < 0.02),
+        }
+
+
+def pattern_scores(patterns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Summed BULLISH_PATTERNS score of the patterns found at each bar"""
+    return sum(hits.astype(int) * BULLISH_PATTERNS[name] for name, hits in patterns.items())
@@ -1,24 +1,43 @@
 """
 Data fetching service for stock market data using yfinance
-Supports real-time and historical data with caching
+Supports real-time and historical data with caching and a persistent on-disk bar store
 With fallback to mock data for serverless environments
 """
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, Dict, Any, List
+from app.config import settings
+from app.services.async_market_client import AsyncMarketDataClient
+from app.services.bar_store import BarStore, slice_period, slice_range
+from app.services.frame_cache import FrameCache
+from app.services.single_flight import SingleFlight, AsyncSingleFlight
+from app.services.synthetic_market import SyntheticMarket, bar_count
 from app.utils.logger import logger
 import time
 import os
-import random
 import numpy as np
 
 
 class DataFetcher:
     """Service for fetching stock data from yfinance with mock data fallback"""
     
-    # Class-level cache for better memory management
-    _shared_cache: Dict[str, Dict[str, Any]] = {}
+    # Class-level LRU cache bounded by a memory budget
+    _shared_cache = FrameCache(settings.cache_max_bytes)
+    
+    # Persistent on-disk bar store shared by every instance (survives restarts)
+    _bar_store: Optional[BarStore] = None
+    
+    # Non-blocking chart API client for the async fetch path
+    _async_client: Optional[AsyncMarketDataClient] = None
+    
+    # In-flight request coalescing for threads and asyncio tasks
+    _inflight = SingleFlight()
+    _inflight_async = AsyncSingleFlight()
+    
+    # Seeded synthetic market used for mock data
+    _synthetic_market: Optional[SyntheticMarket] = None
+    MOCK_MAX_BARS = 1000
     
     # Base prices for mock data generation (approximate real prices in TRY)
     MOCK_BASE_PRICES = {
@@ -56,7 +75,7 @@ class DataFetcher:
     def __init__(self):
         """Initialize the data fetcher"""
         self.cache = DataFetcher._shared_cache  # Use shared cache
-        self.cache_ttl: int = 300  # 5 minutes - prevents Yahoo Finance rate limiting
+        self.cache_ttl: Optional[int] = None  # Overrides the per-interval TTLs when set
         self.use_mock_data = os.getenv("VERCEL") == "1"  # Use mock data on Vercel
         
         # BIST 30 + Altın hisseleri
@@ -98,6 +117,10 @@ class DataFetcher:
         """
         Generate realistic mock stock data for demo purposes
         
+        Bars come from the seeded synthetic market: each bar depends only on
+        the ticker, interval and bar time, so a later call extends the
+        earlier one with new bars, and any ticker name is supported.
+        
         Args:
             ticker: Stock ticker symbol
             interval: Data interval (1d, 1h, etc.)
@@ -106,89 +129,25 @@ class DataFetcher:
         Returns:
             DataFrame with mock OHLCV data
         """
-        # Get base price for ticker or use default
-        base_price = self.MOCK_BASE_PRICES.get(ticker, 100.0)
-        
-        # Calculate number of data points based on period and interval
-        period_days = {
-            "1d": 1, "5d": 5, "1mo": 22, "3mo": 66, 
-            "6mo": 132, "1y": 252, "2y": 504, "max": 1000
-        }
-        interval_minutes = {
-            "1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30,
-            "60m": 60, "90m": 90, "1h": 60, "1d": 1440, "1wk": 10080
-        }
-        
-        days = period_days.get(period, 22)
-        interval_min = interval_minutes.get(interval, 60)
-        
-        # Calculate number of data points (trading hours: 10:00-18:00 = 8 hours)
-        if interval_min >= 1440:  # Daily or longer
-            num_points = days
-        else:
-            trading_minutes_per_day = 480  # 8 hours
-            points_per_day = trading_minutes_per_day // interval_min
-            num_points = min(days * points_per_day, 1000)  # Cap at 1000 points
-        
-        # Generate timestamps
-        end_time = datetime.now()
-        if interval_min >= 1440:
-            # Daily data - go back by days
-            timestamps = [end_time - timedelta(days=i) for i in range(num_points)]
-        else:
-            # Intraday data
-            timestamps = [end_time - timedelta(minutes=i * interval_min) for i in range(num_points)]
-        timestamps = timestamps[::-1]  # Oldest first
-        
-        # Generate realistic price movements using random walk
-        np.random.seed(hash(ticker + period) % 2**32)  # Consistent data for same ticker
-        
-        # Daily volatility (BIST stocks are typically 2-4% daily volatility)
-        daily_volatility = 0.025
-        if interval_min < 1440:
-            # Scale volatility for intraday
-            volatility = daily_volatility * np.sqrt(interval_min / 1440)
-        else:
-            volatility = daily_volatility
-        
-        # Generate returns with slight positive drift
-        returns = np.random.normal(0.0002, volatility, num_points)
-        
-        # Calculate prices from returns
-        price_multipliers = np.exp(np.cumsum(returns))
-        close_prices = base_price * price_multipliers
-        
-        # Generate OHLC from close prices
-        data = []
-        for i, (ts, close) in enumerate(zip(timestamps, close_prices)):
-            # Generate realistic OHLC
-            daily_range = close * volatility * 2
-            high = close + random.uniform(0, daily_range)
-            low = close - random.uniform(0, daily_range)
-            open_price = random.uniform(low, high)
-            
-            # Ensure proper OHLC relationship
-            high = max(open_price, close, high)
-            low = min(open_price, close, low)
-            
-            # Generate volume (higher volume for larger stocks)
-            base_volume = int(base_price * 10000)
-            volume = int(base_volume * random.uniform(0.5, 2.0))
-            
-            data.append({
-                'open': round(open_price, 2),
-                'high': round(high, 2),
-                'low': round(low, 2),
-                'close': round(close, 2),
-                'volume': volume
-            })
-        
-        df = pd.DataFrame(data, index=pd.DatetimeIndex(timestamps))
-        df.index.name = 'Datetime'
-        
+        df = self._generate_mock_many([ticker], interval, period)[ticker]
         logger.info(f"Generated {len(df)} mock data points for {ticker}")
         return df
     
+    @classmethod
+    def _get_synthetic_market(cls) -> SyntheticMarket:
+        """Seeded synthetic market shared by every instance"""
+        if cls._synthetic_market is None:
+            cls._synthetic_market = SyntheticMarket(
+                seed=settings.mock_data_seed,
+                base_prices=cls.MOCK_BASE_PRICES
+            )
+        return cls._synthetic_market
+    
+    def _generate_mock_many(self, tickers: List[str], interval: str, period: str) -> Dict[str, pd.DataFrame]:
+        """Generate mock bars for many tickers in one vectorized call"""
+        bars = bar_count(interval, period, max_bars=self.MOCK_MAX_BARS)
+        return self._get_synthetic_market().generate(tickers, interval, bars=bars)
+    
     def validate_ticker(self, ticker: str) -> bool:
         """
         Validate if ticker exists and is tradable
@@ -230,19 +189,180 @@ class DataFetcher:
                 return True
             return False
     
+    @classmethod
+    def _get_bar_store(cls) -> Optional[BarStore]:
+        """Get the shared bar store (None when disabled)"""
+        if not settings.bar_store_enabled:
+            return None
+        if cls._bar_store is None:
+            cls._bar_store = BarStore(settings.bar_store_dir)
+        return cls._bar_store
+    
+    def _read_bar_store(self, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        """
+        Read bars from the persistent store if it is fresh and covers the period
+        
+        Returns:
+            DataFrame trimmed to ``period`` or an empty DataFrame on a store miss
+        """
+        store = self._get_bar_store()
+        if store is None:
+            return pd.DataFrame()
+        
+        meta = store.read_meta(ticker, interval)
+        if not (store.covers_period(meta, period) and store.is_fresh(meta, self._cache_ttl(interval))):
+            return pd.DataFrame()
+        
+        df, _ = store.load(ticker, interval)
+        df = slice_period(df, period)
+        if not df.empty:
+            logger.info(f"Loaded {len(df)} bars for {ticker} from bar store")
+        return df
+    
     def _get_cache_key(self, ticker: str, interval: str, period: str) -> str:
         """Generate cache key for data"""
         return f"{ticker}_{interval}_{period}"
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid"""
-        if cache_key not in self.cache:
-            return False
+    def _cache_ttl(self, interval: str) -> int:
+        """
+        Seconds a cached series stays valid
+        
+        Intraday bars change every few minutes and use the realtime TTL,
+        daily and longer bars use the historical TTL.
+        """
+        if self.cache_ttl is not None:
+            return self.cache_ttl
+        if interval.endswith('m') or interval.endswith('h'):
+            return settings.cache_ttl_realtime
+        return settings.cache_ttl_historical
+    
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Any]:
+        """Cache size and hit/miss/eviction counters plus request coalescing counters"""
+        stats = cls._shared_cache.stats()
+        stats['single_flight'] = {
+            'calls': cls._inflight.calls + cls._inflight_async.calls,
+            'coalesced': cls._inflight.coalesced + cls._inflight_async.coalesced,
+            'in_flight': cls._inflight.in_flight() + cls._inflight_async.in_flight(),
+        }
+        return stats
+    
+    def _download_history(self, ticker: str, **kwargs) -> pd.DataFrame:
+        """
+        Call yfinance history() and normalize the result
+        
+        Args:
+            ticker: Stock ticker symbol
+            **kwargs: Passed to ``Ticker.history`` (period/start, interval, timeout)
+        
+        Returns:
+            DataFrame with lowercase columns, empty on any upstream problem
+        """
+        stock = yf.Ticker(ticker)
+        
+        # Add timeout and better error handling for yfinance
+        try:
+            df = stock.history(**kwargs)
+        except TypeError:
+            # Older yfinance versions don't support timeout parameter
+            kwargs.pop('timeout', None)
+            df = stock.history(**kwargs)
+        except Exception as hist_err:
+            logger.error(f"yfinance history error for {ticker}: {hist_err}")
+            df = pd.DataFrame()
+        
+        # Handle None return from yfinance
+        if df is None:
+            df = pd.DataFrame()
+        
+        # Check if df is actually a DataFrame
+        if not isinstance(df, pd.DataFrame):
+            logger.warning(f"yfinance returned unexpected type {type(df)} for {ticker}")
+            df = pd.DataFrame()
+        
+        if not df.empty:
+            # Clean column names - check if columns exist
+            if hasattr(df, 'columns') and df.columns is not None and len(df.columns) > 0:
+                df.columns = df.columns.str.lower()
+        
+        return df
+    
+    def _get_delta_base(self, cache_key: str, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        """
+        Find a series we already hold that a delta fetch can extend
+        
+        Prefers the expired in-memory entry, then a stale bar store series.
+        Mock data is never used as a base.
+        
+        Returns:
+            DataFrame of previously fetched bars or an empty DataFrame
+        """
+        entry = self.cache.peek(cache_key)
+        if entry is not None and entry.get('source') == 'live' and not entry['data'].empty:
+            return entry['data']
+        
+        store = self._get_bar_store()
+        if store is not None:
+            meta = store.read_meta(ticker, interval)
+            if store.covers_period(meta, period):
+                df, _ = store.load(ticker, interval)
+                return df
+        
+        return pd.DataFrame()
+    
+    def _fetch_delta(self, ticker: str, interval: str, period: str, base: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fetch only the bars after the last cached timestamp and append them
+        
+        The request starts at the last cached bar (inclusive) so a bar that
+        was still forming when it was cached gets replaced by its final value.
+        
+        Args:
+            ticker: Stock ticker symbol
+            interval: Data interval
+            period: Data period the merged series is trimmed to
+            base: Previously fetched bars (oldest first)
+        
+        Returns:
+            Merged DataFrame, or an empty DataFrame if the delta fetch failed
+        """
+        try:
+            new_bars = self._download_history(ticker, start=base.index[-1], interval=interval, timeout=15)
+        except Exception as e:
+            logger.error(f"Error fetching delta for {ticker}: {type(e).__name__}: {str(e)}")
+            return pd.DataFrame()
+        
+        return self._merge_delta(ticker, interval, period, base, new_bars)
+    
+    def _merge_delta(
+        self,
+        ticker: str,
+        interval: str,
+        period: str,
+        base: pd.DataFrame,
+        new_bars: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Append delta bars to their base series, trim to the period and persist"""
+        last_ts = base.index[-1]
+        
+        if new_bars.empty:
+            return pd.DataFrame()
+        
+        new_bars = new_bars.reindex(columns=base.columns)
+        if str(new_bars.index.tz) != str(base.index.tz):
+            return pd.DataFrame()
+        
+        merged = pd.concat([base[base.index < new_bars.index[0]], new_bars])
+        merged = merged[~merged.index.duplicated(keep='last')]
+        merged = slice_period(merged, period)
+        
+        logger.info(f"Delta fetch for {ticker}: {len(new_bars)} new bars since {last_ts} (interval={interval})")
         
-        cached_time = self.cache[cache_key].get('timestamp', 0)
-        current_time = time.time()
+        store = self._get_bar_store()
+        if store is not None:
+            store.write(ticker, interval, merged, period=period)
         
-        return (current_time - cached_time) < self.cache_ttl
+        return merged
     
     def fetch_realtime_data(
         self, 
@@ -259,68 +379,297 @@ class DataFetcher:
             period: Data period - 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
         
         Returns:
-            DataFrame with columns: Open, High, Low, Close, Volume, and datetime index
+            DataFrame with columns: Open, High, Low, Close, Volume, and datetime index.
+            It is a view over the cached read-only arrays: adding columns is
+            fine, in-place writes to existing columns raise ValueError.
         """
         cache_key = self._get_cache_key(ticker, interval, period)
         
-        # Check cache first
-        if self._is_cache_valid(cache_key):
-            logger.info(f"Returning cached data for {ticker}")
-            return self.cache[cache_key]['data'].copy()
+        # Check cache first - a shallow view, no data is copied
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            logger.debug(f"Returning cached data for {ticker}")
+            return entry['data'].copy(deep=False)
+        
+        return self._fetch_coalesced(cache_key, ticker, interval, period)
+    
+    async def fetch_realtime_data_async(
+        self,
+        ticker: str,
+        interval: str = "5m",
+        period: str = "1d"
+    ) -> pd.DataFrame:
+        """
+        Async variant of fetch_realtime_data for event-loop callers
+        
+        Cache misses are fetched through the pooled async chart client, so
+        the event loop is never blocked, and concurrent tasks asking for the
+        same key await one shared fetch.
+        
+        Returns:
+            DataFrame with the same layout as fetch_realtime_data
+        """
+        cache_key = self._get_cache_key(ticker, interval, period)
+        
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            return entry['data'].copy(deep=False)
+        
+        df, _ = await DataFetcher._inflight_async.do(
+            cache_key, self._fetch_uncached_async, cache_key, ticker, interval, period
+        )
+        return df.copy(deep=False)
+    
+    @classmethod
+    def _get_async_client(cls) -> AsyncMarketDataClient:
+        """Shared async chart API client (created on first use)"""
+        if cls._async_client is None:
+            cls._async_client = AsyncMarketDataClient()
+        return cls._async_client
+    
+    @classmethod
+    async def close_async_client(cls) -> None:
+        """Close the pooled connections of the async client"""
+        if cls._async_client is not None:
+            await cls._async_client.aclose()
+    
+    async def _fetch_uncached_async(self, cache_key: str, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        """
+        Non-blocking counterpart of _fetch_uncached
+        
+        Same bar store / delta / full download / mock order, with the network
+        requests going through the pooled async chart client instead of yfinance.
+        """
+        entry = self.cache.peek(cache_key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry['data']
         
         df = pd.DataFrame()
         
-        # Try yfinance first (unless we know it won't work on Vercel)
         if not self.use_mock_data:
+            client = self._get_async_client()
+            df = self._read_bar_store(ticker, interval, period)
+            
+            if df.empty:
+                base = self._get_delta_base(cache_key, ticker, interval, period)
+                if not base.empty:
+                    new_bars = await client.fetch_chart(ticker, interval, start=base.index[-1])
+                    df = self._merge_delta(ticker, interval, period, base, new_bars)
+            
+            if df.empty:
+                logger.info(f"Fetching real-time data for {ticker} (interval={interval}, period={period}, async)")
+                df = await client.fetch_chart(ticker, interval, period=period)
+                
+                if not df.empty:
+                    logger.info(f"Successfully fetched {len(df)} real data points for {ticker}")
+                    store = self._get_bar_store()
+                    if store is not None:
+                        store.write(ticker, interval, df, period=period)
+        
+        return self._cache_result(cache_key, ticker, interval, period, df)
+    
+    def _fetch_coalesced(self, cache_key: str, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        """Resolve a cache miss; concurrent misses for the same key share one upstream fetch"""
+        df, _ = DataFetcher._inflight.do(
+            cache_key, self._fetch_uncached, cache_key, ticker, interval, period
+        )
+        return df.copy(deep=False)
+    
+    def _fetch_uncached(self, cache_key: str, ticker: str, interval: str, period: str) -> pd.DataFrame:
+        """Resolve a cache miss (bar store, delta, full download, mock) and cache the result"""
+        # Another caller may have filled the cache while we waited for the flight
+        entry = self.cache.peek(cache_key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry['data']
+        
+        df = pd.DataFrame()
+        
+        # Warm path: bars persisted by an earlier process
+        if not self.use_mock_data:
+            df = self._read_bar_store(ticker, interval, period)
+        
+        # Delta path: extend the series we already hold with only the newest bars
+        if df.empty and not self.use_mock_data:
+            base = self._get_delta_base(cache_key, ticker, interval, period)
+            if not base.empty:
+                df = self._fetch_delta(ticker, interval, period, base)
+        
+        # Try yfinance first (unless we know it won't work on Vercel)
+        if df.empty and not self.use_mock_data:
             try:
                 logger.info(f"Fetching real-time data for {ticker} (interval={interval}, period={period})")
                 
-                stock = yf.Ticker(ticker)
-                
-                # Add timeout and better error handling for yfinance
-                try:
-                    df = stock.history(period=period, interval=interval, timeout=15)
-                except TypeError:
-                    # Older yfinance versions don't support timeout parameter
-                    df = stock.history(period=period, interval=interval)
-                except Exception as hist_err:
-                    logger.error(f"yfinance history error for {ticker}: {hist_err}")
-                    df = pd.DataFrame()
-                
-                # Handle None return from yfinance
-                if df is None:
-                    df = pd.DataFrame()
+                df = self._download_history(ticker, period=period, interval=interval, timeout=15)
                 
-                # Check if df is actually a DataFrame
-                if not isinstance(df, pd.DataFrame):
-                    logger.warning(f"yfinance returned unexpected type {type(df)} for {ticker}")
-                    df = pd.DataFrame()
-                    
                 if not df.empty:
-                    # Clean column names - check if columns exist
-                    if hasattr(df, 'columns') and df.columns is not None and len(df.columns) > 0:
-                        df.columns = df.columns.str.lower()
-                    
                     logger.info(f"Successfully fetched {len(df)} real data points for {ticker}")
                     
+                    store = self._get_bar_store()
+                    if store is not None:
+                        store.write(ticker, interval, df, period=period)
+                    
             except Exception as e:
                 logger.error(f"Error fetching real-time data for {ticker}: {type(e).__name__}: {str(e)}")
                 df = pd.DataFrame()
         
+        return self._cache_result(cache_key, ticker, interval, period, df)
+    
+    def _cache_result(
+        self,
+        cache_key: str,
+        ticker: str,
+        interval: str,
+        period: str,
+        df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Cache fetched bars, falling back to mock data when nothing live was found"""
+        source = 'live'
+        
         # Fallback to mock data if yfinance failed or we're on Vercel
         if df.empty:
             logger.info(f"Using mock data for {ticker} (Vercel={self.use_mock_data})")
             df = self._generate_mock_data(ticker, interval, period)
+            source = 'mock'
         
         # Cache the data
         if not df.empty:
-            self.cache[cache_key] = {
-                'data': df.copy(),
-                'timestamp': time.time()
-            }
+            df = self.cache.put(cache_key, df, self._cache_ttl(interval), source)
         
         return df
     
+    def fetch_many(
+        self,
+        tickers: List[str],
+        interval: str = "1d",
+        period: str = "3mo",
+        live_only: bool = False
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch bars for many tickers in a single grouped yfinance request
+        
+        Tickers already in the cache are served from it; the rest are
+        downloaded together and written to the per-ticker cache and bar
+        store, so later ``fetch_realtime_data`` calls hit the cache.
+        
+        Args:
+            tickers: Stock ticker symbols
+            interval: Data interval (same values as fetch_realtime_data)
+            period: Data period (same values as fetch_realtime_data)
+            live_only: Never return mock data - tickers the batch could not
+                deliver are left out instead of falling back per ticker
+        
+        Returns:
+            Mapping ticker -> DataFrame (lowercase OHLCV columns); tickers
+            without any data are left out
+        """
+        frames: Dict[str, pd.DataFrame] = {}
+        missing: List[str] = []
+        
+        for ticker in tickers:
+            entry = self.cache.get(self._get_cache_key(ticker, interval, period))
+            if entry is not None and (not live_only or entry['source'] == 'live'):
+                frames[ticker] = entry['data'].copy(deep=False)
+            else:
+                missing.append(ticker)
+        
+        if missing and not self.use_mock_data:
+            logger.info(f"Batch fetching {len(missing)} tickers (interval={interval}, period={period})")
+            batch_key = f"batch_{interval}_{period}_{','.join(sorted(missing))}"
+            # Leader and followers share the frozen cached frames
+            downloaded, _ = DataFetcher._inflight.do(
+                batch_key, self._download_and_cache_many, missing, interval, period
+            )
+            for ticker, frozen in downloaded.items():
+                frames[ticker] = frozen.copy(deep=False)
+            
+            logger.info(f"Batch fetch returned data for {len(downloaded)}/{len(missing)} tickers")
+            missing = [t for t in missing if t not in downloaded]
+        
+        if live_only:
+            return frames
+        
+        if missing and self.use_mock_data:
+            # Whole mock universe from one vectorized call; the loop below
+            # then serves these tickers from the cache
+            ttl = self._cache_ttl(interval)
+            for ticker, df in self._generate_mock_many(missing, interval, period).items():
+                self.cache.put(self._get_cache_key(ticker, interval, period), df, ttl, 'mock')
+        
+        # Whatever the batch could not deliver goes through the single-ticker
+        # path (bar store, delta fetch, mock fallback)
+        for ticker in missing:
+            df = self.fetch_realtime_data(ticker, interval, period)
+            if not df.empty:
+                frames[ticker] = df
+        
+        return frames
+    
+    def _download_and_cache_many(self, tickers: List[str], interval: str, period: str) -> Dict[str, pd.DataFrame]:
+        """
+        Batch download, persist and cache - runs once per coalesced batch
+        
+        Returns:
+            Mapping ticker -> frozen (read-only) frame held by the cache
+        """
+        downloaded = self._download_many(tickers, interval, period)
+        store = self._get_bar_store()
+        frozen = {}
+        for ticker, df in downloaded.items():
+            if store is not None:
+                store.write(ticker, interval, df, period=period)
+            frozen[ticker] = self.cache.put(
+                self._get_cache_key(ticker, interval, period),
+                df, self._cache_ttl(interval), 'live'
+            )
+        return frozen
+    
+    def _download_many(self, tickers: List[str], interval: str, period: str) -> Dict[str, pd.DataFrame]:
+        """
+        Run one grouped yf.download call and split it per ticker
+        
+        Returns:
+            Mapping ticker -> DataFrame with lowercase columns (empty tickers omitted)
+        """
+        try:
+            data = yf.download(
+                tickers,
+                period=period,
+                interval=interval,
+                group_by='ticker',
+                auto_adjust=True,   # Same prices as Ticker.history()
+                ignore_tz=False,    # Keep exchange timezone like Ticker.history()
+                threads=True,
+                progress=False,
+                timeout=15
+            )
+        except Exception as e:
+            logger.error(f"Batch download error: {type(e).__name__}: {str(e)}")
+            return {}
+        
+        if data is None or not isinstance(data, pd.DataFrame) or data.empty:
+            return {}
+        
+        frames: Dict[str, pd.DataFrame] = {}
+        grouped = isinstance(data.columns, pd.MultiIndex)
+        
+        for ticker in tickers:
+            if grouped:
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                df = data[ticker].copy()
+            elif len(tickers) == 1:
+                df = data.copy()
+            else:
+                continue
+            
+            df.columns = df.columns.str.lower()
+            # The grouped frame is aligned on the union of all timestamps
+            df = df.dropna(subset=['close'])
+            if not df.empty:
+                frames[ticker] = df
+        
+        return frames
+    
     def fetch_historical_data(
         self, 
         ticker: str, 
@@ -338,6 +687,15 @@ class DataFetcher:
         Returns:
             DataFrame with historical data
         """
+        store = self._get_bar_store()
+        if store is not None:
+            meta = store.read_meta(ticker, "1d")
+            if store.covers_range(meta, start_date, end_date):
+                df, _ = store.load(ticker, "1d")
+                df = slice_range(df, start_date, end_date)
+                logger.info(f"Loaded {len(df)} historical bars for {ticker} from bar store")
+                return df
+        
         try:
             logger.info(f"Fetching historical data for {ticker} from {start_date} to {end_date}")
             
@@ -369,6 +727,9 @@ class DataFetcher:
                 df.columns = df.columns.str.lower()
             
             logger.info(f"Successfully fetched {len(df)} historical data points for {ticker}")
+            
+            if store is not None:
+                store.write(ticker, "1d", df, start=start_date, end=end_date)
             return df
             
         except Exception as e:
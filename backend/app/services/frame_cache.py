@@ -0,0 +1,213 @@
+"""
+Bounded in-memory DataFrame cache
+LRU eviction under a byte budget with per-entry TTLs and hit/miss counters.
+Cached frames are immutable: readers get cheap views over read-only arrays.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Approximate memory footprint of a DataFrame (values and index)"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy a frame once into read-only column arrays
+
+    Views of the result (``df.copy(deep=False)``) cost no data copy: new
+    columns land in the view only and in-place writes to the shared columns
+    raise ``ValueError`` instead of silently corrupting the cache.
+
+    Args:
+        df: Frame to freeze
+
+    Returns:
+        Frame with the same index and columns backed by read-only arrays
+    """
+    dtypes = set(df.dtypes)
+    if len(dtypes) == 1 and isinstance(next(iter(dtypes)), np.dtype):
+        # Homogeneous frames stay one contiguous (column-major) block
+        block = np.array(df.to_numpy().T)
+        block.flags.writeable = False
+        return pd.DataFrame(block.T, index=df.index, columns=df.columns, copy=False)
+
+    columns = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, np.dtype):
+            values = df[col].to_numpy(copy=True)
+            values.flags.writeable = False
+            columns[col] = values
+        else:
+            # Extension dtypes keep their own (copied) storage
+            columns[col] = df[col].copy()
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def compact_frame(df: pd.DataFrame, dtype: Any = np.float32) -> pd.DataFrame:
+    """
+    Copy the float columns of a frame into one contiguous block of ``dtype``
+
+    Each column is a contiguous slice of the block, so column reads stay
+    cheap and the whole frame is a single allocation. float32 halves the
+    footprint of float64 frames (about 7 significant digits remain).
+
+    Args:
+        df: Frame to compact
+        dtype: Float type of the block
+
+    Returns:
+        Frame with the same index and column order; non-float columns are
+        kept as they are
+    """
+    floats = [col for col in df.columns if isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind == 'f']
+    block = np.empty((len(floats), len(df)), dtype=dtype)
+    for row, col in zip(block, floats):
+        row[:] = df[col].to_numpy()
+    result = pd.DataFrame(block.T, index=df.index, columns=floats, copy=False)
+    if len(floats) == len(df.columns):
+        return result
+    for col in df.columns:
+        if col not in result:
+            result[col] = df[col]
+    return result[list(df.columns)]
+
+
+class FrameCache:
+    """Thread-safe LRU cache of DataFrames bounded by total size in bytes"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget; least recently used entries are evicted
+                once the cached frames exceed it
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, key: str, version: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Return a live entry and mark it as recently used
+
+        Expired entries count as misses but stay cached so they can still
+        serve as the base of a delta fetch (see ``peek``).
+
+        Args:
+            key: Cache key
+            version: When given, an entry stored under another version is a miss
+
+        Returns:
+            Entry dict (data, timestamp, ttl, source, version and any
+            ``extra`` values given to ``put``) or None -
+            ``data`` is shared and read-only, hand out ``data.copy(deep=False)``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (version is not None and entry['version'] != version):
+                self.misses += 1
+                return None
+            if not self.is_fresh(entry):
+                self.misses += 1
+                self.expired += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        """Check whether an entry is still within its TTL"""
+        return time.time() - entry['timestamp'] < entry['ttl']
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return an entry even if it has expired, without touching LRU order or stats"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, data: pd.DataFrame, ttl: float, source: str = 'live', version: Any = None,
+            extra: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Store a frozen copy of a frame and evict least recently used entries
+        over the budget
+
+        Args:
+            key: Cache key
+            data: Frame to cache
+            ttl: Seconds the entry is served before it counts as expired
+            source: 'live' or 'mock'
+            version: Optional tag of the inputs the frame was built from
+            extra: Optional values derived from the frame, stored with the
+                entry and returned by ``get`` alongside ``data``
+
+        Returns:
+            The frozen frame now held by the cache
+        """
+        data = freeze_frame(data)
+        size = frame_nbytes(data)
+        entry = {
+            'data': data,
+            'timestamp': time.time(),
+            'ttl': ttl,
+            'source': source,
+            'version': version,
+            'bytes': size,
+        }
+        if extra:
+            entry.update(extra)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old['bytes']
+            self._entries[key] = entry
+            self.bytes += size
+
+            # Always keep the newest entry, even if it alone exceeds the budget
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted['bytes']
+                self.evictions += 1
+
+        return data
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -23,21 +23,31 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, date
+import importlib.util
 import json
 import os
+import sys
 
-# Win Rate Booster'ı import et (opsiyonel)
-try:
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-    from win_rate_booster import apply_win_rate_boosters, check_bullish_candlestick_patterns
-    BOOSTER_AVAILABLE = True
-except ImportError:
-    BOOSTER_AVAILABLE = False
+from app.services.data_fetcher import DataFetcher
+from app.services import indicator_kernels as kernels
+
+# Win Rate Booster (opsiyonel) - burada sadece varlığı kontrol edilir, modül
+# ilk kullanımda import edilir. win_rate_booster app.services'i import ettiği
+# için burada import edilseydi, booster süreçte ilk import edildiğinde yarım
+# yüklenmiş modülü görürdük (döngüsel import) ve bayrak False kalırdı.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+BOOSTER_AVAILABLE = importlib.util.find_spec("win_rate_booster") is not None
+if not BOOSTER_AVAILABLE:
     print("⚠️ Win Rate Booster modülü yüklenemedi. Bonus özellikler devre dışı.")
 
 
+def apply_win_rate_boosters(df: pd.DataFrame, idx: int, current_score: float,
+                            prepared: Dict = None) -> Tuple[float, List[str]]:
+    """win_rate_booster.apply_win_rate_boosters (modül ilk çağrıda yüklenir)"""
+    from win_rate_booster import apply_win_rate_boosters as apply_boosters
+    return apply_boosters(df, idx, current_score, prepared)
+
+
 class SignalType(Enum):
     BUY = "BUY"
     SELL = "SELL"
@@ -481,6 +491,7 @@ class HybridSignalGenerator:
     def __init__(self, params: HybridRiskManagement = None):
         self.params = params or HybridRiskManagement()
         self.booster_available = BOOSTER_AVAILABLE
+        self.data_fetcher = DataFetcher()
         self._reset_daily_state()
     
     def _reset_daily_state(self):
@@ -532,9 +543,9 @@ class HybridSignalGenerator:
             
             close = xu100['Close'].values.flatten()
             
-            # EMA10 ve EMA20 hesapla
-            ema10 = pd.Series(close).ewm(span=10).mean().iloc[-1]
-            ema20 = pd.Series(close).ewm(span=20).mean().iloc[-1]
+            # EMA10 ve EMA20 hesapla (strateji ayarlı ewm kullanır: adjust=True)
+            ema10 = kernels.ema(close, 10, adjust=True)[-1]
+            ema20 = kernels.ema(close, 20, adjust=True)[-1]
             current_price = close[-1]
             
             # Uptrend: Fiyat > EMA10 > EMA20
@@ -863,6 +874,9 @@ class HybridSignalGenerator:
         print(f"📈 Max Picks: {self.params.max_picks_per_day}/gün")
         print("-" * 50)
         
+        # Tüm hisseler tek toplu istekle (hisse başına ayrı indirme yerine)
+        frames = self.data_fetcher.fetch_many(tickers, interval='1d', period=period, live_only=True)
+        
         for ticker in tickers:
             # Max picks kontrolü
             if not self._check_daily_limit():
@@ -870,16 +884,14 @@ class HybridSignalGenerator:
                 break
             
             try:
-                # Veri çek
-                df = yf.download(ticker, period=period, progress=False)
-                
-                # Multi-index düzeltme (yfinance bazen multi-index döndürür)
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = df.columns.get_level_values(0)
+                df = frames.get(ticker)
                 
-                if df.empty or len(df) < 50:
+                if df is None or df.empty or len(df) < 50:
                     continue
                 
+                # Filtreler ve booster yf.download sütun adlarını (Open, Close...) bekliyor
+                df = df.rename(columns=str.capitalize)
+                
                 scanned += 1
                 
                 # Teknik göstergeleri hesapla
@@ -949,37 +961,25 @@ class HybridSignalGenerator:
             low = df[low_col].values.flatten()
             volume = df[volume_col].values.flatten()
             
-            # EMAs
-            ema_9 = pd.Series(close).ewm(span=9).mean().iloc[-1]
-            ema_21 = pd.Series(close).ewm(span=21).mean().iloc[-1]
-            ema_50 = pd.Series(close).ewm(span=50).mean().iloc[-1]
-            ema_200 = pd.Series(close).ewm(span=200).mean().iloc[-1] if len(close) >= 200 else ema_50
+            # EMAs (strateji backtestleri ayarlı ewm ile yapıldı: adjust=True)
+            ema_9 = kernels.ema(close, 9, adjust=True)[-1]
+            ema_21 = kernels.ema(close, 21, adjust=True)[-1]
+            ema_50 = kernels.ema(close, 50, adjust=True)[-1]
+            ema_200 = kernels.ema(close, 200, adjust=True)[-1] if len(close) >= 200 else ema_50
+            ema_20 = kernels.ema(close, 20, adjust=True)[-1]
             
             # RSI
-            delta = pd.Series(close).diff()
-            gain = delta.where(delta > 0, 0).rolling(14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = kernels.rsi(close, 14)[-1]
             
             # MACD
-            ema_12 = pd.Series(close).ewm(span=12).mean()
-            ema_26 = pd.Series(close).ewm(span=26).mean()
-            macd_line = ema_12 - ema_26
-            signal_line = macd_line.ewm(span=9).mean()
-            macd_hist = macd_line - signal_line
+            macd_line, signal_line, macd_hist = kernels.macd(close, 12, 26, 9, adjust=True)
             
             # Volume
-            vol_sma = pd.Series(volume).rolling(20).mean().iloc[-1]
+            vol_sma = kernels.sma(volume, 20)[-1]
             vol_ratio = volume[-1] / vol_sma if vol_sma > 0 else 1.0
             
             # ATR
-            tr = pd.DataFrame({
-                'hl': high - low,
-                'hc': abs(high - np.roll(close, 1)),
-                'lc': abs(low - np.roll(close, 1))
-            }).max(axis=1)
-            atr = pd.Series(tr).rolling(14).mean().iloc[-1]
+            atr = kernels.atr(high, low, close, 14)[-1]
             
             return {
                 'trend': {
@@ -987,13 +987,13 @@ class HybridSignalGenerator:
                     'ema_21': ema_21,
                     'ema_50': ema_50,
                     'ema_200': ema_200,
-                    'ema_20': pd.Series(close).ewm(span=20).mean().iloc[-1]
+                    'ema_20': ema_20
                 },
                 'momentum': {
-                    'rsi': rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50,
-                    'macd': macd_line.iloc[-1],
-                    'macd_signal': signal_line.iloc[-1],
-                    'macd_hist': macd_hist.iloc[-1]
+                    'rsi': rsi if not pd.isna(rsi) else 50,
+                    'macd': macd_line[-1],
+                    'macd_signal': signal_line[-1],
+                    'macd_hist': macd_hist[-1]
                 },
                 'volume': {
                     'current': volume[-1],
@@ -0,0 +1,345 @@
+"""
+Incremental Technical Indicators
+Keeps the running state of every indicator in TechnicalAnalysis.calculate_all_indicators
+so a new or updated bar costs O(1) instead of a full recomputation
+"""
+import math
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from app.services.vwap import VwapEngine
+from app.utils.logger import logger
+
+
+NAN = float('nan')
+
+
+class _Ema:
+    """Recursive EMA matching ``ewm(span, adjust=False).mean()``"""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.prev = NAN  # value before the last bar
+        self.value = NAN
+
+    def update(self, x: float, replace: bool = False) -> float:
+        if not replace:
+            self.prev = self.value
+        if math.isnan(self.prev):
+            self.value = x
+        elif math.isnan(x):
+            # pandas carries the last value over missing inputs
+            self.value = self.prev
+        else:
+            self.value = self.prev + self.alpha * (x - self.prev)
+        return self.value
+
+
+class _Window:
+    """
+    Fixed-size rolling window matching pandas ``rolling(size)`` with the
+    default min_periods: the result is NaN until the window is full of
+    valid values
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: deque = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nans = 0
+        self.shift: Optional[float] = None  # centers values for a stable variance
+        self._pushes = 0
+
+    def _add(self, x: float, sign: float) -> None:
+        if math.isnan(x):
+            self.nans += 1 if sign > 0 else -1
+            return
+        if self.shift is None:
+            self.shift = x
+        d = x - self.shift
+        self.total += sign * d
+        self.total_sq += sign * d * d
+
+    def _resum(self) -> None:
+        # Running sums drift; rebuild them once per window length (amortized O(1))
+        valid = [v - self.shift for v in self.values if not math.isnan(v)] if self.shift is not None else []
+        self.total = math.fsum(valid)
+        self.total_sq = math.fsum(d * d for d in valid)
+
+    def update(self, x: float, replace: bool = False) -> None:
+        if replace and self.values:
+            self._add(self.values[-1], -1)
+            self.values[-1] = x
+            self._add(x, 1)
+            return
+        self.values.append(x)
+        self._add(x, 1)
+        if len(self.values) > self.size:
+            self._add(self.values.popleft(), -1)
+        self._pushes += 1
+        if self._pushes % self.size == 0:
+            self._resum()
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.size and self.nans == 0
+
+    def sum(self) -> float:
+        if not self.ready:
+            return NAN
+        return self.total + self.size * self.shift
+
+    def mean(self) -> float:
+        if not self.ready:
+            return NAN
+        return self.total / self.size + self.shift
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1)"""
+        if not self.ready:
+            return NAN
+        var = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def min(self) -> float:
+        return min(self.values) if self.ready else NAN
+
+    def max(self) -> float:
+        return max(self.values) if self.ready else NAN
+
+
+class IncrementalIndicators:
+    """
+    Streaming state of the calculate_all_indicators set for one series
+
+    ``update`` appends a bar, or replaces the last bar when the timestamp
+    did not change (a still-forming candle). Both cost O(1) per bar -
+    rolling windows have fixed sizes independent of the series length.
+    """
+
+    EMA_PERIODS = (9, 21, 50, 200)
+    SMA_PERIODS = (20, 50, 100)
+
+    def __init__(self):
+        self.last_ts: Optional[pd.Timestamp] = None
+        self.first_ts: Optional[pd.Timestamp] = None
+        self.bars = 0
+        self._prev_bar: Optional[Tuple[float, float, float, float]] = None  # high, low, close, typical
+        self._last_bar: Optional[Tuple[float, float, float, float]] = None
+
+        self._ema = {p: _Ema(p) for p in self.EMA_PERIODS}
+        self._sma = {p: _Window(p) for p in self.SMA_PERIODS}
+        self._ema_fast = _Ema(12)
+        self._ema_slow = _Ema(26)
+        self._macd_signal = _Ema(9)
+        self._tr = _Window(14)
+        self._dm_plus = _Window(14)
+        self._dm_minus = _Window(14)
+        self._gain = _Window(14)
+        self._loss = _Window(14)
+        self._low_14 = _Window(14)
+        self._high_14 = _Window(14)
+        self._stoch_k = _Window(3)
+        self._stoch_d = _Window(3)
+        self._tp_20 = _Window(20)
+        self._close_20 = self._sma[20]
+        self._mf_pos = _Window(14)
+        self._mf_neg = _Window(14)
+        self._obv = (0.0, 0.0)        # (before last bar, current)
+        self._vwap = VwapEngine()
+        self.values: Dict[str, float] = {}
+
+    def update(self, ts: pd.Timestamp, open_: float, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """
+        Apply one bar
+
+        Args:
+            ts: Bar timestamp - equal to the last one replaces that bar
+            open_, high, low, close, volume: Bar values
+
+        Returns:
+            Latest indicator values keyed like the batch columns
+        """
+        replace = self.last_ts is not None and ts == self.last_ts
+        if not replace:
+            if self.last_ts is not None and ts < self.last_ts:
+                raise ValueError(f"Bar at {ts} is older than the last bar {self.last_ts}")
+            self._prev_bar = self._last_bar
+            self.bars += 1
+            if self.first_ts is None:
+                self.first_ts = ts
+        self.last_ts = ts
+
+        typical = (high + low + close) / 3
+        self._last_bar = (high, low, close, typical)
+        prev_high, prev_low, prev_close, prev_typical = self._prev_bar or (NAN, NAN, NAN, NAN)
+        v = self.values
+
+        # Trend
+        for period, ema in self._ema.items():
+            v[f'ema_{period}'] = ema.update(close, replace)
+        for period, window in self._sma.items():
+            window.update(close, replace)
+            v[f'sma_{period}'] = window.mean()
+
+        # ATR: the max skips the missing previous close on the first bar
+        ranges = [high - low, abs(high - prev_close), abs(low - prev_close)]
+        self._tr.update(max((r for r in ranges if not math.isnan(r)), default=NAN), replace)
+        v['atr'] = self._tr.mean()
+
+        # ADX (same simplified directional movement as calculate_adx)
+        high_diff = high - prev_high
+        low_diff = low - prev_low
+        self._dm_plus.update(high_diff if (high_diff > low_diff and high_diff > 0) else 0.0, replace)
+        self._dm_minus.update(low_diff if (low_diff > high_diff and low_diff > 0) else 0.0, replace)
+        v['di_plus'] = self._dm_plus.mean()
+        v['di_minus'] = self._dm_minus.mean()
+        v['adx'] = abs(v['di_plus'] - v['di_minus']) / (v['di_plus'] + v['di_minus'] + 1e-10) * 100
+
+        # RSI
+        delta = close - prev_close
+        self._gain.update(max(delta, 0.0) if not math.isnan(delta) else NAN, replace)
+        self._loss.update(-min(delta, 0.0) if not math.isnan(delta) else NAN, replace)
+        rs = self._gain.mean() / (self._loss.mean() + 1e-10)
+        v['rsi'] = 100 - (100 / (1 + rs))
+
+        # MACD
+        v['macd'] = self._ema_fast.update(close, replace) - self._ema_slow.update(close, replace)
+        v['macd_signal'] = self._macd_signal.update(v['macd'], replace)
+        v['macd_histogram'] = v['macd'] - v['macd_signal']
+
+        # Stochastic
+        self._low_14.update(low, replace)
+        self._high_14.update(high, replace)
+        low_min = self._low_14.min()
+        high_max = self._high_14.max()
+        self._stoch_k.update(100 * (close - low_min) / (high_max - low_min + 1e-10), replace)
+        v['stoch_k'] = self._stoch_k.mean()
+        self._stoch_d.update(v['stoch_k'], replace)
+        v['stoch_d'] = self._stoch_d.mean()
+
+        # CCI
+        self._tp_20.update(typical, replace)
+        v['cci'] = (typical - self._tp_20.mean()) / (0.015 * self._tp_20.std() + 1e-10)
+
+        # Bollinger Bands
+        v['bb_middle'] = self._close_20.mean()
+        std = self._close_20.std()
+        v['bb_upper'] = v['bb_middle'] + std * 2.0
+        v['bb_lower'] = v['bb_middle'] - std * 2.0
+        v['bb_bandwidth'] = (v['bb_upper'] - v['bb_lower']) / (v['bb_middle'] + 1e-10)
+        v['bb_percent'] = (close - v['bb_lower']) / (v['bb_upper'] - v['bb_lower'] + 1e-10)
+
+        # OBV is cumulative: keep the total from before the last bar
+        sign = 1.0 if delta > 0 else (-1.0 if delta < 0 else 0.0)
+        self._obv = self._cumulate(self._obv, sign * volume, replace)
+        v['obv'] = self._obv[1]
+        # VWAP restarts with each session on intraday bars
+        v['vwap'] = self._vwap.update(ts, high, low, close, volume)['vwap']
+
+        # MFI
+        flow = typical * volume
+        self._mf_pos.update(flow if typical > prev_typical else 0.0, replace)
+        self._mf_neg.update(flow if typical < prev_typical else 0.0, replace)
+        ratio = self._mf_pos.sum() / (self._mf_neg.sum() + 1e-10)
+        v['mfi'] = 100 - (100 / (1 + ratio))
+
+        return v
+
+    @staticmethod
+    def _cumulate(state: Tuple[float, float], x: float, replace: bool) -> Tuple[float, float]:
+        before = state[0] if replace else state[1]
+        return before, before + (0.0 if math.isnan(x) else x)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IncrementalIndicators":
+        """Build the state by replaying every bar of an OHLCV frame"""
+        engine = cls()
+        engine.extend(df)
+        return engine
+
+    def extend(self, df: pd.DataFrame) -> Dict[str, float]:
+        """Apply every row of an OHLCV frame in order"""
+        columns = zip(
+            df.index,
+            df['open'].to_numpy(dtype=float),
+            df['high'].to_numpy(dtype=float),
+            df['low'].to_numpy(dtype=float),
+            df['close'].to_numpy(dtype=float),
+            df['volume'].to_numpy(dtype=float),
+        )
+        for row in columns:
+            self.update(*row)
+        return self.values
+
+
+class IndicatorStreams:
+    """
+    Incremental indicator state per (ticker, interval)
+
+    ``sync`` brings the state in line with the latest fetched frame: the
+    still-forming last bar is replaced, new bars are appended and anything
+    else (a new session window, a gap) triggers one full rebuild. Streams
+    run inside ``subscription`` so the state of a ticker is dropped once
+    nobody streams it.
+    """
+
+    def __init__(self):
+        self._engines: Dict[str, IncrementalIndicators] = {}
+        # Running subscriptions per key
+        self._subscribers: Dict[str, int] = {}
+
+    def sync(self, ticker: str, interval: str, df: pd.DataFrame) -> Dict[str, float]:
+        """
+        Update the stream of a ticker from its latest OHLCV frame
+
+        Returns:
+            Latest indicator values (same keys as calculate_all_indicators columns)
+        """
+        if df.empty:
+            return {}
+
+        key = f"{ticker}_{interval}"
+        engine = self._engines.get(key)
+
+        start = None
+        if engine is not None and engine.first_ts == df.index[0] and engine.last_ts is not None:
+            # Re-apply the stored last bar (it may have been still forming) and anything newer
+            start = df.index.searchsorted(engine.last_ts)
+            if start >= len(df) or df.index[start] != engine.last_ts:
+                start = None
+
+        if start is None:
+            engine = IncrementalIndicators.from_frame(df)
+            self._engines[key] = engine
+            logger.debug(f"Rebuilt incremental indicators for {key} ({len(df)} bars)")
+            return engine.values
+
+        return engine.extend(df.iloc[start:])
+
+    def drop(self, ticker: str, interval: str) -> None:
+        """Forget the state of a ticker"""
+        self._engines.pop(f"{ticker}_{interval}", None)
+
+    @contextmanager
+    def subscription(self, ticker: str, interval: str) -> Iterator[None]:
+        """
+        Keep the state of a ticker while a stream uses it
+
+        The state is dropped when the last subscription of the ticker ends
+        (client disconnect or unsubscribe), so tickers nobody streams any
+        more do not keep their rolling windows.
+        """
+        key = f"{ticker}_{interval}"
+        self._subscribers[key] = self._subscribers.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            self._subscribers[key] -= 1
+            if not self._subscribers[key]:
+                del self._subscribers[key]
+                self.drop(ticker, interval)
@@ -0,0 +1,382 @@
+"""
+Indicator Kernels
+The one implementation of the indicator math used by the services, the
+panel screener, the hybrid strategy and the backtest scripts.
+
+Every kernel takes NumPy arrays and returns NumPy arrays. A 1-D input is a
+single series; a 2-D input is (time x series) and every column is computed
+at once. Warm-up and missing-value behaviour follow pandas' rolling/ewm
+defaults, so results equal the pandas formulas they replace.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _as_float(a) -> np.ndarray:
+    return np.asarray(a, dtype=float)
+
+
+def shift(a: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Values ``periods`` rows earlier (NaN where there are none), like ``Series.shift``"""
+    a = _as_float(a)
+    out = np.full_like(a, np.nan)
+    if periods < len(a):
+        out[periods:] = a[:len(a) - periods]
+    return out
+
+
+def diff(a: np.ndarray) -> np.ndarray:
+    """First difference, like ``Series.diff``"""
+    a = _as_float(a)
+    return a - shift(a)
+
+
+# ROLLING WINDOWS
+
+def _window_diff(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each ``window`` rows via a cumulative sum (NaN during warm-up)"""
+    cs = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=cs[1:])
+    out = np.full(values.shape, np.nan)
+    out[window - 1:] = cs[window:] - cs[:-window]
+    return out
+
+
+def _rolling_sums(a: np.ndarray, window: int, squares: bool = False):
+    """
+    Rolling sum (and sum of squares) of mean-centered values
+
+    Centering each column on its mean before the cumulative sums keeps the
+    window differences precise. A window holding any NaN gives NaN, like
+    pandas ``rolling(window)`` with the default min_periods.
+
+    Returns:
+        (sum, sum of squares or None, center)
+    """
+    a = _as_float(a)
+    valid = ~np.isnan(a)
+    with np.errstate(all="ignore"):
+        center = np.nanmean(a, axis=0) if valid.any() else np.zeros(a.shape[1:])
+    center = np.where(np.isnan(center), 0.0, center)
+
+    if a.shape[0] < window:
+        empty = np.full(a.shape, np.nan)
+        return empty, (empty.copy() if squares else None), center
+
+    x = np.where(valid, a - center, 0.0)
+    gaps = _window_diff((~valid).astype(float), window) > 0.5
+    total = _window_diff(x, window)
+    total[gaps] = np.nan
+    total_sq = None
+    if squares:
+        total_sq = _window_diff(x * x, window)
+        total_sq[gaps] = np.nan
+    return total, total_sq, center
+
+
+def _flat_windows(a: np.ndarray, window: int) -> np.ndarray:
+    """Rows whose window holds a single repeated value"""
+    rows = np.arange(a.shape[0]).reshape((-1,) + (1,) * (a.ndim - 1))
+    change = np.ones(a.shape, dtype=bool)
+    change[1:] = a[1:] != a[:-1]  # NaN never repeats
+    start = np.maximum.accumulate(np.where(change, rows, 0), axis=0)
+    return rows - start + 1 >= window
+
+
+def _exact_windows(a: np.ndarray, window: int, result: np.ndarray, scale: float) -> np.ndarray:
+    """
+    Apply pandas' exact cases to a cumulative-sum window result
+
+    Like pandas' rolling sum/mean, a window of one repeated value gives
+    exactly that value (times ``scale``) and a window without negative
+    values is never below zero, so the cumsum rounding residue cannot
+    turn a flat zero window into -4e-16.
+    """
+    a = _as_float(a)
+    if a.shape[0] < window:
+        return result
+    result = np.where(_flat_windows(a, window), a * scale, result)
+    no_negatives = _window_diff((a < 0).astype(float), window) < 0.5
+    return np.where(no_negatives & (result < 0), 0.0, result)
+
+
+def rolling_sum(a: np.ndarray, window: int) -> np.ndarray:
+    """``rolling(window).sum()``"""
+    total, _, center = _rolling_sums(a, window)
+    return _exact_windows(a, window, total + window * center, window)
+
+
+def rolling_mean(a: np.ndarray, window: int) -> np.ndarray:
+    """``rolling(window).mean()``"""
+    total, _, center = _rolling_sums(a, window)
+    return _exact_windows(a, window, total / window + center, 1.0)
+
+
+def rolling_std(a: np.ndarray, window: int) -> np.ndarray:
+    """``rolling(window).std()`` (sample, ddof=1)"""
+    total, total_sq, _ = _rolling_sums(a, window, squares=True)
+    var = (total_sq - total * total / window) / (window - 1)
+    # Rounding can leave a flat window slightly off zero
+    var = np.where(_flat_windows(_as_float(a), window), 0.0, var)
+    return np.sqrt(np.where(var < 0, 0.0, var))
+
+
+def _rolling_extreme(a: np.ndarray, window: int, fn) -> np.ndarray:
+    a = _as_float(a)
+    out = np.full(a.shape, np.nan)
+    if a.shape[0] >= window:
+        out[window - 1:] = fn(np.lib.stride_tricks.sliding_window_view(a, window, axis=0), axis=-1)
+    return out
+
+
+def rolling_min(a: np.ndarray, window: int) -> np.ndarray:
+    """``rolling(window).min()``"""
+    return _rolling_extreme(a, window, np.min)
+
+
+def rolling_max(a: np.ndarray, window: int) -> np.ndarray:
+    """``rolling(window).max()``"""
+    return _rolling_extreme(a, window, np.max)
+
+
+# MOVING AVERAGES
+
+def sma(close: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average"""
+    return rolling_mean(close, period)
+
+
+def ema(close: np.ndarray, span: int, adjust: bool = False) -> np.ndarray:
+    """
+    Exponential moving average, ``ewm(span, adjust).mean()``
+
+    The recursion runs in pandas' compiled ewm loop (NumPy has no recursive
+    filter), once per call for every column of a 2-D input.
+
+    Args:
+        close: Values, 1-D or (time x series)
+        span: EMA span
+        adjust: False for the recursive form seeded with the first value,
+            True for pandas' bias-adjusted default
+    """
+    close = _as_float(close)
+    if close.ndim == 1:
+        return pd.Series(close).ewm(span=span, adjust=adjust).mean().to_numpy()
+    return pd.DataFrame(close).ewm(span=span, adjust=adjust).mean().to_numpy()
+
+
+def ema_sma_seeded(close: np.ndarray, period: int) -> float:
+    """
+    Last value of an EMA seeded with the SMA of the first ``period`` values
+
+    Closed form of the classic loop ``e = x * k + e * (1 - k)`` as one dot
+    product with precomputed decay weights.
+
+    Returns:
+        The final EMA value, NaN if there are fewer than ``period`` values
+    """
+    close = _as_float(close)
+    n = len(close)
+    if n < period:
+        return float('nan')
+    k = 2.0 / (period + 1)
+    decay = np.power(1.0 - k, np.arange(n - period - 1, -1, -1, dtype=float))
+    seed = close[:period].mean()
+    return float(seed * (1.0 - k) ** (n - period) + k * np.dot(decay, close[period:]))
+
+
+# TREND / VOLATILITY
+
+def rolling_linregress(y: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Least-squares line through each trailing window (x = 0 .. window-1)
+
+    The slope of a fixed-size window is a fixed linear filter of the values,
+    so it is one correlation with the centered x weights - exact to rounding,
+    where differences of running x*y sums lose precision on long series.
+    The correlation costs O(window) per bar, O(n * window) in total (the
+    running-sum form is O(n) but drifts).
+
+    Args:
+        y: 1-D values
+        window: Points per fit (at least 2)
+
+    Returns:
+        (slope, intercept) per row, NaN before the first full window;
+        the line of row t is intercept + slope * x over rows t-window+1..t
+    """
+    y = _as_float(y)
+    slope = np.full(y.shape, np.nan)
+    if len(y) < window:
+        return slope, slope.copy()
+    x = np.arange(window, dtype=float)
+    centered = x - x.mean()
+    slope[window - 1:] = np.correlate(y, centered / np.dot(centered, centered), mode="valid")
+    return slope, rolling_mean(y, window) - slope * x.mean()
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Greatest of high-low, |high-prev close|, |low-prev close| (the first bar uses high-low)"""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = shift(close)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average true range (simple mean of the true range)"""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def directional_movement(high: np.ndarray, low: np.ndarray, period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simplified ADX from smoothed directional movement
+
+    Returns:
+        (di_plus, di_minus, adx)
+    """
+    high, low = _as_float(high), _as_float(low)
+    high_diff = diff(high)
+    low_diff = diff(low)
+    with np.errstate(invalid="ignore"):
+        dm_plus = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+        dm_minus = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
+    # Rows without a bar stay missing instead of counting as zero movement
+    missing = np.isnan(high) | np.isnan(low)
+    di_plus = rolling_mean(np.where(missing, np.nan, dm_plus), period)
+    di_minus = rolling_mean(np.where(missing, np.nan, dm_minus), period)
+    adx = np.abs(di_plus - di_minus) / (di_plus + di_minus + 1e-10) * 100
+    return di_plus, di_minus, adx
+
+
+def bollinger_bands(close: np.ndarray, period: int = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger bands
+
+    Returns:
+        (middle, upper, lower)
+    """
+    middle = rolling_mean(close, period)
+    std = rolling_std(close, period)
+    return middle, middle + std * num_std, middle - std * num_std
+
+
+# MOMENTUM
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI from simple rolling means of gains and losses"""
+    delta = diff(close)
+    gain = rolling_mean(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), period)
+    loss = rolling_mean(np.where(np.isnan(delta), np.nan, -np.minimum(delta, 0.0)), period)
+    return 100 - (100 / (1 + gain / (loss + 1e-10)))
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9,
+         adjust: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD line, signal line and histogram
+
+    Returns:
+        (macd, signal, histogram)
+    """
+    line = ema(close, fast, adjust) - ema(close, slow, adjust)
+    signal_line = ema(line, signal, adjust)
+    return line, signal_line, line - signal_line
+
+
+def stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               period: int = 14, smooth_k: int = 3, smooth_d: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Smoothed stochastic oscillator
+
+    Returns:
+        (stoch_k, stoch_d)
+    """
+    low_min = rolling_min(low, period)
+    high_max = rolling_max(high, period)
+    k = rolling_mean(100 * (_as_float(close) - low_min) / (high_max - low_min + 1e-10), smooth_k)
+    return k, rolling_mean(k, smooth_d)
+
+
+def typical_price(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """(high + low + close) / 3"""
+    return (_as_float(high) + _as_float(low) + _as_float(close)) / 3
+
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 20) -> np.ndarray:
+    """Commodity channel index (standard deviation instead of mean deviation)"""
+    tp = typical_price(high, low, close)
+    return (tp - rolling_mean(tp, period)) / (0.015 * rolling_std(tp, period) + 1e-10)
+
+
+# VOLUME
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On-balance volume: cumulative volume signed by the close-to-close direction"""
+    signed = np.sign(np.nan_to_num(diff(close))) * _as_float(volume)
+    # Missing bars add nothing, like pandas' fillna(0) before cumsum
+    return np.cumsum(np.nan_to_num(signed), axis=0)
+
+
+def session_cumsum(a: np.ndarray, sessions: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Cumulative sum that restarts wherever the session id changes
+
+    Args:
+        a: Values, 1-D or (time x series); NaN adds nothing
+        sessions: Session id per row, same shape as ``a`` - None for one
+            session over the whole series
+
+    Returns:
+        Running total since the first row of each row's session
+    """
+    a = np.nan_to_num(_as_float(a))
+    total = np.cumsum(a, axis=0)
+    if sessions is None or len(a) == 0:
+        return total
+    sessions = np.broadcast_to(np.asarray(sessions), a.shape)
+    starts = np.ones(a.shape, dtype=bool)
+    starts[1:] = sessions[1:] != sessions[:-1]
+    rows = np.arange(len(a)).reshape((-1,) + (1,) * (a.ndim - 1))
+    # Row of the session start for every row, then the total just before it
+    start_row = np.maximum.accumulate(np.where(starts, rows, 0), axis=0)
+    return total - np.take_along_axis(total - a, start_row, axis=0)
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         sessions: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Volume weighted average price
+
+    Args:
+        sessions: Session id per row (see ``session_cumsum``); the average
+            restarts with every session, None averages the whole series
+    """
+    volume = _as_float(volume)
+    tp = typical_price(high, low, close)
+    out = session_cumsum(volume * tp, sessions) / (session_cumsum(volume, sessions) + 1e-10)
+    # Missing rows stay missing, like pandas' cumsum
+    return np.where(np.isnan(volume * tp), np.nan, out)
+
+
+def anchored_vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, start: int) -> np.ndarray:
+    """VWAP accumulated from row ``start`` on (earlier rows are NaN)"""
+    high, low, close, volume = (_as_float(x) for x in (high, low, close, volume))
+    out = np.full(close.shape, np.nan)
+    if 0 <= start < len(out):
+        out[start:] = vwap(high[start:], low[start:], close[start:], volume[start:])
+    return out
+
+
+def mfi(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, period: int = 14) -> np.ndarray:
+    """Money flow index"""
+    tp = typical_price(high, low, close)
+    money_flow = tp * _as_float(volume)
+    prev_tp = shift(tp)
+    missing = np.isnan(money_flow)
+    with np.errstate(invalid="ignore"):
+        positive = np.where(missing, np.nan, np.where(tp > prev_tp, money_flow, 0.0))
+        negative = np.where(missing, np.nan, np.where(tp < prev_tp, money_flow, 0.0))
+    ratio = rolling_sum(positive, period) / (rolling_sum(negative, period) + 1e-10)
+    return 100 - (100 / (1 + ratio))
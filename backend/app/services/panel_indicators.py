@@ -0,0 +1,181 @@
+"""
+Panel Technical Indicators
+Computes the calculate_all_indicators set for a whole universe at once on
+(time x ticker) NumPy arrays, so a scan costs a fixed number of array
+operations instead of a pandas pipeline per ticker
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.services import indicator_kernels as kernels
+from app.services.vwap import session_ids
+from app.utils.logger import logger
+
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Same names and order as TechnicalAnalysis.calculate_all_indicators
+INDICATOR_COLUMNS = [
+    "ema_9", "ema_21", "ema_50", "ema_200",
+    "sma_20", "sma_50", "sma_100",
+    "atr", "di_plus", "di_minus", "adx",
+    "rsi", "macd", "macd_signal", "macd_histogram",
+    "stoch_k", "stoch_d", "cci",
+    "bb_middle", "bb_upper", "bb_lower", "bb_bandwidth", "bb_percent",
+    "obv", "vwap", "mfi",
+]
+
+
+def calculate_panel(fields: Dict[str, np.ndarray], padding: Optional[np.ndarray] = None,
+                    sessions: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Compute every indicator column for (time x ticker) OHLCV arrays
+
+    Args:
+        fields: open/high/low/close/volume arrays shaped (T, N)
+        padding: Boolean (T, N) mask of rows that are not bars of the ticker
+            (leading fill of shorter histories); their outputs are NaN
+        sessions: Optional (T, N) session ids - VWAP restarts with each session
+
+    Returns:
+        Mapping column -> (T, N) float array, same values as
+        calculate_all_indicators on each ticker alone
+    """
+    high = fields["high"].astype(float)
+    low = fields["low"].astype(float)
+    close = fields["close"].astype(float)
+    volume = fields["volume"].astype(float)
+    if padding is None:
+        padding = np.isnan(close)
+
+    out: Dict[str, np.ndarray] = {}
+
+    # Trend
+    for period in (9, 21, 50, 200):
+        out[f"ema_{period}"] = kernels.ema(close, period)
+    for period in (20, 50, 100):
+        out[f"sma_{period}"] = kernels.sma(close, period)
+    out["atr"] = kernels.atr(high, low, close, 14)
+    out["di_plus"], out["di_minus"], out["adx"] = kernels.directional_movement(high, low, 14)
+
+    # Momentum
+    out["rsi"] = kernels.rsi(close, 14)
+    out["macd"], out["macd_signal"], out["macd_histogram"] = kernels.macd(close, 12, 26, 9)
+    out["stoch_k"], out["stoch_d"] = kernels.stochastic(high, low, close, 14, 3, 3)
+    out["cci"] = kernels.cci(high, low, close, 20)
+
+    # Volatility
+    out["bb_middle"], out["bb_upper"], out["bb_lower"] = kernels.bollinger_bands(close, 20, 2.0)
+    out["bb_bandwidth"] = (out["bb_upper"] - out["bb_lower"]) / (out["bb_middle"] + 1e-10)
+    out["bb_percent"] = (close - out["bb_lower"]) / (out["bb_upper"] - out["bb_lower"] + 1e-10)
+
+    # Volume (cumulative sums skip padding rows like pandas skips NaN)
+    out["obv"] = kernels.obv(close, volume)
+    out["vwap"] = kernels.vwap(high, low, close, volume, sessions)
+    out["mfi"] = kernels.mfi(high, low, close, volume, 14)
+
+    for column in INDICATOR_COLUMNS:
+        out[column] = np.where(padding, np.nan, out[column])
+    return out
+
+
+class PanelIndicators:
+    """
+    Indicator values for a universe of tickers as one (time x ticker x column) array
+
+    Histories are right-aligned: row -1 is every ticker's latest bar and
+    shorter histories are padded at the top. Each ticker therefore gets
+    exactly the values of a per-ticker calculation even when the tickers
+    traded on different bars.
+    """
+
+    def __init__(self, tickers: List[str], indexes: Dict[str, pd.Index], values: np.ndarray):
+        """
+        Args:
+            tickers: Ticker of each panel column
+            indexes: Each ticker's own bar timestamps
+            values: Array shaped (T, len(tickers), len(INDICATOR_COLUMNS))
+        """
+        self.tickers = tickers
+        self.indexes = indexes
+        self.values = values
+        self.columns = list(INDICATOR_COLUMNS)
+        self._position = {ticker: i for i, ticker in enumerate(tickers)}
+
+    @staticmethod
+    def stack(frames: Dict[str, pd.DataFrame], tickers: Optional[Sequence[str]] = None):
+        """
+        Right-align OHLCV frames into (T, N) arrays
+
+        Returns:
+            (tickers, fields, padding, sessions) - fields maps OHLCV names
+            to (T, N) arrays, padding marks rows before each ticker's first
+            bar, sessions holds VWAP session ids (None for daily bars)
+        """
+        tickers = [t for t in (tickers or frames) if t in frames and not frames[t].empty]
+        rows = max((len(frames[t]) for t in tickers), default=0)
+        fields = {name: np.full((rows, len(tickers)), np.nan) for name in OHLCV_FIELDS}
+        padding = np.ones((rows, len(tickers)), dtype=bool)
+        # Padding rows get their own id so the first real bar starts a session
+        sessions = np.full((rows, len(tickers)), -1, dtype=np.int64)
+        intraday = False
+
+        for i, ticker in enumerate(tickers):
+            df = frames[ticker]
+            start = rows - len(df)
+            padding[start:, i] = False
+            for name in OHLCV_FIELDS:
+                fields[name][start:, i] = df[name].to_numpy(dtype=float)
+            ids = session_ids(df.index)
+            if ids is not None:
+                sessions[start:, i] = ids
+                intraday = True
+            else:
+                sessions[start:, i] = 0
+        return tickers, fields, padding, (sessions if intraday else None)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], tickers: Optional[Sequence[str]] = None,
+                    dtype: Any = np.float64) -> "PanelIndicators":
+        """
+        Compute the indicators of many OHLCV frames in one pass
+
+        Args:
+            frames: Mapping ticker -> OHLCV frame (lowercase columns)
+            tickers: Optional subset/order of tickers
+            dtype: Storage type of the values, np.float32 halves the panel
+                (the indicators are always computed in float64)
+
+        Returns:
+            PanelIndicators with one column per ticker that has data
+        """
+        tickers, fields, padding, sessions = cls.stack(frames, tickers)
+        results = calculate_panel(fields, padding, sessions)
+        # Filled column by column straight from the kernel outputs
+        values = np.empty(padding.shape + (len(INDICATOR_COLUMNS),), dtype=dtype)
+        for i, column in enumerate(INDICATOR_COLUMNS):
+            values[..., i] = results.pop(column)
+        logger.debug(f"Panel indicators for {len(tickers)} tickers x {values.shape[0]} bars")
+        return cls(tickers, {t: frames[t].index for t in tickers}, values)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._position
+
+    def latest(self, ticker: str) -> Dict[str, float]:
+        """Last-bar indicator values of a ticker (keys like the batch columns)"""
+        row = self.values[-1, self._position[ticker]]
+        return dict(zip(self.columns, row.tolist()))
+
+    def frame(self, ticker: str) -> pd.DataFrame:
+        """Indicator columns of one ticker on its own index"""
+        index = self.indexes[ticker]
+        block = self.values[self.values.shape[0] - len(index):, self._position[ticker]]
+        return pd.DataFrame(block, index=index, columns=self.columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long frame indexed by (ticker, timestamp)"""
+        if not self.tickers:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat({ticker: self.frame(ticker) for ticker in self.tickers}, names=["ticker", "timestamp"])
@@ -0,0 +1,328 @@
+"""
+Portfolio Backtester
+Simulates the daily hybrid process over an aligned (time x ticker) panel:
+shared cash, concurrent positions, picks per day and per-sector caps, the
+TP1 partial exit / break-even stop / TP2 exit of simulate_hybrid_trade,
+commission and slippage. The loop runs over bars; every bar's exits,
+marks and candidate filtering are array operations across tickers.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.hybrid_strategy import HybridRiskManagement, HybridSignalGenerator
+from app.utils.logger import logger
+
+
+# Signal frame columns (HybridSignal.to_dict names); rows without a signal are NaN
+SIGNAL_COLUMNS = ("strength", "entry_price", "stop_loss", "take_profit_1", "take_profit_2")
+
+
+def align_panel(frames: Dict[str, pd.DataFrame], columns: Sequence[str], tickers: Optional[Sequence[str]] = None,
+                index: Optional[pd.Index] = None) -> Tuple[pd.Index, List[str], Dict[str, np.ndarray]]:
+    """
+    Align per-ticker frames on one calendar
+
+    Args:
+        frames: Mapping ticker -> frame
+        columns: Columns to read (a missing column is NaN)
+        tickers: Tickers and their order (default: every frame)
+        index: Calendar to align on (default: union of the frames' indexes)
+
+    Returns:
+        (index, tickers, arrays) - arrays maps column -> (T, N) float array,
+        NaN where a ticker has no row
+    """
+    tickers = list(tickers) if tickers is not None else list(frames)
+    if index is None:
+        index = pd.Index([])
+        for ticker in tickers:
+            if ticker in frames:
+                index = frames[ticker].index if index.empty else index.union(frames[ticker].index)
+
+    arrays = {column: np.full((len(index), len(tickers)), np.nan) for column in columns}
+    for i, ticker in enumerate(tickers):
+        df = frames.get(ticker)
+        if df is None or df.empty:
+            continue
+        rows = index.get_indexer(df.index)
+        found = rows >= 0
+        for column in columns:
+            if column in df:
+                arrays[column][rows[found], i] = df[column].to_numpy(dtype=float)[found]
+    return index, tickers, arrays
+
+
+class PortfolioBacktester:
+    """Multi-ticker backtest of the hybrid strategy with shared capital"""
+
+    def __init__(
+        self,
+        initial_capital: float = 100000,
+        commission: float = 0.001,
+        slippage_pct: float = 0.05,
+        params: Optional[HybridRiskManagement] = None,
+        max_positions: Optional[int] = None,
+        max_hold_bars: int = 10,
+        sectors: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the portfolio backtester
+
+        Args:
+            initial_capital: Starting cash
+            commission: Commission rate per side
+            slippage_pct: Adverse fill distance in percent (buys higher, sells lower)
+            params: Picks per day, sector cap, min score, risk per trade and
+                TP1 exit share (default HybridRiskManagement())
+            max_positions: Concurrent positions (default params.max_picks_per_day)
+            max_hold_bars: Bars after which a position is closed at the close
+            sectors: Ticker (without .IS) -> sector, default HybridSignalGenerator.SECTOR_MAP
+        """
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage_pct / 100
+        self.params = params or HybridRiskManagement()
+        self.max_positions = max_positions or self.params.max_picks_per_day
+        self.max_hold_bars = max_hold_bars
+        self.sectors = sectors if sectors is not None else HybridSignalGenerator.SECTOR_MAP
+
+    def sector_of(self, ticker: str) -> str:
+        return self.sectors.get(ticker.replace('.IS', ''), 'Diğer')
+
+    def run(self, frames: Dict[str, pd.DataFrame], signals: Dict[str, pd.DataFrame],
+            tickers: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Backtest OHLC frames against per-ticker signal frames
+
+        Args:
+            frames: Mapping ticker -> OHLC frame (lowercase columns)
+            signals: Mapping ticker -> frame with SIGNAL_COLUMNS, indexed by
+                the bar the signal is taken on (at its entry price)
+            tickers: Optional subset/order of tickers
+
+        Returns:
+            Same as run_arrays
+        """
+        index, tickers, bars = align_panel(frames, ("high", "low", "close"), tickers)
+        _, _, levels = align_panel(signals, SIGNAL_COLUMNS, tickers, index)
+        return self.run_arrays(
+            index, tickers, bars["high"], bars["low"], bars["close"],
+            levels["strength"], levels["entry_price"], levels["stop_loss"],
+            levels["take_profit_1"], levels["take_profit_2"],
+        )
+
+    def run_arrays(
+        self,
+        index: pd.Index,
+        tickers: Sequence[str],
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        score: np.ndarray,
+        entry_price: np.ndarray,
+        stop_loss: np.ndarray,
+        take_profit_1: np.ndarray,
+        take_profit_2: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Simulate the portfolio on (T, N) arrays
+
+        Each bar first processes the open positions like simulate_hybrid_trade
+        (stop, then TP1 with ``partial_exit_pct`` sold and the stop moved to
+        the entry, then TP2 for the rest), closes positions held
+        ``max_hold_bars`` at the close, and then opens the best-scored new
+        signals (score >= params.min_score) within the daily pick, position
+        and sector limits. Size: the stop distance risks
+        params.max_position_risk_pct of equity, capped at equity /
+        max_positions and the cash. Positions still open after the last bar
+        are closed at the last close. A market filter, if any, belongs in
+        the signals.
+
+        Args:
+            index: Bar timestamps (T)
+            tickers: Ticker of each column (N)
+            high, low, close: (T, N) bars, NaN where a ticker did not trade
+            score, entry_price, stop_loss, take_profit_1, take_profit_2:
+                (T, N) signal levels, NaN score where there is no signal
+
+        Returns:
+            Dict with summary, trades and equity_curve (date, equity, cash,
+            positions, drawdown per bar)
+        """
+        p = self.params
+        T, N = close.shape
+        sector_names = [self.sector_of(t) for t in tickers]
+        sector_ids = np.unique(sector_names, return_inverse=True)[1] if N else np.zeros(0, dtype=int)
+        # Last known close marks positions on bars a ticker did not trade
+        mark = pd.DataFrame(close).ffill().to_numpy()
+
+        cash = float(self.initial_capital)
+        shares = np.zeros(N, dtype=np.int64)
+        initial_shares = np.zeros(N, dtype=np.int64)
+        entry_bar = np.zeros(N, dtype=np.int64)
+        level = np.full(N, np.nan)       # signal entry price (break-even stop)
+        fill = np.full(N, np.nan)        # entry fill with slippage
+        stop = np.full(N, np.nan)
+        tp1 = np.full(N, np.nan)
+        tp2 = np.full(N, np.nan)
+        tp1_hit = np.zeros(N, dtype=bool)
+        cost = np.zeros(N)               # cash paid on entry
+        proceeds = np.zeros(N)           # cash received so far
+        entry_score = np.zeros(N)
+
+        equity = np.empty(T)
+        cash_curve = np.empty(T)
+        positions = np.empty(T, dtype=np.int64)
+        trades: List[Dict[str, Any]] = []
+        sell = (1 - self.slippage) * (1 - self.commission)
+
+        def close_positions(columns: np.ndarray, bar: int, prices: np.ndarray, exit_types: List[str]) -> None:
+            """Sell the remaining shares of ``columns`` and record their trades"""
+            nonlocal cash
+            received = shares[columns] * prices * sell
+            cash += float(received.sum())
+            proceeds[columns] += received
+            for i, price, exit_type in zip(columns.tolist(), prices.tolist(), exit_types):
+                profit = proceeds[i] - cost[i]
+                trades.append({
+                    'ticker': tickers[i],
+                    'sector': sector_names[i],
+                    'entry_date': str(index[entry_bar[i]]),
+                    'exit_date': str(index[bar]),
+                    'entry_price': round(float(fill[i]), 4),
+                    'exit_price': round(price * (1 - self.slippage), 4),
+                    'shares': int(initial_shares[i]),
+                    'score': float(entry_score[i]),
+                    'exit_type': exit_type,
+                    'tp1_hit': bool(tp1_hit[i]),
+                    'profit': round(float(profit), 2),
+                    'profit_percent': round(float(profit / cost[i] * 100), 2),
+                    'bars_held': int(bar - entry_bar[i]),
+                })
+            shares[columns] = 0
+            tp1_hit[columns] = False
+
+        with np.errstate(invalid='ignore'):
+            for t in range(T):
+                h, l, c = high[t], low[t], close[t]
+                held = shares > 0
+
+                if held.any():
+                    stop_hit = held & (l <= stop)
+                    # TP1: sell the partial share, move the stop to the entry
+                    first = held & ~stop_hit & ~tp1_hit & (h >= tp1)
+                    if first.any():
+                        sold = np.minimum(np.floor(initial_shares * p.partial_exit_pct).astype(np.int64), shares) * first
+                        received = sold * tp1 * sell
+                        cash += float(np.nansum(received))
+                        proceeds[first] += received[first]
+                        shares -= sold
+                        stop[first] = level[first]
+                        tp1_hit |= first
+                    second = held & ~stop_hit & tp1_hit & (h >= tp2)
+                    expired = held & ~stop_hit & ~second & (t - entry_bar >= self.max_hold_bars) & ~np.isnan(c)
+                    emptied = held & (shares == 0) & ~stop_hit & ~second
+
+                    closing = stop_hit | second | expired | emptied
+                    if closing.any():
+                        columns = np.flatnonzero(closing)
+                        prices = np.select(
+                            [stop_hit[columns], second[columns], expired[columns]],
+                            [stop[columns], tp2[columns], c[columns]],
+                            default=tp1[columns],
+                        )
+                        exit_types = [
+                            ('TRAILING_STOP' if tp1_hit[i] else 'STOP_LOSS') if stop_hit[i]
+                            else 'TP1_TP2_FULL' if second[i]
+                            else ('EOD_AFTER_TP1' if tp1_hit[i] else 'EOD') if expired[i]
+                            else 'TP1_FULL'
+                            for i in columns.tolist()
+                        ]
+                        close_positions(columns, t, prices, exit_types)
+
+                # New entries, best score first
+                s = score[t]
+                candidates = np.flatnonzero((s >= p.min_score) & (shares == 0) & ~np.isnan(c) & (stop_loss[t] < entry_price[t]))
+                open_count = int((shares > 0).sum())
+                if len(candidates) and open_count < self.max_positions:
+                    candidates = candidates[np.argsort(-s[candidates], kind='stable')]
+                    sector_count = np.bincount(sector_ids[shares > 0], minlength=len(sector_names) or 1)
+                    value = cash + float(np.nansum(shares * mark[t]))
+                    picks = 0
+                    for i in candidates.tolist():
+                        if picks >= p.max_picks_per_day or open_count >= self.max_positions:
+                            break
+                        if p.use_sector_diversification and sector_count[sector_ids[i]] >= p.max_per_sector:
+                            continue
+                        price = entry_price[t, i] * (1 + self.slippage)
+                        risk = price - stop_loss[t, i]
+                        budget = min(value * p.max_position_risk_pct / 100 / risk * price,
+                                     value / self.max_positions, cash / (1 + self.commission))
+                        count = int(budget // price)
+                        if count <= 0:
+                            continue
+
+                        cost[i] = count * price * (1 + self.commission)
+                        cash -= cost[i]
+                        shares[i] = initial_shares[i] = count
+                        entry_bar[i] = t
+                        level[i], fill[i] = entry_price[t, i], price
+                        stop[i], tp1[i], tp2[i] = stop_loss[t, i], take_profit_1[t, i], take_profit_2[t, i]
+                        proceeds[i] = 0.0
+                        entry_score[i] = s[i]
+                        sector_count[sector_ids[i]] += 1
+                        open_count += 1
+                        picks += 1
+
+                equity[t] = cash + float(np.nansum(shares * mark[t]))
+                cash_curve[t] = cash
+                positions[t] = int((shares > 0).sum())
+
+        # Positions left open: closed at the last close
+        still_open = np.flatnonzero(shares > 0)
+        if len(still_open):
+            close_positions(still_open, T - 1, mark[-1, still_open], ['END_OF_DATA'] * len(still_open))
+
+        peak = np.maximum.accumulate(np.maximum(equity, self.initial_capital)) if T else equity
+        drawdown = (equity - peak) / peak * 100 if T else equity
+        results = {
+            'summary': self.calculate_summary(trades, equity, drawdown, positions, cash),
+            'trades': trades,
+            'equity_curve': [
+                {'date': str(date), 'equity': round(e, 2), 'cash': round(m, 2), 'positions': n, 'drawdown': round(d, 2)}
+                for date, e, m, n, d in zip(index, equity.tolist(), cash_curve.tolist(), positions.tolist(), drawdown.tolist())
+            ],
+        }
+        logger.info(f"Portfolio backtest: {len(tickers)} tickers x {T} bars, {len(trades)} trades, "
+                    f"{results['summary']['total_return']:.2f}% return")
+        return results
+
+    def calculate_summary(self, trades: List[Dict[str, Any]], equity: np.ndarray, drawdown: np.ndarray,
+                          positions: np.ndarray, final_cash: float) -> Dict[str, Any]:
+        """Portfolio performance metrics from the trades and the equity curve"""
+        profits = np.array([t['profit'] for t in trades], dtype=float)
+        wins = profits[profits > 0]
+        losses = profits[profits <= 0]
+        gross_loss = abs(losses.sum())
+        returns = np.diff(equity) / equity[:-1] if len(equity) > 1 else np.zeros(0)
+        exit_types: Dict[str, int] = {}
+        for trade in trades:
+            exit_types[trade['exit_type']] = exit_types.get(trade['exit_type'], 0) + 1
+
+        return {
+            'initial_capital': self.initial_capital,
+            'final_capital': round(final_cash, 2),
+            'total_return': round((final_cash - self.initial_capital) / self.initial_capital * 100, 2),
+            'total_trades': len(trades),
+            'winning_trades': len(wins),
+            'losing_trades': len(losses),
+            'win_rate': round(len(wins) / len(trades) * 100, 2) if trades else 0,
+            'profit_factor': round(wins.sum() / gross_loss, 2) if gross_loss > 0 else 0,
+            'max_drawdown': round(float(drawdown.min()), 2) if len(drawdown) else 0,
+            'sharpe_ratio': round(float(returns.mean() / returns.std() * np.sqrt(252)), 2) if len(returns) > 1 and returns.std() > 0 else 0,
+            'avg_positions': round(float(positions.mean()), 2) if len(positions) else 0,
+            'tp1_hits': sum(t['tp1_hit'] for t in trades),
+            'exit_types': exit_types,
+        }
@@ -0,0 +1,122 @@
+"""
+Single-flight request coalescing
+The first caller for a key does the work, concurrent callers for the same key
+wait for that result instead of repeating the upstream request
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _Call:
+    """One in-flight call shared by every thread waiting on the same key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Thread-level single-flight group"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once per key among concurrent callers
+
+        Args:
+            key: Deduplication key
+            fn: Function doing the actual work
+
+        Returns:
+            (result, shared) - shared is True when the result came from
+            another caller's execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched"""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """asyncio-level single-flight group"""
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[int, str], asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Await ``fn`` once per key among concurrent tasks
+
+        The shared work runs as its own task, so cancelling one waiter never
+        cancels the fetch the other waiters depend on.
+
+        Args:
+            key: Deduplication key
+            fn: Callable returning an awaitable (coroutine or future)
+
+        Returns:
+            (result, shared) - shared is True when another task started the work
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        task = self._tasks.get(task_key)
+
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn(*args, **kwargs))
+        self._tasks[task_key] = task
+        self.calls += 1
+
+        def _forget(finished: asyncio.Future):
+            if self._tasks.get(task_key) is finished:
+                del self._tasks[task_key]
+            # Mark the exception as retrieved even if every waiter went away
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(_forget)
+        return await asyncio.shield(task), False
+
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched"""
+        return len(self._tasks)
@@ -7,10 +7,11 @@ import numpy as np
 from typing import Dict, List, Any, Optional
 from datetime import datetime, time
 import pytz
+from app.config import settings
 from app.services.data_fetcher import DataFetcher
 from app.services.technical_analysis import TechnicalAnalysis
+from app.services.panel_indicators import PanelIndicators
 from app.utils.logger import logger
-import concurrent.futures
 
 
 
@@ -191,9 +192,8 @@ class StockScreener:
                 logger.warning("Insufficient BIST100 data for trend check")
                 return True  # Default to allow trading if data unavailable
             
-            # Calculate EMAs
-            df_with_indicators = self.tech_analysis.calculate_all_indicators(df)
-            indicators = self.tech_analysis.get_latest_indicators(df_with_indicators)
+            # Calculate EMAs (only the two the trend check reads)
+            _, indicators = self.tech_analysis.calculate_with_latest(df, ['ema_21', 'ema_50'], key="XU100.IS_1d_3mo")
             
             ema_20 = indicators.get('trend', {}).get('ema_21')
             ema_50 = indicators.get('trend', {}).get('ema_50')
@@ -233,7 +233,14 @@ class StockScreener:
             logger.error(f"Error checking trading time: {e}")
             return True  # Default
     
-    def calculate_hybrid_score(self, ticker: str, df: pd.DataFrame, indicators: Dict) -> Dict[str, Any]:
+    def calculate_hybrid_score(
+        self,
+        ticker: str,
+        df: pd.DataFrame,
+        indicators: Dict,
+        market_safe: Optional[bool] = None,
+        time_safe: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """
         OPTIMIZED HYBRID STRATEGY SCORING (0-100)
         Backtest: +105.31% getiri, %57.1 WR, 1.94 PF
@@ -245,6 +252,9 @@ class StockScreener:
         4. Volume (20 pts): Volume confirmation
         
         BUY if score >= 60 (optimized threshold)
+        
+        market_safe / time_safe override the live market and clock filters
+        (historical replays pass the values as of the replayed date)
         """
         score = 0
         details = {}
@@ -380,8 +390,10 @@ class StockScreener:
         details['vol_ratio'] = round(vol_ratio, 2)
         
         # Check market filters before recommending
-        market_safe = self.is_market_uptrend()
-        time_safe = self.is_trading_time_safe()
+        if market_safe is None:
+            market_safe = self.is_market_uptrend()
+        if time_safe is None:
+            time_safe = self.is_trading_time_safe()
         
         # Recommendation - Optimized threshold (60+ for +105% backtest)
         if score >= 70 and market_safe and time_safe:
@@ -583,18 +595,26 @@ class StockScreener:
             'sector': atr_levels['sector']
         }
     
-    def _process_stock_for_screening(self, ticker: str, interval: str, period: str) -> Optional[Dict[str, Any]]:
+    def _process_stock_for_screening(
+        self,
+        ticker: str,
+        interval: str,
+        period: str,
+        df: Optional[pd.DataFrame] = None,
+        indicators: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Helper method to process a single stock for screening"""
         try:
-            # Fetch data
-            df = self.data_fetcher.fetch_realtime_data(ticker, interval, period)
+            # Fetch data (unless the batch download already delivered it)
+            if df is None:
+                df = self.data_fetcher.fetch_realtime_data(ticker, interval, period)
             
             if df.empty or len(df) < 50:
                 return None
             
-            # Calculate indicators
-            df_with_indicators = self.tech_analysis.calculate_all_indicators(df)
-            indicators = self.tech_analysis.get_latest_indicators(df_with_indicators)
+            # Calculate indicators (unless the panel pass already did)
+            if indicators is None:
+                _, indicators = self.tech_analysis.calculate_with_latest(df, key=f"{ticker}_{interval}_{period}")
             
             # Calculate hybrid score
             score_data = self.calculate_hybrid_score(ticker, df, indicators)
@@ -618,22 +638,25 @@ class StockScreener:
             return None
 
     def screen_all_stocks(self, interval: str = '1h', period: str = '1mo') -> List[Dict[str, Any]]:
-        """Scan all BIST30 for bounce setups with ATR-based adaptive parameters (PARALLELIZED)"""
+        """Scan all BIST30 for bounce setups with ATR-based adaptive parameters (BATCH FETCH)"""
         logger.info("Screening for bounce setups with ATR-adaptive parameters")
         results = []
         
-        # Use ThreadPoolExecutor for parallel processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            # Create a list of futures
-            future_to_ticker = {
-                executor.submit(self._process_stock_for_screening, ticker, interval, period): ticker 
-                for ticker in self.bist30_tickers
-            }
-            
-            for future in concurrent.futures.as_completed(future_to_ticker):
-                result = future.result()
-                if result:
-                    results.append(result)
+        # One grouped download for the whole universe instead of a request per ticker
+        frames = self.data_fetcher.fetch_many(self.bist30_tickers, interval, period)
+        
+        # Tüm evrenin indikatörleri tek vektörel geçişte (hisse başına pandas hattı yok)
+        panel = PanelIndicators.from_frames(
+            frames, self.bist30_tickers, dtype=np.float32 if settings.compact_indicators else np.float64
+        )
+        
+        for ticker in self.bist30_tickers:
+            if ticker not in frames:
+                continue
+            indicators = self.tech_analysis.format_latest_indicators(panel.latest(ticker)) if ticker in panel else None
+            result = self._process_stock_for_screening(ticker, interval, period, frames[ticker], indicators)
+            if result:
+                results.append(result)
         
         # Sort by score
         results.sort(key=lambda x: x['score'], reverse=True)
@@ -700,8 +723,7 @@ class StockScreener:
             if df.empty:
                 return {'error': 'No data available'}
             
-            df_with_indicators = self.tech_analysis.calculate_all_indicators(df)
-            indicators = self.tech_analysis.get_latest_indicators(df_with_indicators)
+            _, indicators = self.tech_analysis.calculate_with_latest(df, key=f"{ticker}_{interval}_{period}")
             
             score_data = self.calculate_hybrid_score(ticker, df, indicators)
             levels = self.calculate_entry_exit_levels(ticker, df, score_data)
@@ -1000,11 +1022,12 @@ class StockScreener:
         """
         logger.info(f"Getting top movers (top {top_n})")
         
-    def _process_ticker_for_mover(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def _process_ticker_for_mover(self, ticker: str, df: Optional[pd.DataFrame] = None) -> Optional[Dict[str, Any]]:
         """Helper method to process a single ticker for top movers"""
         try:
-            # Günlük veri çek
-            df = self.data_fetcher.fetch_realtime_data(ticker, interval='1d', period='5d')
+            # Günlük veri çek (toplu indirme verdiyse tekrar çekme)
+            if df is None:
+                df = self.data_fetcher.fetch_realtime_data(ticker, interval='1d', period='5d')
             
             if df.empty or len(df) < 2:
                 return None
@@ -1056,30 +1079,22 @@ class StockScreener:
     def get_top_movers(self, top_n: int = 5) -> Dict[str, Any]:
         """
         🔥 EN ÇOK HAREKET EDEN HİSSELER - Günlük
-        PARALLEL PROCESSING with Safe Fallback
+        BATCH FETCH with Safe Fallback
         """
-        logger.info(f"Getting top movers (top {top_n}) - Parallel Execution")
+        logger.info(f"Getting top movers (top {top_n}) - Batch Fetch")
         
         movers = []
         
         try:
-            # Use ThreadPoolExecutor to fetch data in parallel
-            # Reduced workers to 5 to prevent OOM on Vercel
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                # Submit all tasks
-                future_to_ticker = {
-                    executor.submit(self._process_ticker_for_mover, ticker): ticker 
-                    for ticker in self.bist30_tickers
-                }
-                
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_ticker):
-                    try:
-                        result = future.result()
-                        if result:
-                            movers.append(result)
-                    except Exception as e:
-                        logger.error(f"Error processing ticker future: {e}")
+            # Tek istekte tüm BIST30 günlük verisi
+            frames = self.data_fetcher.fetch_many(self.bist30_tickers, interval='1d', period='5d')
+            
+            for ticker in self.bist30_tickers:
+                if ticker not in frames:
+                    continue
+                result = self._process_ticker_for_mover(ticker, frames[ticker])
+                if result:
+                    movers.append(result)
 
             if not movers:
                 logger.warning("No movers data found, returning empty success response")
@@ -5,16 +5,53 @@ Daily trading stratejisinin geçmiş performansını test eder
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+from app.services.bar_store import PERIOD_OFFSETS
 from app.services.data_fetcher import DataFetcher
+from app.services.panel_indicators import PanelIndicators
 from app.services.technical_analysis import TechnicalAnalysis
 from app.services.stock_screener import StockScreener
 from app.utils.logger import logger
 
 
+MARKET_INDEX = "XU100.IS"
+
+
+def history_period(start_date: str, warmup_days: int = 300, now: Optional[datetime] = None) -> str:
+    """
+    Shortest yfinance period whose daily bars reach ``warmup_days`` before start_date
+
+    Args:
+        start_date: First replayed date (YYYY-MM-DD)
+        warmup_days: Calendar days of history the indicators need (EMA200)
+        now: Reference time, defaults to the current time
+
+    Returns:
+        Period string such as '1y', '2y' or 'max'
+    """
+    first_bar = pd.Timestamp(start_date) - pd.Timedelta(days=warmup_days)
+    now = pd.Timestamp(now or datetime.now())
+    for period, offset in PERIOD_OFFSETS.items():
+        if now - offset <= first_bar:
+            return period
+    return "max"
+
+
+def bars_before(index: pd.DatetimeIndex, date: str) -> int:
+    """Number of bars in ``index`` that closed before ``date`` starts"""
+    cutoff = pd.Timestamp(date)
+    if index.tz is not None:
+        cutoff = cutoff.tz_localize(index.tz)
+    return int(index.searchsorted(cutoff, side="left"))
+
+
 class StrategyTester:
     """Daily trading stratejisini backtest eder"""
     
+    # Point-in-time replay: daily bars each morning's scoring sees
+    SCORE_WINDOW = 120
+    MIN_BARS = 50
+    
     def __init__(self):
         self.data_fetcher = DataFetcher()
         self.tech_analysis = TechnicalAnalysis()
@@ -26,7 +63,8 @@ class StrategyTester:
         start_date: str,
         end_date: str,
         min_score: int = 75,  # RAISED to 75 for excellent setups only
-        risk_per_trade: float = 0.01  # 1% risk per trade
+        risk_per_trade: float = 0.01,  # 1% risk per trade
+        point_in_time: bool = True
     ) -> Dict[str, Any]:
         """
         Daily trading stratejisini belirli tarih aralığında test et
@@ -42,11 +80,17 @@ class StrategyTester:
             end_date: Bitiş tarihi (YYYY-MM-DD)
             min_score: Minimum momentum score threshold
             risk_per_trade: Her trade'de risk edilecek capital yüzdesi
+            point_in_time: Günlük geçmişi bir kez yükle, her günü o sabaha
+                kadarki barlardan skorla ve trade'i o günün barıyla kapat.
+                False: her gün canlı tarama (bugünün verisi) ile eski davranış
         
         Returns:
             Backtest sonuçları ve metrikler
         """
-        logger.info(f"Starting backtest from {start_date} to {end_date}")
+        logger.info(f"Starting backtest from {start_date} to {end_date} (point_in_time={point_in_time})")
+        
+        # Geçmiş tek seferde: 29 hisse + XU100 günlük barları ve tüm indikatörler
+        history = self.load_history(start_date) if point_in_time else None
         
         trades = []
         current_capital = 10000  # Başlangıç sermayesi (10K TRY)
@@ -77,15 +121,25 @@ class StrategyTester:
                 continue
             
             # Market filter: Check if BIST100 is in uptrend
-            if not self.screener.is_market_uptrend():
+            if history is not None:
+                market_uptrend = self._market_uptrend_as_of(history, date_str)
+            else:
+                market_uptrend = self.screener.is_market_uptrend()
+            if not market_uptrend:
                 logger.info(f"Skipping {date_str}: Market not in uptrend")
                 test_date += timedelta(days=1)
                 continue
             
             # Bu gün için en iyi hisseyi bul (top 3 içinden rotasyon)
-            best_pick = self._get_best_pick_for_date(date_str, min_score, day_index)
+            if history is not None:
+                best_pick = self._get_best_pick_as_of(history, date_str, min_score, day_index)
+            else:
+                best_pick = self._get_best_pick_for_date(date_str, min_score, day_index)
+            
+            # Point-in-time: trade o günün gerçek barıyla kapanır, bar yoksa trade yok
+            bar = self._bar_on_date(history, best_pick['ticker'], date_str) if history is not None and best_pick else None
             
-            if best_pick:
+            if best_pick and (history is None or bar is not None):
                 # Trade simülasyonu
                 trade_result = self._simulate_trade(
                     ticker=best_pick['ticker'],
@@ -94,7 +148,8 @@ class StrategyTester:
                     take_profit=best_pick['levels']['take_profit'],
                     trade_date=date_str,
                     capital=current_capital,
-                    risk_pct=risk_per_trade
+                    risk_pct=risk_per_trade,
+                    bar=bar
                 )
                 
                 if trade_result:
@@ -130,6 +185,108 @@ class StrategyTester:
             }
         }
     
+    def load_history(self, start_date: str) -> Dict[str, Any]:
+        """
+        Load the daily bars and indicators a point-in-time replay reads
+        
+        Every indicator is causal, so the row before a date equals a
+        calculation on the bars up to that date; one panel pass over the
+        whole history replaces a screen per replayed day.
+        
+        Args:
+            start_date: First replayed date (YYYY-MM-DD)
+        
+        Returns:
+            Dict with frames (ticker -> OHLCV), indicators (ticker ->
+            (bars, columns) array), columns, market_index and market_uptrend
+        """
+        period = history_period(start_date)
+        tickers = self.screener.bist30_tickers
+        frames = self.data_fetcher.fetch_many(tickers, '1d', period)
+        panel = PanelIndicators.from_frames(frames, tickers)
+        
+        # XU100 trendi her bar için: EMA21 > EMA50 (is_market_uptrend ile aynı kural)
+        market = self.data_fetcher.fetch_many([MARKET_INDEX], '1d', period).get(MARKET_INDEX)
+        if market is not None and not market.empty:
+            emas = self.tech_analysis.calculate(market, ['ema_21', 'ema_50'], key=f"{MARKET_INDEX}_1d_{period}")
+            market_index = market.index
+            market_uptrend = (emas['ema_21'] > emas['ema_50']).to_numpy()
+        else:
+            market_index = pd.DatetimeIndex([])
+            market_uptrend = np.zeros(0, dtype=bool)
+        
+        logger.info(f"Loaded {period} of daily history for {len(panel.tickers)} tickers")
+        return {
+            'frames': {t: frames[t] for t in panel.tickers},
+            'indicators': {t: panel.frame(t).to_numpy() for t in panel.tickers},
+            'columns': panel.columns,
+            'market_index': market_index,
+            'market_uptrend': market_uptrend,
+        }
+    
+    def _market_uptrend_as_of(self, history: Dict[str, Any], date: str) -> bool:
+        """BIST100 trend as of the close before ``date`` (True without enough data, like the live check)"""
+        position = bars_before(history['market_index'], date)
+        if position < self.MIN_BARS:
+            return True
+        return bool(history['market_uptrend'][position - 1])
+    
+    def _get_best_pick_as_of(
+        self,
+        history: Dict[str, Any],
+        date: str,
+        min_score: int,
+        day_index: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Belirli bir sabah için en iyi hisse - sadece o tarihten önceki barlarla
+        
+        get_top_picks ile aynı akış: skor >= min_score, sektör çeşitlendirmesi,
+        top 3 içinden day_index rotasyonu
+        """
+        candidates = []
+        for ticker, df in history['frames'].items():
+            position = bars_before(df.index, date)
+            if position < self.MIN_BARS:
+                continue
+            window = df.iloc[max(0, position - self.SCORE_WINDOW):position]
+            row = history['indicators'][ticker][position - 1]
+            indicators = self.tech_analysis.format_latest_indicators(dict(zip(history['columns'], row.tolist())))
+            
+            # Piyasa filtresi günün başında geçti; açılıştan önce seçim yapılıyor
+            score_data = self.screener.calculate_hybrid_score(ticker, window, indicators, market_safe=True, time_safe=True)
+            if score_data['score'] < min_score:
+                continue
+            candidates.append({
+                **score_data,
+                'sector': self.screener.STOCK_SECTORS.get(ticker, 'Diğer'),
+                'timestamp': str(window.index[-1]),
+                '_window': window
+            })
+        
+        if not candidates:
+            return None
+        
+        candidates.sort(key=lambda x: x['score'], reverse=True)
+        picks = self.screener._apply_sector_diversification(candidates, 3)
+        selected = picks[day_index % len(picks)]
+        
+        # Seviyeler sadece seçilen hisse için (seçim skora ve sektöre bakar)
+        window = selected.pop('_window')
+        selected['levels'] = self.screener.calculate_entry_exit_levels(selected['ticker'], window, selected)
+        logger.debug(f"{date}: Selected {selected['ticker']} as of {selected['timestamp']} (score: {selected['score']})")
+        return selected
+    
+    @staticmethod
+    def _bar_on_date(history: Dict[str, Any], ticker: str, date: str) -> Optional[Tuple[float, float, float]]:
+        """(high, low, close) of the ticker's bar on ``date`` or None if it did not trade"""
+        df = history['frames'][ticker]
+        position = bars_before(df.index, date)
+        if position >= len(df) or df.index[position].strftime("%Y-%m-%d") != date:
+            return None
+        bar = df.iloc[position]
+        return float(bar['high']), float(bar['low']), float(bar['close'])
+    
     def _get_best_pick_for_date(self, date: str, min_score: int, day_index: int = 0) -> Dict[str, Any]:
         """
         Belirli bir tarih için en iyi hisseyi bul
@@ -163,12 +320,14 @@ class StrategyTester:
         take_profit: float,
         trade_date: str,
         capital: float,
-        risk_pct: float
+        risk_pct: float,
+        bar: Optional[Tuple[float, float, float]] = None
     ) -> Dict[str, Any]:
         """
         Tek bir trade'i simüle et
         
         Improved: Gerçek gün içi high/low verilerini kullan
+        bar: O günün (high, low, close) değerleri - verilirse canlı veri çekilmez
         """
         # Position size: Risk bazlı (MAX 1% of capital)
         risk_amount = capital * risk_pct
@@ -200,11 +359,14 @@ class StrategyTester:
         # Try to get actual intraday data for that day
         try:
             # Get daily data (high/low for the day)
-            df = self.data_fetcher.fetch_realtime_data(
-                ticker,
-                interval='1d',
-                period='5d'  # Last 5 days to ensure we have data
-            )
+            if bar is not None:
+                df = pd.DataFrame([bar], columns=['high', 'low', 'close'])
+            else:
+                df = self.data_fetcher.fetch_realtime_data(
+                    ticker,
+                    interval='1d',
+                    period='5d'  # Last 5 days to ensure we have data
+                )
             
             if not df.empty:
                 # Get the day's high and low
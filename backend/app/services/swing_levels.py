@@ -0,0 +1,116 @@
+"""
+Swing Points and Support/Resistance Levels
+Vectorized swing detection and touch-count clustering of swing levels,
+for one window or for the trailing window of every bar of a history
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def swing_points(values: np.ndarray, left: int = 2, right: Optional[int] = None, kind: str = "low") -> np.ndarray:
+    """
+    Mark swing lows (or highs)
+
+    A bar is a swing low when no bar from ``left`` bars before to ``right``
+    bars after it is lower (ties count as swings). Bars without a full
+    neighbourhood, or with a missing value in it, are never swings.
+
+    Args:
+        values: Lows (or highs) of the series
+        left: Bars before the swing that must not be lower/higher
+        right: Bars after it, default ``left``
+        kind: 'low' or 'high'
+
+    Returns:
+        Boolean array, True at swing points
+    """
+    values = np.asarray(values, dtype=float)
+    right = left if right is None else right
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+    if n < left + right + 1:
+        return mask
+    # One comparison per neighbour offset (NaN compares False)
+    center = values[left:n - right]
+    inner = mask[left:n - right]
+    inner[:] = ~np.isnan(center)
+    for offset in range(-left, right + 1):
+        if offset:
+            neighbour = values[left + offset:n - right + offset]
+            inner &= (center <= neighbour) if kind == "low" else (center >= neighbour)
+    return mask
+
+
+def _touches(levels: np.ndarray, tolerance: float) -> np.ndarray:
+    """Swing levels within ``tolerance`` (relative) of each level, itself included"""
+    ordered = np.sort(levels)
+    lower = np.searchsorted(ordered, levels * (1 - tolerance), side="right")
+    upper = np.searchsorted(ordered, levels * (1 + tolerance), side="left")
+    return upper - lower
+
+
+def strongest_level(levels: np.ndarray, tolerance: float = 0.015) -> Tuple[Optional[float], int]:
+    """
+    Swing level touched by the most other swing levels (sorted sweep, O(k log k))
+
+    Args:
+        levels: Swing prices in time order
+        tolerance: Relative distance that counts as a touch
+
+    Returns:
+        (level, touches) - the earliest level on ties, (None, 0) without levels
+    """
+    levels = np.asarray(levels, dtype=float)
+    if len(levels) == 0:
+        return None, 0
+    touches = _touches(levels, tolerance)
+    best = int(np.argmax(touches))
+    return float(levels[best]), int(touches[best])
+
+
+def rolling_strongest_level(values: np.ndarray, window: int = 30, order: int = 2, tolerance: float = 0.015,
+                            kind: str = "low", chunk: int = 512) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    strongest_level of the swing points inside the trailing window of every bar
+
+    Bar t sees the ``window`` bars up to and including itself. Only swings
+    whose ``order`` bars on both sides lie in that window count, so nothing
+    after bar t is used. The cost is a fixed window x window comparison per
+    bar, done for blocks of bars at once.
+
+    Args:
+        values: Lows (or highs) of the whole history
+        window: Trailing bars per evaluation
+        order: Bars on each side of a swing point
+        tolerance: Relative distance that counts as a touch
+        kind: 'low' or 'high'
+        chunk: Bars compared per block (bounds memory)
+
+    Returns:
+        (levels, touches) arrays - NaN and 0 where a window has no swing
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    levels = np.full(n, np.nan)
+    touches = np.zeros(n, dtype=int)
+    span = window - 2 * order  # candidate swing positions per window
+    if n == 0 or span <= 0:
+        return levels, touches
+
+    swings = np.where(swing_points(values, order, kind=kind), values, np.nan)
+    # Candidates of bar t are positions t-window+1+order .. t-order
+    padded = np.concatenate([np.full(window - order - 1, np.nan), swings])
+    candidates = np.lib.stride_tricks.sliding_window_view(padded, span)[:n]
+
+    for start in range(0, n, chunk):
+        block = candidates[start:start + chunk]
+        with np.errstate(invalid="ignore"):
+            near = np.abs(block[:, None, :] - block[:, :, None]) / block[:, :, None] < tolerance
+        counts = near.sum(axis=2)
+        best = np.argmax(counts, axis=1)
+        rows = np.arange(len(block))
+        levels[start:start + chunk] = block[rows, best]
+        touches[start:start + chunk] = counts[rows, best]
+    levels[touches == 0] = np.nan
+    return levels, touches
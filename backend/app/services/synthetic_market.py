@@ -0,0 +1,353 @@
+"""
+Synthetic market data generator
+Seeded, vectorized OHLCV universes for mock mode, tests and load tests.
+Returns follow a one-factor model so tickers move together like a real index.
+"""
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+MARKET_TZ = "Europe/Istanbul"
+
+# Borsa Istanbul continuous session used for intraday bars
+SESSION_OPEN = pd.Timedelta(hours=10)
+SESSION_MINUTES = 480
+
+INTERVAL_MINUTES = {
+    "1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30,
+    "60m": 60, "90m": 90, "1h": 60, "1d": 1440, "5d": 7200, "1wk": 10080, "1mo": 43200,
+}
+
+# Trading sessions per yfinance period
+PERIOD_SESSIONS = {
+    "1d": 1, "5d": 5, "1mo": 22, "3mo": 66, "6mo": 132,
+    "1y": 252, "2y": 504, "5y": 1260, "10y": 2520, "ytd": 200, "max": 1000,
+}
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Prices sit at their base level on this session; paths run from it both ways
+EPOCH = pd.Timestamp("2026-01-02", tz="Europe/Istanbul")
+
+NS_PER_MINUTE = 60 * 10**9
+NS_PER_DAY = 1440 * NS_PER_MINUTE
+
+
+def _stable_hash(text: str) -> int:
+    """Process-independent hash (``hash()`` is salted per interpreter)"""
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def bar_count(interval: str, period: str, max_bars: Optional[int] = None) -> int:
+    """
+    Number of bars yfinance would roughly return for an interval/period pair
+
+    Args:
+        interval: Bar interval
+        period: yfinance period string
+        max_bars: Optional cap
+
+    Returns:
+        Bar count (at least 1)
+    """
+    sessions = PERIOD_SESSIONS.get(period, 22)
+    minutes = INTERVAL_MINUTES.get(interval, 60)
+    if minutes >= 1440:
+        count = max(1, sessions * 1440 // minutes)
+    else:
+        count = sessions * max(1, SESSION_MINUTES // minutes)
+    return min(count, max_bars) if max_bars else count
+
+
+def bar_index(interval: str, bars: int, end: Optional[pd.Timestamp] = None) -> pd.DatetimeIndex:
+    """
+    Timestamps of the last ``bars`` completed bars up to ``end``
+
+    Daily and longer bars sit on business days at midnight exchange time
+    (multi-day bars on every n-th business day counted from EPOCH);
+    intraday bars fill the 10:00-18:00 session of each business day. ``end``
+    defaults to now and is floored to the interval so repeated calls within
+    one bar return the same index, and a later ``end`` only appends bars.
+
+    Returns:
+        Timezone-aware DatetimeIndex, oldest first
+    """
+    minutes = INTERVAL_MINUTES.get(interval, 60)
+    end = pd.Timestamp.now(tz=MARKET_TZ) if end is None else pd.Timestamp(end)
+    if end.tzinfo is None:
+        end = end.tz_localize(MARKET_TZ)
+    else:
+        end = end.tz_convert(MARKET_TZ)
+
+    if minutes >= 1440:
+        step = max(1, minutes // 1440)
+        days = pd.bdate_range(end=end.normalize(), periods=(bars + 1) * step, tz=MARKET_TZ)
+        days = days[_business_days(days) % step == 0]
+        return pd.DatetimeIndex(days[-bars:], name="Date")
+
+    per_session = max(1, SESSION_MINUTES // minutes)
+    sessions = -(-bars // per_session) + 1
+    days = pd.bdate_range(end=end.normalize(), periods=sessions, tz=MARKET_TZ)
+    offsets = SESSION_OPEN + pd.to_timedelta(np.arange(per_session) * minutes, unit="min")
+    stamps = (days.tz_localize(None).values[:, None] + offsets.values[None, :]).ravel()
+    index = pd.DatetimeIndex(stamps).tz_localize(MARKET_TZ)
+    index = index[index <= end.floor(f"{minutes}min")]
+    return pd.DatetimeIndex(index[-bars:], name="Datetime")
+
+
+def _business_days(days: pd.DatetimeIndex) -> np.ndarray:
+    """Business-day number of each day relative to EPOCH (negative before it)"""
+    dates = days.tz_localize(None).values.astype("datetime64[D]")
+    return np.busday_count(np.datetime64(EPOCH.date()), dates)
+
+
+def _uniform(keys: np.ndarray, salt) -> np.ndarray:
+    """Vectorized splitmix64 hash of uint64 keys mapped to [0, 1) (salt may be an array)"""
+    with np.errstate(over="ignore"):
+        x = keys + np.asarray(salt, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _normal(keys: np.ndarray, streams: Sequence[str]) -> np.ndarray:
+    """
+    Standard normal draws that depend only on (key, stream)
+
+    Args:
+        keys: Absolute bar keys (day or minute numbers), shape (bars,)
+        streams: One name per column, e.g. "seed|ticker|interval|kind"
+
+    Returns:
+        Array shaped (bars, len(streams)) - Box-Muller over two hashed uniforms
+    """
+    keys = np.asarray(keys, dtype=np.int64).astype(np.uint64)[:, None]
+    salt_u = np.array([_stable_hash(f"{name}|u") for name in streams], dtype=np.uint64)
+    salt_v = np.array([_stable_hash(f"{name}|v") for name in streams], dtype=np.uint64)
+    u = 1.0 - _uniform(keys, salt_u[None, :])
+    v = _uniform(keys, salt_v[None, :])
+    return np.sqrt(-2.0 * np.log(u)) * np.cos(2.0 * np.pi * v)
+
+
+class SyntheticMarket:
+    """Deterministic generator of correlated multi-ticker OHLCV data"""
+
+    def __init__(
+        self,
+        seed: int = 42,
+        annual_drift: float = 0.05,
+        market_volatility: float = 0.25,
+        base_prices: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the generator
+
+        Args:
+            seed: Master seed - each bar depends only on the seed, ticker,
+                interval and bar time, so calls with a later ``end`` extend
+                earlier ones in every process
+            annual_drift: Expected yearly return of the market factor
+            market_volatility: Yearly volatility of the market factor
+            base_prices: Price levels at EPOCH (unknown tickers get a
+                deterministic random level between 5 and 500)
+        """
+        self.seed = seed
+        self.annual_drift = annual_drift
+        self.market_volatility = market_volatility
+        self.base_prices = base_prices or {}
+
+    @staticmethod
+    def universe(size: int, prefix: str = "SYN", suffix: str = ".IS") -> List[str]:
+        """Ticker names for a synthetic universe of ``size`` symbols"""
+        width = max(4, len(str(size)))
+        return [f"{prefix}{i:0{width}d}{suffix}" for i in range(size)]
+
+    def _ticker_profile(self, tickers: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Per-ticker price level, market beta, idiosyncratic volatility and volume"""
+        # Derived from the ticker name only, so a ticker keeps its profile
+        # no matter which universe it is generated in
+        hashes = np.array([_stable_hash(t) for t in tickers], dtype=np.uint64)
+        u1, u2, u3 = (_uniform(hashes, self.seed * 4 + k) for k in range(1, 4))
+
+        default_price = np.exp(np.log(5.0) + u1 * (np.log(500.0) - np.log(5.0)))
+        known = np.array([self.base_prices.get(t, np.nan) for t in tickers], dtype=float)
+        return {
+            "price": np.where(np.isnan(known), default_price, known),
+            "beta": 0.6 + 0.8 * u2,
+            "idio_vol": 0.15 + 0.25 * u3,
+            "volume": 2e5 + 5e6 * u1 * u2,
+        }
+
+    def generate(
+        self,
+        tickers: Sequence[str],
+        interval: str = "1d",
+        period: str = "3mo",
+        bars: Optional[int] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Generate OHLCV frames for a universe
+
+        Args:
+            tickers: Ticker symbols (any names)
+            interval: Bar interval
+            period: yfinance period used for the bar count when ``bars`` is None
+            bars: Explicit number of bars
+            end: Last bar time (defaults to now)
+
+        Returns:
+            Mapping ticker -> DataFrame with lowercase OHLCV columns
+        """
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+
+        index = bar_index(interval, bars or bar_count(interval, period), end)
+        opens, highs, lows, closes, volumes = self._generate(tickers, interval, index)
+
+        return {
+            ticker: pd.DataFrame({
+                "open": opens[:, i],
+                "high": highs[:, i],
+                "low": lows[:, i],
+                "close": closes[:, i],
+                "volume": volumes[:, i],
+            }, index=index)
+            for i, ticker in enumerate(tickers)
+        }
+
+    def generate_arrays(
+        self,
+        tickers: Sequence[str],
+        interval: str,
+        bars: int,
+        end: Optional[pd.Timestamp] = None
+    ):
+        """
+        Generate raw (bars x tickers) OHLCV matrices
+
+        Returns:
+            Tuple (open, high, low, close, volume) of float64 arrays shaped
+            (bars, len(tickers))
+        """
+        return self._generate(list(tickers), interval, bar_index(interval, bars, end))
+
+    def _streams(self, tickers: Optional[Sequence[str]], layer: str, kind: str) -> List[str]:
+        """Draw stream names: one per ticker, or the shared market stream when tickers is None"""
+        if tickers is None:
+            return [f"{self.seed}|market|{layer}|{kind}"]
+        return [f"{self.seed}|{ticker}|{layer}|{kind}" for ticker in tickers]
+
+    def _daily_path(self, tickers: Sequence[str], profile: Dict[str, np.ndarray], first: pd.Timestamp, last: pd.Timestamp):
+        """
+        Daily log closes on every business day from ``first`` to ``last``
+
+        The walk is summed from EPOCH, where each ticker is at its base price,
+        so a day's close is the same whichever window is requested.
+
+        Returns:
+            (days, log_close, returns) - naive business days and arrays shaped
+            (len(days), len(tickers))
+        """
+        epoch = EPOCH.tz_localize(None)
+        days = pd.bdate_range(min(first, epoch), max(last, epoch))
+        keys = days.values.astype("datetime64[D]").astype(np.int64)
+        year_fraction = 1.0 / TRADING_DAYS_PER_YEAR
+
+        market = (self.annual_drift * year_fraction
+                  + self.market_volatility * np.sqrt(year_fraction) * _normal(keys, self._streams(None, "1d", "return")))
+        noise = _normal(keys, self._streams(tickers, "1d", "return"))
+        returns = market * profile["beta"] + noise * profile["idio_vol"] * np.sqrt(year_fraction)
+
+        walk = np.cumsum(returns, axis=0)
+        walk -= walk[days.get_loc(epoch)]
+        return days, np.log(profile["price"]) + walk, returns
+
+    def _generate(self, tickers: List[str], interval: str, index: pd.DatetimeIndex):
+        """OHLCV matrices for ``index``; every draw is keyed by the absolute bar time"""
+        minutes = INTERVAL_MINUTES.get(interval, 60)
+        # Fraction of a trading year per bar (intraday bars scale by session length)
+        year_fraction = (minutes / SESSION_MINUTES if minutes < 1440 else minutes / 1440) / TRADING_DAYS_PER_YEAR
+        sigma = np.sqrt(year_fraction)
+        profile = self._ticker_profile(tickers)
+        naive = index.tz_localize(None)
+        sessions = naive.normalize()
+
+        if minutes >= 1440:
+            step = max(1, minutes // 1440)
+            first = sessions[0] - pd.offsets.BDay(step)
+            days, log_level, _ = self._daily_path(tickers, profile, first, sessions[-1])
+            position = days.get_indexer(sessions)
+            log_close = log_level[position]
+            log_prev = log_level[position - step]
+            keys = naive.values.astype("datetime64[D]").astype(np.int64)
+        else:
+            log_close, log_prev = self._intraday_path(tickers, profile, interval, naive)
+            keys = naive.asi8 // NS_PER_MINUTE
+
+        returns = log_close - log_prev
+        idio_vol = profile["idio_vol"] * sigma
+        gap, wick_high, wick_low, volume_noise = (
+            _normal(keys, self._streams(tickers, interval, kind)) for kind in ("gap", "high", "low", "volume")
+        )
+
+        closes = np.exp(log_close)
+        opens = np.exp(log_prev) * np.exp(gap * idio_vol * 0.3)
+        highs = np.maximum(opens, closes) * np.exp(np.abs(wick_high) * idio_vol * 0.5)
+        lows = np.minimum(opens, closes) * np.exp(-np.abs(wick_low) * idio_vol * 0.5)
+
+        # Volume rises with the size of the move
+        move = np.abs(returns) / (idio_vol + 1e-12)
+        volumes = np.floor(profile["volume"] * min(1.0, minutes / SESSION_MINUTES)
+                           * np.exp(0.3 * volume_noise) * (1.0 + 0.5 * move))
+
+        return (
+            np.round(opens, 2),
+            np.round(highs, 2),
+            np.round(lows, 2),
+            np.round(closes, 2),
+            volumes,
+        )
+
+    def _intraday_path(self, tickers: Sequence[str], profile: Dict[str, np.ndarray], interval: str, naive: pd.DatetimeIndex):
+        """
+        Log closes of intraday bars and of the bars before them
+
+        Each session is a Brownian bridge from the previous daily close to
+        the day's own close, so intraday and daily bars agree and a session's
+        bars do not depend on how much of it was requested.
+        """
+        minutes = INTERVAL_MINUTES.get(interval, 60)
+        per_session = max(1, SESSION_MINUTES // minutes)
+        sessions = naive.normalize()
+        session_days = sessions.unique()
+        days, log_level, daily_returns = self._daily_path(
+            tickers, profile, session_days[0] - pd.offsets.BDay(1), session_days[-1]
+        )
+        day_position = days.get_indexer(session_days)
+
+        # Every slot of every requested session: (sessions * slots) keys
+        offsets = (SESSION_OPEN + pd.to_timedelta(np.arange(per_session) * minutes, unit="min")).values
+        slot_keys = ((session_days.values[:, None] + offsets[None, :]).astype("datetime64[ns]").astype(np.int64)
+                     // NS_PER_MINUTE).ravel()
+        slot_fraction = 1.0 / (TRADING_DAYS_PER_YEAR * per_session)
+        market = self.market_volatility * np.sqrt(slot_fraction) * _normal(slot_keys, self._streams(None, interval, "return"))
+        noise = _normal(slot_keys, self._streams(tickers, interval, "return"))
+        steps = (market * profile["beta"] + noise * profile["idio_vol"] * np.sqrt(slot_fraction))
+        walk = np.cumsum(steps.reshape(len(session_days), per_session, len(tickers)), axis=1)
+
+        # Bridge: pin the end of each session to that day's return
+        t = (np.arange(1, per_session + 1) / per_session)[None, :, None]
+        bridge = walk - t * walk[:, -1:, :] + t * daily_returns[day_position][:, None, :]
+        session_close = log_level[day_position - 1][:, None, :] + bridge
+        session_prev = np.concatenate([log_level[day_position - 1][:, None, :], session_close[:, :-1, :]], axis=1)
+
+        row = np.searchsorted(session_days.values, sessions.values)
+        slot = ((naive - sessions) - SESSION_OPEN) // pd.Timedelta(minutes=minutes)
+        slot = np.asarray(slot, dtype=np.int64)
+        return session_close[row, slot], session_prev[row, slot]
@@ -4,13 +4,67 @@ Calculates various technical indicators using native pandas/numpy
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from app.config import settings
+from app.services import indicator_kernels as kernels
+from app.services.swing_levels import swing_points
+from app.services.vwap import session_ids
+from app.services.frame_cache import FrameCache, compact_frame
 from app.utils.logger import logger
 
 
 class TechnicalAnalysis:
     """Service for calculating technical indicators using pandas/numpy"""
     
+    # Indicator registry for lazy selection: name -> producing method, its
+    # arguments, output columns and prerequisite indicators. Prerequisites
+    # are listed before the indicators that need them.
+    INDICATOR_REGISTRY: Dict[str, Dict[str, Any]] = {
+        'ema_9': {'method': 'calculate_ema', 'kwargs': {'periods': [9]}, 'columns': ['ema_9']},
+        'ema_21': {'method': 'calculate_ema', 'kwargs': {'periods': [21]}, 'columns': ['ema_21']},
+        'ema_50': {'method': 'calculate_ema', 'kwargs': {'periods': [50]}, 'columns': ['ema_50']},
+        'ema_200': {'method': 'calculate_ema', 'kwargs': {'periods': [200]}, 'columns': ['ema_200']},
+        'sma_20': {'method': 'calculate_sma', 'kwargs': {'periods': [20]}, 'columns': ['sma_20']},
+        'sma_50': {'method': 'calculate_sma', 'kwargs': {'periods': [50]}, 'columns': ['sma_50']},
+        'sma_100': {'method': 'calculate_sma', 'kwargs': {'periods': [100]}, 'columns': ['sma_100']},
+        'atr': {'method': 'calculate_atr', 'columns': ['atr']},
+        'adx': {'method': 'calculate_adx', 'columns': ['di_plus', 'di_minus', 'adx']},
+        'rsi': {'method': 'calculate_rsi', 'columns': ['rsi']},
+        'macd': {'method': 'calculate_macd', 'columns': ['macd', 'macd_signal', 'macd_histogram']},
+        'stochastic': {'method': 'calculate_stochastic', 'columns': ['stoch_k', 'stoch_d']},
+        'cci': {'method': 'calculate_cci', 'columns': ['cci']},
+        'bollinger': {
+            'method': 'calculate_bollinger_bands',
+            'columns': ['bb_middle', 'bb_upper', 'bb_lower', 'bb_bandwidth', 'bb_percent'],
+            'requires': ['sma_20'],
+        },
+        'obv': {'method': 'calculate_obv', 'columns': ['obv']},
+        'vwap': {'method': 'calculate_vwap', 'columns': ['vwap']},
+        'mfi': {'method': 'calculate_mfi', 'columns': ['mfi']},
+    }
+    
+    # Names that select several registry entries
+    INDICATOR_GROUPS: Dict[str, List[str]] = {
+        'ema': ['ema_9', 'ema_21', 'ema_50', 'ema_200'],
+        'sma': ['sma_20', 'sma_50', 'sma_100'],
+        'stoch': ['stochastic'],
+        'bollinger_bands': ['bollinger'],
+    }
+    
+    # Columns of get_latest_indicators, grouped like the API response
+    LATEST_GROUPS: Dict[str, List[str]] = {
+        'trend': ['ema_9', 'ema_21', 'ema_50', 'sma_20', 'adx', 'di_plus', 'di_minus'],
+        'momentum': ['rsi', 'macd', 'macd_signal', 'macd_histogram', 'stoch_k', 'stoch_d', 'cci'],
+        'volatility': ['bb_upper', 'bb_middle', 'bb_lower', 'atr'],
+        'volume': ['obv', 'vwap', 'mfi'],
+    }
+    LATEST_COLUMNS: List[str] = [column for group in LATEST_GROUPS.values() for column in group]
+    
+    # Indicator frames shared by every instance, keyed by caller key and
+    # indicator set; an entry is valid while the bars it was built from are
+    _memo = FrameCache(settings.indicator_memo_max_bytes)
+    
     def __init__(self):
         """Initialize technical analysis service"""
         logger.info("TechnicalAnalysis initialized (native implementation)")
@@ -22,7 +76,7 @@ class TechnicalAnalysis:
         for period in periods:
             col_name = f'ema_{period}'
             if col_name not in df.columns:
-                df[col_name] = df['close'].ewm(span=period, adjust=False).mean()
+                df[col_name] = kernels.ema(df['close'].to_numpy(), period)
         return df
     
     def calculate_sma(self, df: pd.DataFrame, periods: List[int] = [20, 50, 100]) -> pd.DataFrame:
@@ -30,7 +84,7 @@ class TechnicalAnalysis:
         for period in periods:
             col_name = f'sma_{period}'
             if col_name not in df.columns:
-                df[col_name] = df['close'].rolling(window=period).mean()
+                df[col_name] = kernels.sma(df['close'].to_numpy(), period)
         return df
     
     def calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
@@ -38,13 +92,7 @@ class TechnicalAnalysis:
         if 'atr' in df.columns:
             return df
         
-        high_low = df['high'] - df['low']
-        high_close = (df['high'] - df['close'].shift()).abs()
-        low_close = (df['low'] - df['close'].shift()).abs()
-        
-        # Use pandas max for proper Series handling
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        df['atr'] = true_range.rolling(window=period).mean()
+        df['atr'] = kernels.atr(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), period)
         return df
     
     def calculate_adx(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
@@ -52,23 +100,9 @@ class TechnicalAnalysis:
         if 'adx' in df.columns:
             return df
         
-        # Simplified ADX calculation
-        high_diff = df['high'].diff()
-        low_diff = df['low'].diff()
-        
-        df['di_plus'] = np.where(
-            (high_diff > low_diff) & (high_diff > 0),
-            high_diff, 0
+        df['di_plus'], df['di_minus'], df['adx'] = kernels.directional_movement(
+            df['high'].to_numpy(), df['low'].to_numpy(), period
         )
-        df['di_minus'] = np.where(
-            (low_diff > high_diff) & (low_diff > 0),
-            low_diff, 0
-        )
-        
-        # Smooth and calculate ADX
-        df['di_plus'] = df['di_plus'].rolling(window=period).mean()
-        df['di_minus'] = df['di_minus'].rolling(window=period).mean()
-        df['adx'] = abs(df['di_plus'] - df['di_minus']) / (df['di_plus'] + df['di_minus'] + 1e-10) * 100
         return df
     
     # MOMENTUM INDICATORS
@@ -78,12 +112,7 @@ class TechnicalAnalysis:
         if 'rsi' in df.columns:
             return df
         
-        delta = df['close'].diff()
-        gain = delta.clip(lower=0).rolling(window=period).mean()
-        loss = (-delta.clip(upper=0)).rolling(window=period).mean()
-        
-        rs = gain / (loss + 1e-10)
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = kernels.rsi(df['close'].to_numpy(), period)
         return df
     
     def calculate_macd(self, df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
@@ -91,12 +120,7 @@ class TechnicalAnalysis:
         if 'macd' in df.columns:
             return df
         
-        ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
-        
-        df['macd'] = ema_fast - ema_slow
-        df['macd_signal'] = df['macd'].ewm(span=signal, adjust=False).mean()
-        df['macd_histogram'] = df['macd'] - df['macd_signal']
+        df['macd'], df['macd_signal'], df['macd_histogram'] = kernels.macd(df['close'].to_numpy(), fast, slow, signal)
         return df
     
     def calculate_stochastic(self, df: pd.DataFrame, period: int = 14, smooth_k: int = 3, smooth_d: int = 3) -> pd.DataFrame:
@@ -104,12 +128,9 @@ class TechnicalAnalysis:
         if 'stoch_k' in df.columns:
             return df
         
-        low_min = df['low'].rolling(window=period).min()
-        high_max = df['high'].rolling(window=period).max()
-        
-        df['stoch_k'] = 100 * (df['close'] - low_min) / (high_max - low_min + 1e-10)
-        df['stoch_k'] = df['stoch_k'].rolling(window=smooth_k).mean()
-        df['stoch_d'] = df['stoch_k'].rolling(window=smooth_d).mean()
+        df['stoch_k'], df['stoch_d'] = kernels.stochastic(
+            df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), period, smooth_k, smooth_d
+        )
         return df
     
     def calculate_cci(self, df: pd.DataFrame, period: int = 20) -> pd.DataFrame:
@@ -117,12 +138,8 @@ class TechnicalAnalysis:
         if 'cci' in df.columns:
             return df
         
-        tp = (df['high'] + df['low'] + df['close']) / 3
-        sma_tp = tp.rolling(window=period).mean()
-        # Use std instead of MAD for better performance
-        std_tp = tp.rolling(window=period).std()
-        
-        df['cci'] = (tp - sma_tp) / (0.015 * std_tp + 1e-10)
+        # Uses std instead of MAD for better performance
+        df['cci'] = kernels.cci(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), period)
         return df
     
     # VOLATILITY INDICATORS
@@ -132,11 +149,15 @@ class TechnicalAnalysis:
         if 'bb_middle' in df.columns:
             return df
         
-        df['bb_middle'] = df['close'].rolling(window=period).mean()
-        rolling_std = df['close'].rolling(window=period).std()
+        close = df['close'].to_numpy()
+        # Same rolling mean as the SMA of the period - reuse it when already there
+        sma_col = f'sma_{period}'
+        middle = df[sma_col].to_numpy() if sma_col in df.columns else kernels.sma(close, period)
+        rolling_std = kernels.rolling_std(close, period)
         
-        df['bb_upper'] = df['bb_middle'] + (rolling_std * std)
-        df['bb_lower'] = df['bb_middle'] - (rolling_std * std)
+        df['bb_middle'] = middle
+        df['bb_upper'] = middle + (rolling_std * std)
+        df['bb_lower'] = middle - (rolling_std * std)
         df['bb_bandwidth'] = (df['bb_upper'] - df['bb_lower']) / (df['bb_middle'] + 1e-10)
         df['bb_percent'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'] + 1e-10)
         return df
@@ -148,18 +169,22 @@ class TechnicalAnalysis:
         if 'obv' in df.columns:
             return df
         
-        # Use pandas operations for proper type handling
-        sign = df['close'].diff().apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0))
-        df['obv'] = (sign * df['volume']).fillna(0).cumsum()
+        df['obv'] = kernels.obv(df['close'].to_numpy(), df['volume'].to_numpy())
         return df
     
     def calculate_vwap(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate Volume Weighted Average Price (VWAP) - Optimized"""
+        """Calculate Volume Weighted Average Price (VWAP) - Optimized
+        
+        Intraday bars restart the average every Borsa Istanbul session;
+        daily and longer bars average the whole frame.
+        """
         if 'vwap' in df.columns:
             return df
         
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        df['vwap'] = (df['volume'] * typical_price).cumsum() / (df['volume'].cumsum() + 1e-10)
+        df['vwap'] = kernels.vwap(
+            df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy(),
+            sessions=session_ids(df.index)
+        )
         return df
     
     def calculate_mfi(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
@@ -167,14 +192,9 @@ class TechnicalAnalysis:
         if 'mfi' in df.columns:
             return df
         
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        money_flow = typical_price * df['volume']
-        
-        positive_flow = money_flow.where(typical_price > typical_price.shift(1), 0).rolling(window=period).sum()
-        negative_flow = money_flow.where(typical_price < typical_price.shift(1), 0).rolling(window=period).sum()
-        
-        money_ratio = positive_flow / (negative_flow + 1e-10)
-        df['mfi'] = 100 - (100 / (1 + money_ratio))
+        df['mfi'] = kernels.mfi(
+            df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy(), period
+        )
         
         logger.debug("Calculated MFI")
         return df
@@ -183,19 +203,14 @@ class TechnicalAnalysis:
     
     def detect_support_resistance(self, df: pd.DataFrame, window: int = 20) -> Dict[str, List[float]]:
         """Detect support and resistance levels"""
-        df = df.copy()
-        
-        # Find local minima (support)
-        support = df['low'].rolling(window=window, center=True).min()
-        support_levels = df[df['low'] == support]['low'].unique().tolist()
-        
-        # Find local maxima (resistance)
-        resistance = df['high'].rolling(window=window, center=True).max()
-        resistance_levels = df[df['high'] == resistance]['high'].unique().tolist()
+        # Extremes of a centered window (same span as rolling(window, center=True))
+        left, right = window // 2, window - 1 - window // 2
+        lows = df['low'].to_numpy(dtype=float)
+        highs = df['high'].to_numpy(dtype=float)
         
-        # Take only the most significant levels (last 5)
-        support_levels = sorted(support_levels)[-5:]
-        resistance_levels = sorted(resistance_levels)[-5:]
+        # Take only the most significant levels (highest 5, sorted)
+        support_levels = np.unique(lows[swing_points(lows, left, right, kind='low')])[-5:].tolist()
+        resistance_levels = np.unique(highs[swing_points(highs, left, right, kind='high')])[-5:].tolist()
         
         logger.debug(f"Detected {len(support_levels)} support and {len(resistance_levels)} resistance levels")
         
@@ -238,89 +253,215 @@ class TechnicalAnalysis:
     
     # COMPREHENSIVE ANALYSIS
     
-    def calculate_all_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate all technical indicators at once - Optimized
+    def resolve_indicators(self, names: Optional[List[str]] = None) -> List[str]:
+        """
+        Expand requested indicator names into registry entries with their prerequisites
         
-        Uses in-place modifications and skips already calculated indicators
-        for better performance.
+        Args:
+            names: Registry names, group names ('ema', 'sma') or output
+                columns ('macd_signal', 'bb_upper'); None selects everything
+        
+        Returns:
+            Registry names in computation order
         """
-        if df.empty:
-            return df
+        if names is None:
+            return list(self.INDICATOR_REGISTRY)
         
-        # Make a single copy at the start
-        df = df.copy()
+        column_owner = {
+            column: name
+            for name, spec in self.INDICATOR_REGISTRY.items()
+            for column in spec['columns']
+        }
+        needed = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in self.INDICATOR_GROUPS:
+                pending.extend(self.INDICATOR_GROUPS[name])
+                continue
+            entry = name if name in self.INDICATOR_REGISTRY else column_owner.get(name)
+            if entry is None:
+                raise ValueError(f"Unknown indicator: {name}")
+            if entry not in needed:
+                needed.add(entry)
+                pending.extend(self.INDICATOR_REGISTRY[entry].get('requires', []))
+        
+        return [name for name in self.INDICATOR_REGISTRY if name in needed]
+    
+    @staticmethod
+    def bar_fingerprint(df: pd.DataFrame) -> Tuple:
+        """Cheap identity of a bar series: length, first/last timestamp and the last bar's close and volume"""
+        return (
+            len(df),
+            str(df.index[0]),
+            str(df.index[-1]),
+            float(df['close'].iat[-1]),
+            float(df['volume'].iat[-1]),
+        )
+    
+    @classmethod
+    def get_memo_stats(cls) -> Dict[str, Any]:
+        """Indicator memo size and hit/miss counters"""
+        return cls._memo.stats()
+    
+    @classmethod
+    def clear_memo(cls) -> None:
+        """Drop every memoized indicator frame"""
+        cls._memo.clear()
+    
+    def calculate(self, df: pd.DataFrame, names: Optional[List[str]] = None, key: Optional[str] = None,
+                  compact: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Calculate only the requested indicators and what they depend on
         
-        # All indicator functions now check if columns exist and skip if so
-        # Trend indicators
-        self.calculate_ema(df)
-        self.calculate_sma(df)
-        self.calculate_atr(df)
-        self.calculate_adx(df)
+        Args:
+            df: OHLCV frame (not modified)
+            names: Indicators to calculate, see resolve_indicators
+            key: Identity of the series, e.g. "THYAO.IS_1h_1mo" - when given
+                the result is memoized until the bars change
+            compact: Return the columns as one contiguous float32 block
+                (default settings.compact_indicators); values are still
+                computed in float64, only the stored result is rounded
+        
+        Returns:
+            Frame with the OHLCV columns and the selected indicator columns
+        """
+        return self._calculate_memo(df, names, key, compact)[0]
+    
+    def calculate_with_latest(self, df: pd.DataFrame, names: Optional[List[str]] = None, key: Optional[str] = None,
+                              compact: Optional[bool] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        calculate() and get_latest_indicators() of its result in one call
         
-        # Momentum indicators  
-        self.calculate_rsi(df)
-        self.calculate_macd(df)
-        self.calculate_stochastic(df)
-        self.calculate_cci(df)
+        Memo entries keep the last-row values they were stored with, so a
+        memo hit returns them without reading the frame again.
         
-        # Volatility indicators
-        self.calculate_bollinger_bands(df)
+        Returns:
+            (indicator frame, latest indicator values grouped for the API)
+        """
+        result, latest = self._calculate_memo(df, names, key, compact)
+        if latest is None:
+            return result, self.get_latest_indicators(result)
+        return result, self._group_latest(latest)
+    
+    def _calculate_memo(self, df: pd.DataFrame, names: Optional[List[str]], key: Optional[str],
+                        compact: Optional[bool]) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """
+        calculate() through the memo
         
-        # Volume indicators
-        self.calculate_obv(df)
-        self.calculate_vwap(df)
-        self.calculate_mfi(df)
+        Returns:
+            (indicator frame, stored LATEST_COLUMNS values of a memoized
+            result or None)
+        """
+        selected = self.resolve_indicators(names)
+        if df.empty:
+            return df, None
+        if compact is None:
+            compact = settings.compact_indicators
+        if key is None:
+            return self._calculate(df, selected, compact), None
+        
+        memo_key = f"{key}|{','.join(selected)}" + ("|f32" if compact else "")
+        fingerprint = self.bar_fingerprint(df)
+        entry = self._memo.get(memo_key, version=fingerprint)
+        if entry is not None:
+            return entry['data'].copy(deep=False), entry['latest']
+        
+        result = self._calculate(df, selected, compact)
+        try:
+            latest = self.latest_values(result)
+            latest.flags.writeable = False
+        except (TypeError, ValueError):
+            latest = None
+        # No time limit: the fingerprint decides when the entry is stale
+        result = self._memo.put(memo_key, result, float('inf'), version=fingerprint, extra={'latest': latest})
+        return result.copy(deep=False), latest
+    
+    def _calculate(self, df: pd.DataFrame, selected: List[str], compact: bool = False) -> pd.DataFrame:
+        """Run the selected registry entries in order"""
+        # Indicators go to a new frame that shares the OHLCV arrays instead
+        # of copying them (cached frames are read-only and never modified)
+        df = df.copy(deep=False)
+        
+        # Every indicator function skips columns that already exist
+        for name in selected:
+            spec = self.INDICATOR_REGISTRY[name]
+            getattr(self, spec['method'])(df, **spec.get('kwargs', {}))
+        
+        return compact_frame(df) if compact else df
+    
+    def calculate_all_indicators(self, df: pd.DataFrame, key: Optional[str] = None,
+                                 compact: Optional[bool] = None) -> pd.DataFrame:
+        """Calculate all technical indicators at once - Optimized
         
-        return df
+        Uses in-place modifications and skips already calculated indicators
+        for better performance. Pass ``key`` (ticker/interval/period) to reuse
+        the result while the bars are unchanged, ``compact`` for float32 output.
+        """
+        return self.calculate(df, key=key, compact=compact)
     
     def get_latest_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Get the latest indicator values in a structured format"""
         if df.empty or len(df) == 0:
             return {}
         
-        latest = df.iloc[-1]
-        
-        # Helper function to convert NaN to None for JSON serialization
-        def safe_float(value):
-            """Convert value to float, replacing NaN with None"""
-            if pd.isna(value):
-                return None
-            return float(value)
-        
-        indicators = {
-            "trend": {
-                "ema_9": safe_float(latest.get('ema_9', np.nan)),
-                "ema_21": safe_float(latest.get('ema_21', np.nan)),
-                "ema_50": safe_float(latest.get('ema_50', np.nan)),
-                "sma_20": safe_float(latest.get('sma_20', np.nan)),
-                "adx": safe_float(latest.get('adx', np.nan)),
-                "di_plus": safe_float(latest.get('di_plus', np.nan)),
-                "di_minus": safe_float(latest.get('di_minus', np.nan)),
-            },
-            "momentum": {
-                "rsi": safe_float(latest.get('rsi', np.nan)),
-                "macd": safe_float(latest.get('macd', np.nan)),
-                "macd_signal": safe_float(latest.get('macd_signal', np.nan)),
-                "macd_histogram": safe_float(latest.get('macd_histogram', np.nan)),
-                "stoch_k": safe_float(latest.get('stoch_k', np.nan)),
-                "stoch_d": safe_float(latest.get('stoch_d', np.nan)),
-                "cci": safe_float(latest.get('cci', np.nan)),
-            },
-            "volatility": {
-                "bb_upper": safe_float(latest.get('bb_upper', np.nan)),
-                "bb_middle": safe_float(latest.get('bb_middle', np.nan)),
-                "bb_lower": safe_float(latest.get('bb_lower', np.nan)),
-                "atr": safe_float(latest.get('atr', np.nan)),
-            },
-            "volume": {
-                "obv": safe_float(latest.get('obv', np.nan)),
-                "vwap": safe_float(latest.get('vwap', np.nan)),
-                "mfi": safe_float(latest.get('mfi', np.nan)),
-            }
-        }
+        try:
+            values = self.latest_values(df)
+        except (TypeError, ValueError):
+            # Non-numeric columns in the frame: read the row field by field
+            return self.format_latest_indicators(df.iloc[-1])
+        return self._group_latest(values)
+    
+    @classmethod
+    def latest_values(cls, df: pd.DataFrame) -> np.ndarray:
+        """
+        Last-row values of LATEST_COLUMNS
+        
+        iloc[-1] copies the last row out of each block of the frame; the
+        blocks themselves are never merged into one array.
+        
+        Args:
+            df: Non-empty indicator frame with numeric columns
+        
+        Returns:
+            Float array in LATEST_COLUMNS order, NaN for missing columns
+        """
+        row = df.iloc[-1].to_numpy(dtype=float)
+        return np.append(row, np.nan)[cls._latest_layout(tuple(df.columns))]
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _latest_layout(layout: Tuple[str, ...]) -> np.ndarray:
+        """
+        Where LATEST_COLUMNS sit in a column layout (bounded LRU, few layouts occur)
         
-        logger.debug("Extracted latest indicator values")
-        return indicators
+        Returns:
+            Read-only positions, len(layout) for missing columns
+        """
+        lookup = {name: i for i, name in enumerate(layout)}
+        positions = np.array([lookup.get(name, len(layout)) for name in TechnicalAnalysis.LATEST_COLUMNS])
+        positions.flags.writeable = False
+        return positions
+    
+    def format_latest_indicators(self, latest: Any) -> Dict[str, Any]:
+        """
+        Group one row of indicator values for the API
+        
+        Args:
+            latest: Last row of calculate_all_indicators (Series) or the
+                values dict of an IncrementalIndicators stream
+        """
+        values = np.array([latest.get(name, np.nan) for name in self.LATEST_COLUMNS], dtype=float)
+        return self._group_latest(values)
+    
+    def _group_latest(self, values: np.ndarray) -> Dict[str, Any]:
+        """Nest LATEST_COLUMNS values by group, NaN as None for JSON serialization"""
+        # No per-call debug log: this runs for every screener item and tick
+        flat = iter(np.where(np.isnan(values), None, values).tolist())
+        return {
+            group: {name: next(flat) for name in columns}
+            for group, columns in self.LATEST_GROUPS.items()
+        }
     # ADVANCED INDICATORS
     
     def calculate_ichimoku(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -392,6 +533,8 @@ class TrendChannelIndicator:
         self.highs = df['high'].values
         self.lows = df['low'].values
         self.closes = df['close'].values
+        # Last-window fits, computed once per instance
+        self._lines: Dict[str, Dict[str, float]] = {}
     
     def _calculate_linear_regression(self, data: np.ndarray) -> Dict[str, float]:
         """Calculate linear regression for given data"""
@@ -410,13 +553,63 @@ class TrendChannelIndicator:
     
     def find_rising_lows(self) -> Dict[str, float]:
         """Find rising lows for support line"""
-        recent_lows = self.lows[-self.period:]
-        return self._calculate_linear_regression(recent_lows)
+        if 'support' not in self._lines:
+            self._lines['support'] = self._calculate_linear_regression(self.lows[-self.period:])
+        return self._lines['support']
     
     def find_rising_highs(self) -> Dict[str, float]:
         """Find rising highs for resistance line"""
-        recent_highs = self.highs[-self.period:]
-        return self._calculate_linear_regression(recent_highs)
+        if 'resistance' not in self._lines:
+            self._lines['resistance'] = self._calculate_linear_regression(self.highs[-self.period:])
+        return self._lines['resistance']
+    
+    def get_rolling_channel(self) -> pd.DataFrame:
+        """
+        Channel of every bar, fitted on the ``period`` bars up to that bar
+        
+        Each row has the values the last-bar methods give for a frame ending
+        at that row, computed in one pass, so channel positions and
+        breakouts can be backtested.
+        
+        Returns:
+            Frame on the input index: support/resistance slopes and levels,
+            width, width_percent, position (0-100), trend and breakout
+            (NaN/None before the first full window)
+        """
+        last_index = self.period - 1
+        closes = np.asarray(self.closes, dtype=float)
+        support_slope, support_intercept = kernels.rolling_linregress(self.lows, self.period)
+        resistance_slope, resistance_intercept = kernels.rolling_linregress(self.highs, self.period)
+        support = support_slope * last_index + support_intercept
+        resistance = resistance_slope * last_index + resistance_intercept
+        width = resistance - support
+        missing = np.isnan(width)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            width_percent = np.where(support > 0, width / support * 100, 0.0)
+            position = np.clip(np.where(width > 0, (closes - support) / width * 100, 50.0), 0, 100)
+            normalized_slope = (support_slope + resistance_slope) / 2 / kernels.rolling_mean(closes, self.period) * 100
+        
+        tolerance = 0.5  # same 0.5% as detect_breakout
+        trend = np.select([normalized_slope > 0.1, normalized_slope < -0.1], ['YUKSELIS', 'DUSUS'], 'YATAY').astype(object)
+        breakout = np.select(
+            [closes > resistance * (1 + tolerance / 100), closes < support * (1 - tolerance / 100)],
+            ['YUKARI_KIRILMA', 'ASAGI_KIRILMA'], 'KANAL_ICI'
+        ).astype(object)
+        trend[missing] = None
+        breakout[missing] = None
+        
+        return pd.DataFrame({
+            'support_slope': support_slope,
+            'resistance_slope': resistance_slope,
+            'support': support,
+            'resistance': resistance,
+            'width': width,
+            'width_percent': np.where(missing, np.nan, width_percent),
+            'position': np.where(missing, np.nan, position),
+            'trend': trend,
+            'breakout': breakout,
+        }, index=self.df.index)
     
     def calculate_channel_width(self) -> Dict[str, float]:
         """Calculate channel width"""
@@ -0,0 +1,222 @@
+"""
+Session VWAP
+Volume weighted average price that restarts with every Borsa Istanbul
+session, anchored VWAP from any chosen bar and an incremental engine that
+keeps the same values as bars stream in
+"""
+import math
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.services import indicator_kernels as kernels
+
+
+MARKET_TZ = "Europe/Istanbul"
+
+NS_PER_DAY = 86_400 * 10**9
+
+
+def _local_day(ts: pd.Timestamp) -> Tuple[int, int]:
+    """
+    Day number of a timestamp on the Istanbul calendar
+
+    Returns:
+        (day, start) - start is the day's first instant in ``ts.value`` units
+    """
+    local = ts.tz_convert(MARKET_TZ).tz_localize(None) if ts.tzinfo is not None else ts
+    day = local.value // NS_PER_DAY
+    return day, ts.value - (local.value - day * NS_PER_DAY)
+
+
+def session_ids(index: pd.Index, intraday: Optional[bool] = None) -> Optional[np.ndarray]:
+    """
+    Session id (Istanbul calendar day) of every bar
+
+    Args:
+        index: Bar timestamps
+        intraday: Whether bars are intraday; None detects it from two bars
+            sharing a day. Daily and longer bars form one session.
+
+    Returns:
+        int64 array for ``kernels.vwap(sessions=...)``, or None when the
+        VWAP should run over the whole series
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) == 0 or intraday is False:
+        return None
+    local = index.tz_convert(MARKET_TZ).tz_localize(None) if index.tz is not None else index
+    days = local.asi8 // NS_PER_DAY
+    if intraday is None and not (days[1:] == days[:-1]).any():
+        return None
+    return days
+
+
+def anchor_position(index: pd.Index, anchor: Union[int, str, pd.Timestamp]) -> int:
+    """
+    Row where an anchored VWAP starts
+
+    Args:
+        index: Bar timestamps
+        anchor: Row number, or a timestamp - the first bar at or after it
+    """
+    if isinstance(anchor, (int, np.integer)):
+        return int(anchor) if anchor >= 0 else len(index) + int(anchor)
+    ts = pd.Timestamp(anchor)
+    if ts.tzinfo is None and getattr(index, 'tz', None) is not None:
+        ts = ts.tz_localize(MARKET_TZ)
+    return int(index.searchsorted(ts))
+
+
+def anchored_vwap(df: pd.DataFrame, anchor: Union[int, str, pd.Timestamp]) -> pd.Series:
+    """
+    VWAP of an OHLCV frame accumulated from an anchor bar
+
+    Returns:
+        Series on the frame's index, NaN before the anchor
+    """
+    start = anchor_position(df.index, anchor)
+    values = kernels.anchored_vwap(
+        df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy(), start
+    )
+    return pd.Series(values, index=df.index, name='anchored_vwap')
+
+
+class _Totals:
+    """Price x volume and volume sums, with the values before the last bar kept for replacement"""
+
+    __slots__ = ('pv', 'v', 'pv_before', 'v_before')
+
+    def __init__(self):
+        self.pv = self.v = self.pv_before = self.v_before = 0.0
+
+    def reset(self) -> None:
+        self.pv = self.v = 0.0
+
+    def add(self, pv: float, v: float, replace: bool) -> None:
+        if not replace:
+            self.pv_before, self.v_before = self.pv, self.v
+        self.pv = self.pv_before + (0.0 if math.isnan(pv) else pv)
+        self.v = self.v_before + (0.0 if math.isnan(v) else v)
+
+    @property
+    def value(self) -> float:
+        return self.pv / (self.v + 1e-10)
+
+
+class VwapEngine:
+    """
+    Incremental session and anchored VWAP
+
+    ``update`` appends a bar or replaces the last one when its timestamp did
+    not change, in O(1). The session total restarts on the first bar of each
+    Istanbul day; the result equals the batch ``kernels.vwap`` with
+    ``session_ids`` at every bar.
+    """
+
+    def __init__(self, anchors: Optional[Dict[str, Union[str, pd.Timestamp]]] = None, intraday: Optional[bool] = None):
+        """
+        Args:
+            anchors: Named anchor timestamps; each anchored VWAP starts at the
+                first bar at or after its anchor
+            intraday: Reset on sessions (True), never (False) or once two
+                bars share a day (None, like ``session_ids``)
+        """
+        self.intraday = intraday
+        self.anchors: Dict[str, Optional[pd.Timestamp]] = {name: pd.Timestamp(ts) for name, ts in (anchors or {}).items()}
+        self.last_ts: Optional[pd.Timestamp] = None
+        self._day: Optional[int] = None
+        self._day_bounds = (0, 0)  # [start, end) of the current day, skips timezone math within a session
+        self._same_day_seen = False
+        self._total = _Totals()
+        self._session = _Totals()
+        self._anchored = {name: _Totals() for name in self.anchors}
+        self._anchor_started = {name: False for name in self.anchors}
+        self.values: Dict[str, float] = {}
+
+    @property
+    def resets_on_session(self) -> bool:
+        return self.intraday if self.intraday is not None else self._same_day_seen
+
+    def anchor(self, name: str, ts: Optional[pd.Timestamp] = None) -> None:
+        """
+        Start a new anchored VWAP
+
+        Args:
+            name: Key of the value in ``values`` ('anchored_<name>')
+            ts: Anchor time, default the next bar; bars already applied are
+                not replayed, use ``from_frame(anchors=...)`` for past anchors
+        """
+        self.anchors[name] = pd.Timestamp(ts) if ts is not None else None
+        self._anchored[name] = _Totals()
+        self._anchor_started[name] = False
+
+    def update(self, ts: pd.Timestamp, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """
+        Apply one bar
+
+        Returns:
+            {'vwap': session (or whole-series) VWAP, 'anchored_<name>': ...}
+        """
+        replace = self.last_ts is not None and ts == self.last_ts
+        if not replace:
+            if self.last_ts is not None and ts < self.last_ts:
+                raise ValueError(f"Bar at {ts} is older than the last bar {self.last_ts}")
+            start, end = self._day_bounds
+            if start <= ts.value < end:
+                self._same_day_seen = True
+            else:
+                day, start = _local_day(ts)
+                if day == self._day:
+                    self._same_day_seen = True
+                else:
+                    self._session.reset()
+                self._day = day
+                self._day_bounds = (start, start + NS_PER_DAY)
+        self.last_ts = ts
+
+        pv = volume * (high + low + close) / 3
+        self._total.add(pv, volume, replace)
+        self._session.add(pv, volume, replace)
+        self.values['vwap'] = (self._session if self.resets_on_session else self._total).value
+
+        for name, totals in self._anchored.items():
+            if not self._anchor_started[name] and self._reached(ts, self.anchors[name], replace):
+                self._anchor_started[name] = True
+                totals.reset()
+                replace_anchor = False
+            else:
+                replace_anchor = replace
+            if self._anchor_started[name]:
+                totals.add(pv, volume, replace_anchor)
+                self.values[f'anchored_{name}'] = totals.value
+            else:
+                self.values[f'anchored_{name}'] = float('nan')
+        return self.values
+
+    @staticmethod
+    def _reached(ts: pd.Timestamp, anchor: Optional[pd.Timestamp], replace: bool) -> bool:
+        """Whether an anchored VWAP starts at this bar (None: the next new bar)"""
+        if anchor is None:
+            return not replace
+        if anchor.tzinfo is None and ts.tzinfo is not None:
+            anchor = anchor.tz_localize(MARKET_TZ)
+        elif anchor.tzinfo is not None and ts.tzinfo is None:
+            anchor = anchor.tz_convert(MARKET_TZ).tz_localize(None)
+        return ts >= anchor
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, anchors: Optional[Dict[str, Union[str, pd.Timestamp]]] = None,
+                   intraday: Optional[bool] = None) -> "VwapEngine":
+        """Build the state by replaying every bar of an OHLCV frame"""
+        engine = cls(anchors, intraday)
+        columns = zip(
+            df.index,
+            df['high'].to_numpy(dtype=float),
+            df['low'].to_numpy(dtype=float),
+            df['close'].to_numpy(dtype=float),
+            df['volume'].to_numpy(dtype=float),
+        )
+        for row in columns:
+            engine.update(*row)
+        return engine
@@ -24,11 +24,13 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import warnings
+
+from app.services import indicator_kernels as kernels
 warnings.filterwarnings('ignore')
 
 # Win Rate Booster
 try:
-    from win_rate_booster import apply_win_rate_boosters
+    from win_rate_booster import apply_win_rate_boosters, prepare_boosters
     BOOSTER_AVAILABLE = True
 except:
     BOOSTER_AVAILABLE = False
@@ -79,46 +81,32 @@ TEST_TICKERS = [
 
 def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
     """RSI hesapla"""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / (loss + 1e-10)
-    return 100 - (100 / (1 + rs))
+    return pd.Series(kernels.rsi(prices.to_numpy(), period), index=prices.index)
 
 
 def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
     """EMA hesapla"""
-    return prices.ewm(span=period, adjust=False).mean()
+    return pd.Series(kernels.ema(prices.to_numpy(), period), index=prices.index)
 
 
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """ATR hesapla"""
-    high = df['High']
-    low = df['Low']
-    close = df['Close']
-    
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    return tr.rolling(window=period).mean()
+    atr = kernels.atr(df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(), period)
+    return pd.Series(atr, index=df.index)
 
 
 def calculate_macd(prices: pd.Series, fast=12, slow=26, signal=9):
     """MACD hesapla"""
-    ema_fast = calculate_ema(prices, fast)
-    ema_slow = calculate_ema(prices, slow)
-    macd_line = ema_fast - ema_slow
-    signal_line = calculate_ema(macd_line, signal)
-    histogram = macd_line - signal_line
-    return macd_line, signal_line, histogram
+    lines = kernels.macd(prices.to_numpy(), fast, slow, signal)
+    return tuple(pd.Series(line, index=prices.index) for line in lines)
 
 
-def generate_hybrid_signal(df: pd.DataFrame, ticker: str, idx: int) -> Optional[Dict]:
+def generate_hybrid_signal(df: pd.DataFrame, ticker: str, idx: int, boosters: Optional[Dict] = None) -> Optional[Dict]:
     """
     HYBRID SİNYAL ÜRETİMİ
     V2 base + V3 booster (opsiyonel)
+    
+    boosters: prepare_boosters(df) sonucu (hisse başına bir kez hesaplanır)
     """
     if idx < 200:
         return None
@@ -206,7 +194,7 @@ def generate_hybrid_signal(df: pd.DataFrame, ticker: str, idx: int) -> Optional[
     booster_active = False
     if BOOSTER_AVAILABLE:
         try:
-            boosted_score, booster_reasons = apply_win_rate_boosters(df.iloc[:idx+1], idx, score)
+            boosted_score, booster_reasons = apply_win_rate_boosters(df.iloc[:idx+1], idx, score, boosters)
             if boosted_score > score:
                 score = boosted_score
                 reasons.extend(booster_reasons)
@@ -364,6 +352,9 @@ def run_hybrid_backtest(days: int = 90, max_picks: int = 5):
     
     print()
     
+    # Booster S/R seviyeleri: her hisse için tüm seri tek seferde
+    prepared = {t: prepare_boosters(d) for t, d in all_data.items()} if BOOSTER_AVAILABLE else {}
+    
     # Backtest loop
     reference_ticker = list(all_data.keys())[0]
     total_days = len(all_data[reference_ticker])
@@ -501,7 +492,7 @@ def run_hybrid_backtest(days: int = 90, max_picks: int = 5):
                 if day_idx >= len(df):
                     continue
                 
-                signal = generate_hybrid_signal(df, ticker, day_idx)
+                signal = generate_hybrid_signal(df, ticker, day_idx, prepared.get(ticker))
                 if signal:
                     candidates.append(signal)
                     if signal.get('booster_active', False):
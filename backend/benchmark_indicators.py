@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Indicator Micro-Benchmark - Gösterge Başına Maliyet
+TechnicalAnalysis kayıt defterindeki her göstergeyi 10k ve 1M barlık
+sentetik seriler üzerinde ölçer; gerilemeler (ör. tekrar satır başına
+Python çağrısı) tabloda hemen görünür. Ayrıca tarayıcı döngüsünün hisse
+başına son-satır okuma maliyetini (get_latest_indicators, eski yol ve
+memodaki son satırı döndüren calculate_with_latest) ölçer.
+
+Kullanım:
+    cd backend && python benchmark_indicators.py
+    python benchmark_indicators.py --bars 10000 --repeat 5
+    python benchmark_indicators.py --bars --tickers 30 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.synthetic_market import SyntheticMarket
+from app.services.technical_analysis import TechnicalAnalysis
+from app.utils.logger import logger
+
+END = pd.Timestamp("2026-10-16 18:00", tz="Europe/Istanbul")
+
+
+def best_of(fn, repeat: int) -> float:
+    """En iyi süre (saniye) - ilk çalıştırmanın ısınma maliyetini ayıklar"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def legacy_obv(df: pd.DataFrame) -> pd.Series:
+    """Eski satır başına lambda ile OBV (karşılaştırma için)"""
+    sign = df['close'].diff().apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0))
+    return (sign * df['volume']).fillna(0).cumsum()
+
+
+def legacy_latest(df: pd.DataFrame) -> dict:
+    """Eski son satır okuma: Series + alan başına get/pd.isna (karşılaştırma için)"""
+    latest = df.iloc[-1]
+    indicators = {
+        group: {
+            name: None if pd.isna(latest.get(name, np.nan)) else float(latest.get(name, np.nan))
+            for name in columns
+        }
+        for group, columns in TechnicalAnalysis.LATEST_GROUPS.items()
+    }
+    # Eski yol her çağrıda bir debug satırı yazıyordu
+    logger.debug("Extracted latest indicator values")
+    return indicators
+
+
+def benchmark(bars: int, repeat: int) -> None:
+    ta = TechnicalAnalysis()
+    df = SyntheticMarket(seed=1).generate(["BENCH.IS"], "1m", bars=bars, end=END)["BENCH.IS"]
+
+    print(f"\n📊 {bars:,} bar ({repeat} tekrarın en iyisi)")
+    print(f"   {'gösterge':<14}{'ms':>10}{'ns/bar':>10}")
+
+    total = 0.0
+    for name, spec in TechnicalAnalysis.INDICATOR_REGISTRY.items():
+        # Önkoşullar önceden hesaplanır; yalnızca göstergenin kendi maliyeti ölçülür
+        base = ta.calculate(df, spec.get('requires') or [])
+        method = getattr(ta, spec['method'])
+        kwargs = spec.get('kwargs', {})
+        elapsed = best_of(lambda: method(base.copy(deep=False), **kwargs), repeat)
+        total += elapsed
+        print(f"   {name:<14}{elapsed * 1e3:>10.2f}{elapsed / bars * 1e9:>10.1f}")
+
+    print(f"   {'TOPLAM':<14}{total * 1e3:>10.2f}{total / bars * 1e9:>10.1f}")
+
+    elapsed = best_of(lambda: legacy_obv(df), 1)
+    print(f"   {'obv (eski)':<14}{elapsed * 1e3:>10.2f}{elapsed / bars * 1e9:>10.1f}")
+
+
+def benchmark_screener_loop(tickers: int, repeat: int) -> None:
+    """Tarayıcı döngüsü: hisse başına memo isabeti + son satır göstergeleri"""
+    ta = TechnicalAnalysis()
+    market = SyntheticMarket(seed=1)
+    frames = market.generate(market.universe(tickers), "1h", "1mo", end=END)
+    for df in frames.values():
+        # Canlı veride hacim tam sayıdır (karışık tipli çerçeve)
+        df['volume'] = df['volume'].astype('int64')
+
+    print(f"\n🔎 Tarayıcı döngüsü: {len(frames)} hisse ({repeat} tekrarın en iyisi)")
+    print(f"   {'yol':<30}{'ms':>8}{'µs/hisse':>10}")
+
+    for compact in (False, True):
+        # Döngüdeki gibi memodan gelen çerçeveler
+        TechnicalAnalysis.clear_memo()
+        computed = {
+            ticker: ta.calculate_all_indicators(df, key=f"{ticker}_1h_1mo", compact=compact)
+            for ticker, df in frames.items()
+        }
+        label = "float32" if compact else "float64"
+        rows = [
+            (f"get_latest_indicators {label}", lambda: [ta.get_latest_indicators(df) for df in computed.values()]),
+            (f"eski yol {label}", lambda: [legacy_latest(df) for df in computed.values()]),
+        ]
+        for name, fn in rows:
+            elapsed = best_of(fn, repeat)
+            print(f"   {name:<30}{elapsed * 1e3:>8.2f}{elapsed / len(frames) * 1e6:>10.1f}")
+
+        # Her çağrıda memo isabeti: son satır her seferinde taze bir görünümden okunur
+        loops = [
+            (f"memo + son satır {label}", lambda: [
+                ta.get_latest_indicators(ta.calculate_all_indicators(df, key=f"{ticker}_1h_1mo", compact=compact))
+                for ticker, df in frames.items()
+            ]),
+            (f"memo + eski yol {label}", lambda: [
+                legacy_latest(ta.calculate_all_indicators(df, key=f"{ticker}_1h_1mo", compact=compact))
+                for ticker, df in frames.items()
+            ]),
+            (f"calculate_with_latest {label}", lambda: [
+                ta.calculate_with_latest(df, key=f"{ticker}_1h_1mo", compact=compact)
+                for ticker, df in frames.items()
+            ]),
+        ]
+        for name, fn in loops:
+            elapsed = best_of(fn, repeat)
+            print(f"   {name:<30}{elapsed * 1e3:>8.2f}{elapsed / len(frames) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gösterge başına maliyet ölçümü")
+    parser.add_argument("--bars", type=int, nargs="*", default=[10_000, 1_000_000])
+    parser.add_argument("--tickers", type=int, nargs="*", default=[30])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 40)
+    print("⏱️  INDICATOR MICRO-BENCHMARK")
+    print("=" * 40)
+    for n in args.bars:
+        benchmark(n, args.repeat)
+    for n in args.tickers:
+        benchmark_screener_loop(n, args.repeat)
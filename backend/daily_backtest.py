@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from app.services import indicator_kernels as kernels
+
 BIST30 = [
     'THYAO.IS', 'GARAN.IS', 'AKBNK.IS', 'YKBNK.IS', 'EREGL.IS',
     'BIMAS.IS', 'ASELS.IS', 'KCHOL.IS', 'SAHOL.IS', 'SISE.IS',
@@ -20,19 +22,12 @@ BIST30 = [
     'ISCTR.IS', 'VAKBN.IS'
 ]
 
-def calc_ema(p, n): return p.ewm(span=n, adjust=False).mean()
+def calc_ema(p, n): return pd.Series(kernels.ema(p.to_numpy(), n), index=p.index)
 
-def calc_rsi(p, n=14):
-    d = p.diff()
-    g = (d.where(d > 0, 0)).rolling(n).mean()
-    l = (-d.where(d < 0, 0)).rolling(n).mean()
-    return 100 - (100 / (1 + g / (l + 1e-10)))
+def calc_rsi(p, n=14): return pd.Series(kernels.rsi(p.to_numpy(), n), index=p.index)
 
 def calc_atr(df, n=14):
-    tr = pd.concat([df['High'] - df['Low'],
-                    abs(df['High'] - df['Close'].shift()),
-                    abs(df['Low'] - df['Close'].shift())], axis=1).max(axis=1)
-    return tr.rolling(n).mean()
+    return pd.Series(kernels.atr(df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(), n), index=df.index)
 
 def gen_signal(df, idx):
     if idx < 50: return None
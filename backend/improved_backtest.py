@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from app.services import indicator_kernels as kernels
+
 # ========== SEKTÖR TANIMI ==========
 SECTORS = {
     'BANKALAR': ['GARAN.IS', 'AKBNK.IS', 'YKBNK.IS', 'VAKBN.IS', 'ISCTR.IS'],
@@ -42,37 +44,20 @@ def get_sector(ticker):
 def calc_ema(prices, period):
     if len(prices) < period:
         return prices[-1] if len(prices) > 0 else 0
-    mult = 2 / (period + 1)
-    ema = sum(prices[:period]) / period
-    for p in prices[period:]:
-        ema = (p * mult) + (ema * (1 - mult))
-    return ema
+    return kernels.ema_sma_seeded(prices, period)
 
 def calc_rsi(prices, period=14):
     if len(prices) < period + 1:
         return 50
-    gains, losses = [], []
-    for i in range(1, period + 1):
-        diff = prices[-i] - prices[-i-1]
-        if diff > 0:
-            gains.append(diff)
-        else:
-            losses.append(abs(diff))
-    avg_gain = sum(gains) / period if gains else 0
-    avg_loss = sum(losses) / period if losses else 0.0001
-    return 100 - (100 / (1 + (avg_gain / avg_loss)))
+    return float(kernels.rsi(prices[-(period + 1):], period)[-1])
 
 def calc_atr(df, idx, period=14):
     if idx < period:
         return float(df['Close'].iloc[idx]) * 0.025
-    trs = []
-    for i in range(idx - period, idx):
-        hi = float(df['High'].iloc[i])
-        lo = float(df['Low'].iloc[i])
-        prev_cl = float(df['Close'].iloc[i-1]) if i > 0 else lo
-        tr = max(hi - lo, abs(hi - prev_cl), abs(lo - prev_cl))
-        trs.append(tr)
-    return sum(trs) / len(trs) if trs else float(df['Close'].iloc[idx]) * 0.025
+    # idx'ten önceki `period` bar (+1 önceki kapanış için)
+    start = max(idx - period - 1, 0)
+    window = df.iloc[start:idx]
+    return float(kernels.atr(window['High'].to_numpy(), window['Low'].to_numpy(), window['Close'].to_numpy(), period)[-1])
 
 def generate_signal(df, idx):
     """Sinyal üret (min 60 puan gerekli)"""
@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from app.services import indicator_kernels as kernels
+
 # ========== SEKTÖR TANIMI ==========
 SECTORS = {
     'BANKALAR': ['GARAN.IS', 'AKBNK.IS', 'YKBNK.IS', 'VAKBN.IS', 'ISCTR.IS'],
@@ -34,26 +36,13 @@ def get_sector(ticker):
 
 def ema(prices, period):
     if len(prices) < period:
-        return prices[-1] if prices else 0
-    mult = 2 / (period + 1)
-    result = sum(prices[:period]) / period
-    for p in prices[period:]:
-        result = (p * mult) + (result * (1 - mult))
-    return result
+        return prices[-1] if len(prices) else 0
+    return kernels.ema_sma_seeded(prices, period)
 
 def rsi(prices, period=14):
     if len(prices) < period + 1:
         return 50
-    gains, losses = [], []
-    for i in range(1, period + 1):
-        diff = prices[-i] - prices[-i-1]
-        if diff > 0:
-            gains.append(diff)
-        else:
-            losses.append(abs(diff))
-    avg_gain = sum(gains) / period if gains else 0
-    avg_loss = sum(losses) / period if losses else 0.0001
-    return 100 - (100 / (1 + (avg_gain / avg_loss)))
+    return float(kernels.rsi(prices[-(period + 1):], period)[-1])
 
 def run_backtest():
     print("="*70)
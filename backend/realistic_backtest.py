@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from app.services import indicator_kernels as kernels
+
 # BIST30 Hisseler
 BIST30 = [
     'THYAO.IS', 'GARAN.IS', 'AKBNK.IS', 'YKBNK.IS', 'EREGL.IS',
@@ -23,23 +25,16 @@ BIST30 = [
 
 def calc_ema(prices, period):
     """EMA hesapla - API ile aynı"""
-    return prices.ewm(span=period, adjust=False).mean()
+    return pd.Series(kernels.ema(prices.to_numpy(), period), index=prices.index)
 
 def calc_rsi(prices, period=14):
     """RSI hesapla"""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / (loss + 1e-10)
-    return 100 - (100 / (1 + rs))
+    return pd.Series(kernels.rsi(prices.to_numpy(), period), index=prices.index)
 
 def calc_atr(df, period=14):
     """ATR hesapla"""
-    tr1 = df['High'] - df['Low']
-    tr2 = abs(df['High'] - df['Close'].shift())
-    tr3 = abs(df['Low'] - df['Close'].shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    return tr.rolling(window=period).mean()
+    atr = kernels.atr(df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(), period)
+    return pd.Series(atr, index=df.index)
 
 def generate_signal(df, idx):
     """
@@ -0,0 +1,89 @@
+"""
+Backtester Tests
+Array-based trade simulation: exits, re-entries, equity and drawdown
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.backtester import Backtester, first_exit
+from app.services.synthetic_market import SyntheticMarket
+
+
+END = pd.Timestamp("2026-10-16 18:00", tz="Europe/Istanbul")
+
+
+def bars_frame(rows):
+    """(high, low, close) tuples on hourly bars"""
+    high, low, close = (list(column) for column in zip(*rows))
+    index = pd.date_range("2026-10-01 10:00", periods=len(rows), freq="h", tz="Europe/Istanbul")
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1000.0}, index=index)
+
+
+def buy_signals(df, bars):
+    signals = pd.DataFrame({"signal": "HOLD", "strength": 80}, index=df.index)
+    signals.iloc[bars, 0] = "BUY"
+    return signals
+
+
+class TestFirstExit:
+    """Test the per-trade stop/target search"""
+
+    def test_stop_wins_on_a_bar_that_hits_both(self):
+        high = np.array([10.0, 10.2, 11.0, 9.0])
+        low = np.array([10.0, 9.8, 9.0, 8.0])
+
+        assert first_exit(high, low, stop=9.5, target=10.5, start=1) == (2, 9.5)
+        assert first_exit(high, low, stop=7.0, target=12.0, start=1) == (-1, pytest.approx(np.nan, nan_ok=True))
+
+    def test_far_hit_across_growing_windows(self):
+        high = np.full(1000, 10.0)
+        low = np.full(1000, 10.0)
+        high[777] = 11.0
+
+        assert first_exit(high, low, stop=9.0, target=10.5, start=3, chunk=4) == (777, 10.5)
+
+
+class TestBacktester:
+    """Test run_backtest trades and equity"""
+
+    def test_exit_and_reentry_on_the_same_bar(self):
+        """A stop exit frees the cash for a signal on that bar; the last trade closes at the end"""
+        df = bars_frame([(10, 10, 10), (10, 10, 10), (10.1, 9.6, 9.8), (10, 9.8, 10), (10.6, 10, 10.5), (10.45, 10.4, 10.4)])
+        signals = buy_signals(df, [0, 2, 4])
+        signals["stop_loss"] = 9.7
+        signals["take_profit"] = 10.5
+
+        results = Backtester(initial_capital=1000, commission=0.0).run_backtest(df, signals)
+        trades = results["trades"]
+
+        assert [(t["entry_price"], t["exit_price"]) for t in trades] == [(10, 9.7), (9.8, 10.5), (10.5, 10.4)]
+        assert [t["shares"] for t in trades] == [95, 94, 93]
+        assert trades[0]["duration_hours"] == 2 and trades[-1]["duration_hours"] == 0
+        # Cash before each bar: spent on entry, back on exit
+        equity = [point["equity"] for point in results["equity_curve"]]
+        assert equity[0] == 1000 and equity[1] == pytest.approx(50)
+        assert equity[3] == pytest.approx(971.5 - 94 * 9.8)
+
+    def test_drawdown_against_previous_peak(self):
+        """Drawdown compares each bar with the highest equity of the bars before it"""
+        df = SyntheticMarket(seed=4).generate(["THYAO.IS"], "1h", bars=600, end=END)["THYAO.IS"]
+        rng = np.random.default_rng(4)
+        signals = buy_signals(df, np.flatnonzero(rng.random(len(df)) < 0.05))
+
+        results = Backtester(initial_capital=100000).run_backtest(df, signals)
+        equity = [point["equity"] for point in results["equity_curve"]]
+        expected = [(e - max(equity[:i] + [100000])) / max(equity[:i] + [100000]) * 100 for i, e in enumerate(equity)]
+
+        assert len(results["trades"]) > 5
+        np.testing.assert_allclose([point["drawdown"] for point in results["equity_curve"]], expected)
+        assert results["summary"]["max_drawdown"] == round(min(expected), 2)
+
+    def test_without_buy_signals(self):
+        """No entries: flat equity and no trades to analyze"""
+        df = SyntheticMarket(seed=4).generate(["THYAO.IS"], "1h", bars=50, end=END)["THYAO.IS"]
+
+        results = Backtester().run_backtest(df, buy_signals(df, []))
+
+        assert results["trades"] == [] and "error" in results
+        assert {point["equity"] for point in results["equity_curve"]} == {100000}
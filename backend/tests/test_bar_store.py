@@ -0,0 +1,115 @@
+"""
+Bar Store Tests
+Persistence, merge and coverage rules of the on-disk OHLCV store
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.bar_store import BarStore, slice_period, slice_range
+
+
+def make_bars(periods: int = 100, start: str = "2026-07-01 10:00", freq: str = "D") -> pd.DataFrame:
+    """Build a simple increasing OHLCV frame"""
+    index = pd.date_range(start, periods=periods, freq=freq, tz="Europe/Istanbul")
+    values = np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        "open": values,
+        "high": values + 1,
+        "low": values - 1,
+        "close": values + 0.5,
+        "volume": values * 100,
+    }, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a bar store in a temporary directory"""
+    return BarStore(str(tmp_path))
+
+
+class TestBarStore:
+    """Test reading and writing stored series"""
+
+    def test_round_trip(self, store):
+        """Stored bars load back unchanged with their timezone"""
+        df = make_bars()
+        store.write("THYAO.IS", "1d", df, period="3mo")
+
+        loaded, meta = store.load("THYAO.IS", "1d")
+
+        assert str(loaded.index.tz) == "Europe/Istanbul"
+        assert np.array_equal(loaded.index.asi8, df.index.asi8)
+        assert np.allclose(loaded.to_numpy(), df.to_numpy())
+        assert meta["rows"] == len(df)
+
+    def test_missing_series(self, store):
+        """Unknown series load as an empty frame"""
+        loaded, meta = store.load("GARAN.IS", "1h")
+
+        assert loaded.empty
+        assert meta == {}
+
+    def test_merge_replaces_overlapping_bars(self, store):
+        """New bars overwrite stored bars with the same timestamp"""
+        df = make_bars()
+        store.write("THYAO.IS", "1d", df.iloc[:60], period="3mo")
+
+        update = df.iloc[55:].copy()
+        update["close"] = -1.0
+        store.write("THYAO.IS", "1d", update, period="5d")
+
+        loaded, meta = store.load("THYAO.IS", "1d")
+
+        assert len(loaded) == len(df)
+        assert (loaded["close"].iloc[55:] == -1.0).all()
+        assert store.covers_period(meta, "3mo")
+
+    def test_disjoint_write_drops_old_series(self, store):
+        """A write that leaves a gap replaces the stored series"""
+        store.write("THYAO.IS", "1d", make_bars(10), period="3mo")
+        store.write("THYAO.IS", "1d", make_bars(5, start="2027-01-01 10:00"), period="5d")
+
+        loaded, meta = store.load("THYAO.IS", "1d")
+
+        assert len(loaded) == 5
+        assert not store.covers_period(meta, "1mo")
+
+    def test_covers_range(self, store):
+        """Explicit start/end fetches are tracked for historical reads"""
+        store.write("THYAO.IS", "1d", make_bars(), start="2026-06-30", end="2026-08-01")
+        meta = store.read_meta("THYAO.IS", "1d")
+
+        assert store.covers_range(meta, "2026-07-01", "2026-07-15")
+        assert not store.covers_range(meta, "2026-06-01", "2026-07-15")
+        assert not store.covers_range(meta, "2026-07-01", "2026-09-01")
+
+
+class TestSlicing:
+    """Test period and range trimming"""
+
+    def test_day_period_counts_sessions(self):
+        """5d keeps the last five trading sessions of intraday bars"""
+        df = make_bars(24 * 10, freq="h")
+        sessions = df.index.normalize().unique()
+
+        sliced = slice_period(df, "5d")
+
+        assert sliced.index[0].normalize() == sessions[-5]
+
+    def test_month_period(self):
+        """1mo keeps one calendar month back from the last bar"""
+        df = make_bars()
+
+        sliced = slice_period(df, "1mo")
+
+        assert sliced.index[0] >= df.index[-1] - pd.DateOffset(months=1)
+        assert sliced.index[-1] == df.index[-1]
+
+    def test_range_is_end_exclusive(self):
+        """slice_range matches yfinance's [start, end) semantics"""
+        df = make_bars()
+
+        sliced = slice_range(df, "2026-07-05", "2026-07-10")
+
+        assert len(sliced) == 5
@@ -0,0 +1,53 @@
+"""
+Candlestick Pattern Tests
+Whole-series pattern arrays on hand-built bars
+"""
+import numpy as np
+
+from app.services.candlestick_patterns import BULLISH_PATTERNS, pattern_scores, recent_low, scan_bullish_patterns
+
+
+def scan(bars):
+    """Scan (open, high, low, close) tuples"""
+    o, h, l, c = (np.array(column, dtype=float) for column in zip(*bars))
+    return scan_bullish_patterns(o, h, l, c)
+
+
+def found(patterns, row=-1):
+    return [name for name, hits in patterns.items() if hits[row]]
+
+
+class TestCandlestickPatterns:
+    """Test the vectorized bullish pattern scanner"""
+
+    def test_engulfing_after_down_candle(self):
+        """A long green body swallowing the previous red one"""
+        patterns = scan([(10, 10.5, 9.5, 10), (10.4, 10.5, 10.0, 10.1), (10.0, 10.8, 9.9, 10.7)])
+
+        assert "Bullish Engulfing" in found(patterns)
+        # Bars without two predecessors never match a multi-bar pattern
+        assert not patterns["Bullish Engulfing"][:2].any()
+
+    def test_three_white_soldiers_and_hammer(self):
+        """Three rising green candles; a long lower shadow with a small top shadow"""
+        soldiers = scan([(10, 10.3, 9.9, 10.2), (10.2, 10.5, 10.1, 10.4), (10.4, 10.7, 10.3, 10.6)])
+        hammer = scan([(10, 10.1, 9.9, 10), (10, 10.1, 9.9, 10), (10.0, 10.22, 9.5, 10.2)])
+
+        assert found(soldiers) == ["Three White Soldiers"]
+        assert "Hammer" in found(hammer)
+
+    def test_doji_at_support_uses_previous_bars(self):
+        """A doji near the lowest low of the 20 bars before it"""
+        bars = [(10, 10.2, 9.8, 10.1)] * 25 + [(9.90, 10.0, 9.79, 9.905)]
+        patterns = scan(bars)
+
+        assert found(patterns) == ["Doji at Support"]
+        assert pattern_scores(patterns)[-1] == BULLISH_PATTERNS["Doji at Support"]
+
+    def test_recent_low_window(self):
+        """Lowest of the previous bars, 20 at most"""
+        low = np.random.default_rng(2).normal(100, 5, 60)
+        expected = [np.nan] + [low[max(0, t - 20):t].min() for t in range(1, 60)]
+
+        np.testing.assert_allclose(recent_low(low, 20), expected)
+        assert list(BULLISH_PATTERNS) == list(scan([(1, 1, 1, 1)] * 3))
@@ -0,0 +1,324 @@
+"""
+DataFetcher Tests
+Cache, bar store and upstream request behaviour without network access
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.services.async_market_client import AsyncMarketDataClient, parse_chart
+from app.services.bar_store import BarStore
+from app.services.data_fetcher import DataFetcher
+from app.services.frame_cache import FrameCache, frame_nbytes
+from app.services.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def make_bars(periods: int = 100) -> pd.DataFrame:
+    """Build a daily OHLCV frame"""
+    index = pd.date_range("2026-07-01 10:00", periods=periods, freq="D", tz="Europe/Istanbul")
+    values = np.arange(periods, dtype=float) + 10
+    return pd.DataFrame({
+        "open": values,
+        "high": values + 1,
+        "low": values - 1,
+        "close": values + 0.5,
+        "volume": values * 100,
+    }, index=index)
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    """DataFetcher with an isolated cache and bar store"""
+    monkeypatch.setattr(DataFetcher, "_shared_cache", FrameCache(64 * 1024 * 1024))
+    monkeypatch.setattr(DataFetcher, "_bar_store", BarStore(str(tmp_path)))
+    instance = DataFetcher()
+    instance.use_mock_data = False
+    return instance
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replace yfinance history() with a recorder over a fixed series"""
+    bars = make_bars()
+    calls = []
+
+    def fake_download(self, ticker, **kwargs):
+        calls.append(kwargs)
+        if "start" in kwargs:
+            return bars[bars.index >= kwargs["start"]].copy()
+        return bars.iloc[:90].copy()
+
+    monkeypatch.setattr(DataFetcher, "_download_history", fake_download)
+    return bars, calls
+
+
+class TestDeltaFetch:
+    """Test incremental refresh of expired series"""
+
+    def test_expired_entry_fetches_only_new_bars(self, fetcher, upstream):
+        """An expired cache entry is extended from its last timestamp"""
+        bars, calls = upstream
+        fetcher.cache_ttl = 0
+
+        first = fetcher.fetch_realtime_data("THYAO.IS", "1d", "3mo")
+        second = fetcher.fetch_realtime_data("THYAO.IS", "1d", "3mo")
+
+        assert "period" in calls[0]
+        assert calls[1]["start"] == first.index[-1]
+        assert second.index[-1] == bars.index[-1]
+        assert not second.index.duplicated().any()
+
+    def test_stale_bar_store_is_extended(self, fetcher, upstream):
+        """After a restart the stored series is used as the delta base"""
+        _, calls = upstream
+        fetcher.cache_ttl = 0
+
+        fetcher.fetch_realtime_data("THYAO.IS", "1d", "3mo")
+        DataFetcher._shared_cache.clear()
+        df = fetcher.fetch_realtime_data("THYAO.IS", "1d", "1mo")
+
+        assert "start" in calls[-1]
+        assert df.index[0] >= df.index[-1] - pd.DateOffset(months=1)
+
+
+class TestFetchMany:
+    """Test the grouped multi-ticker download"""
+
+    @pytest.fixture
+    def grouped_download(self, monkeypatch):
+        """Replace yf.download with a recorder returning a grouped panel"""
+        calls = []
+
+        def fake_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            frames = {}
+            for i, ticker in enumerate(tickers):
+                bars = make_bars(30) * (i + 1)
+                bars.columns = [c.capitalize() for c in bars.columns]
+                frames[ticker] = bars
+            return pd.concat(frames, axis=1)
+
+        monkeypatch.setattr("app.services.data_fetcher.yf.download", fake_download)
+        return calls
+
+    def test_one_request_fills_cache(self, fetcher, grouped_download, upstream):
+        """All tickers come from one download and later reads hit the cache"""
+        _, history_calls = upstream
+        tickers = ["AKBNK.IS", "GARAN.IS", "THYAO.IS"]
+
+        frames = fetcher.fetch_many(tickers, "1d", "1mo")
+
+        assert grouped_download == [tickers]
+        assert set(frames) == set(tickers)
+        assert list(frames["GARAN.IS"].columns) == ["open", "high", "low", "close", "volume"]
+
+        df = fetcher.fetch_realtime_data("GARAN.IS", "1d", "1mo")
+        assert df.equals(frames["GARAN.IS"])
+        assert history_calls == []
+
+    def test_cached_tickers_are_not_downloaded(self, fetcher, grouped_download, upstream):
+        """Only cache misses are part of the grouped request"""
+        fetcher.fetch_realtime_data("THYAO.IS", "1d", "1mo")
+
+        fetcher.fetch_many(["AKBNK.IS", "THYAO.IS"], "1d", "1mo")
+
+        assert grouped_download == [["AKBNK.IS"]]
+
+    def test_concurrent_batches_share_frozen_frames(self, fetcher, grouped_download, monkeypatch):
+        """Followers of a coalesced batch get read-only views of the cached frames, not copies"""
+        download = DataFetcher._download_many
+
+        def slow_download(self, *args):
+            time.sleep(0.2)
+            return download(self, *args)
+
+        monkeypatch.setattr(DataFetcher, "_download_many", slow_download)
+        monkeypatch.setattr(DataFetcher, "_inflight", SingleFlight())
+        tickers = ["AKBNK.IS", "THYAO.IS"]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: fetcher.fetch_many(tickers, "1d", "1mo"), range(4)))
+
+        assert grouped_download == [tickers]
+        cached = fetcher.cache.peek(fetcher._get_cache_key("THYAO.IS", "1d", "1mo"))['data']
+        for frames in results:
+            assert np.shares_memory(frames["THYAO.IS"]['close'].to_numpy(), cached['close'].to_numpy())
+            with pytest.raises(ValueError):
+                frames["THYAO.IS"]['close'].values[-1] = 0.0
+
+
+class TestFrameCache:
+    """Test the bounded LRU bar cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Entries past the byte budget are evicted oldest-use first"""
+        size = frame_nbytes(make_bars())
+        cache = FrameCache(max_bytes=size * 2)
+
+        cache.put("a", make_bars(), ttl=60)
+        cache.put("b", make_bars(), ttl=60)
+        assert cache.get("a") is not None
+        cache.put("c", make_bars(), ttl=60)
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.bytes <= cache.max_bytes
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entry_is_a_miss_but_kept(self):
+        """Expired entries stop being served but remain as delta bases"""
+        cache = FrameCache(max_bytes=10 ** 9)
+        cache.put("a", make_bars(), ttl=0)
+
+        assert cache.get("a") is None
+        assert cache.peek("a") is not None
+        assert cache.stats()["expired"] == 1
+
+    def test_cached_frames_are_read_only_views(self, fetcher, upstream):
+        """Cache hits share data with the cache but cannot modify it"""
+        first = fetcher.fetch_realtime_data("THYAO.IS", "1d", "3mo")
+        second = fetcher.fetch_realtime_data("THYAO.IS", "1d", "3mo")
+
+        assert first is not second
+        assert np.shares_memory(first["close"].to_numpy(), second["close"].to_numpy())
+
+        second["signal"] = 1.0
+        with pytest.raises(ValueError):
+            second.loc[second.index[0], "close"] = -1.0
+
+        third = fetcher.fetch_realtime_data("THYAO.IS", "1d", "3mo")
+        assert "signal" not in third.columns
+        assert third["close"].iloc[0] == first["close"].iloc[0]
+
+    def test_ttl_depends_on_interval(self, fetcher):
+        """Intraday bars use the realtime TTL, daily bars the historical one"""
+        fetcher.cache_ttl = None
+
+        assert fetcher._cache_ttl("5m") == settings.cache_ttl_realtime
+        assert fetcher._cache_ttl("1h") == settings.cache_ttl_realtime
+        assert fetcher._cache_ttl("1d") == settings.cache_ttl_historical
+        assert fetcher._cache_ttl("1mo") == settings.cache_ttl_historical
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent cache misses"""
+
+    @pytest.fixture
+    def slow_upstream(self, monkeypatch):
+        """history() replacement that blocks long enough for callers to pile up"""
+        calls = []
+
+        def fake_download(self, ticker, **kwargs):
+            calls.append(ticker)
+            time.sleep(0.2)
+            return make_bars(30)
+
+        async def fake_fetch_chart(self, ticker, interval="1d", **kwargs):
+            calls.append(ticker)
+            await asyncio.sleep(0.2)
+            return make_bars(30)
+
+        monkeypatch.setattr(DataFetcher, "_download_history", fake_download)
+        monkeypatch.setattr(AsyncMarketDataClient, "fetch_chart", fake_fetch_chart)
+        monkeypatch.setattr(DataFetcher, "_inflight", SingleFlight())
+        monkeypatch.setattr(DataFetcher, "_inflight_async", AsyncSingleFlight())
+        return calls
+
+    def test_threads_share_one_download(self, fetcher, slow_upstream):
+        """Concurrent threads asking for the same key trigger one request"""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            frames = list(pool.map(
+                lambda _: fetcher.fetch_realtime_data("THYAO.IS", "1d", "1mo"), range(8)
+            ))
+
+        assert slow_upstream == ["THYAO.IS"]
+        assert all(df.equals(frames[0]) for df in frames)
+        # Every caller owns its frame
+        assert len({id(df) for df in frames}) == len(frames)
+
+    def test_tasks_share_one_download(self, fetcher, slow_upstream):
+        """Concurrent asyncio tasks asking for the same key trigger one request"""
+        async def fetch_all():
+            return await asyncio.gather(*[
+                fetcher.fetch_realtime_data_async("THYAO.IS", "1d", "1mo") for _ in range(5)
+            ])
+
+        frames = asyncio.run(fetch_all())
+
+        assert slow_upstream == ["THYAO.IS"]
+        assert DataFetcher._inflight_async.coalesced == 4
+        assert len({id(df) for df in frames}) == len(frames)
+
+    def test_errors_reach_every_waiter(self):
+        """A failing leader raises in the coalesced callers too"""
+        group = SingleFlight()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("upstream down")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(group.do, "key", failing)
+            started.wait()
+            follower = pool.submit(group.do, "key", failing)
+
+            for future in (leader, follower):
+                with pytest.raises(RuntimeError):
+                    future.result()
+
+        assert group.in_flight() == 0
+
+
+class TestAsyncChartClient:
+    """Test parsing of chart API responses"""
+
+    @staticmethod
+    def payload(interval_seconds: int = 86400):
+        """Minimal v8 chart response with one null bar"""
+        start = 1782896400  # 2026-07-01 09:00 UTC
+        timestamps = [start + i * interval_seconds for i in range(4)]
+        return {"chart": {"result": [{
+            "meta": {"exchangeTimezoneName": "Europe/Istanbul"},
+            "timestamp": timestamps,
+            "indicators": {
+                "quote": [{
+                    "open": [10.0, 11.0, None, 13.0],
+                    "high": [11.0, 12.0, None, 14.0],
+                    "low": [9.0, 10.0, None, 12.0],
+                    "close": [10.5, 11.5, None, 13.5],
+                    "volume": [100, 200, None, 400],
+                }],
+                "adjclose": [{"adjclose": [5.25, 11.5, None, 13.5]}],
+            },
+        }]}}
+
+    def test_daily_bars_match_history_layout(self):
+        """Daily bars are adjusted, localized and stamped at midnight"""
+        df = parse_chart(self.payload(), "1d")
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert len(df) == 3
+        assert str(df.index.tz) == "Europe/Istanbul"
+        assert (df.index == df.index.normalize()).all()
+        # First bar is adjusted by adjclose / close = 0.5
+        assert df["open"].iloc[0] == pytest.approx(5.0)
+        assert df["close"].iloc[1] == pytest.approx(11.5)
+
+    def test_intraday_bars_keep_their_time(self):
+        """Intraday timestamps are only converted to exchange time"""
+        df = parse_chart(self.payload(300), "5m")
+
+        assert df.index[0].hour == 12
+        assert df.index.name == "Datetime"
+
+    def test_empty_response(self):
+        """Responses without a result parse as an empty frame"""
+        assert parse_chart({"chart": {"result": None}}, "1d").empty
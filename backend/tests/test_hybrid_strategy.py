@@ -0,0 +1,34 @@
+"""
+Hybrid Strategy Tests
+The optional win rate booster must load whatever is imported first
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+class TestBoosterImport:
+    """Test the optional booster in a fresh interpreter (import order matters)"""
+
+    @pytest.mark.parametrize("first", ["win_rate_booster", "app.services.hybrid_strategy"])
+    def test_booster_is_available_in_any_import_order(self, first):
+        """Importing the booster first no longer hides it behind a half-initialized module"""
+        script = (
+            f"import {first}\n"
+            "import app.services.hybrid_strategy as hybrid\n"
+            "print(hybrid.BOOSTER_AVAILABLE, hybrid.HybridSignalGenerator().booster_available)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", script],
+            cwd=BACKEND, env=os.environ.copy(), capture_output=True, text=True, timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "True True"
+        assert "yüklenemedi" not in result.stdout
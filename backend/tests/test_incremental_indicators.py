@@ -0,0 +1,89 @@
+"""
+Incremental Indicator Tests
+The streaming engine must reproduce calculate_all_indicators bar for bar
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.incremental_indicators import IncrementalIndicators, IndicatorStreams
+from app.services.synthetic_market import SyntheticMarket
+from app.services.technical_analysis import TechnicalAnalysis
+
+
+END = pd.Timestamp("2026-10-16 18:00", tz="Europe/Istanbul")
+
+
+@pytest.fixture
+def bars():
+    """Three sessions of 1m bars"""
+    return SyntheticMarket(seed=3).generate(["THYAO.IS"], "1m", bars=600, end=END)["THYAO.IS"]
+
+
+def assert_matches_batch(values, df):
+    """Compare a values dict with the last row of the batch calculation"""
+    expected = TechnicalAnalysis().calculate_all_indicators(df).iloc[-1]
+    for column, value in values.items():
+        np.testing.assert_allclose(value, expected[column], rtol=1e-8, atol=1e-8, err_msg=column)
+
+
+class TestIncrementalIndicators:
+    """Test the per-bar indicator engine"""
+
+    def test_matches_batch_with_forming_bars(self, bars):
+        """Appending bars and replacing the forming one gives batch values"""
+        engine = IncrementalIndicators.from_frame(bars.iloc[:400])
+        for i in range(400, len(bars)):
+            ts, row = bars.index[i], bars.iloc[i]
+            # A partial candle first, then the completed one at the same timestamp
+            engine.update(ts, row['open'], row['open'], row['open'], row['open'], row['volume'] / 2)
+            engine.update(ts, row['open'], row['high'], row['low'], row['close'], row['volume'])
+
+        assert engine.bars == len(bars)
+        assert_matches_batch(engine.values, bars)
+
+    def test_older_bar_rejected(self, bars):
+        """Bars must arrive in time order"""
+        engine = IncrementalIndicators.from_frame(bars.iloc[:50])
+        row = bars.iloc[10]
+
+        with pytest.raises(ValueError):
+            engine.update(bars.index[10], row['open'], row['high'], row['low'], row['close'], row['volume'])
+
+
+class TestIndicatorStreams:
+    """Test syncing streams with refetched frames"""
+
+    def test_sync_extends_and_rebuilds(self, bars):
+        """Growing frames extend the stream, a shifted window rebuilds it"""
+        streams = IndicatorStreams()
+        streams.sync("THYAO.IS", "1m", bars.iloc[:300])
+        engine = streams._engines["THYAO.IS_1m"]
+
+        values = streams.sync("THYAO.IS", "1m", bars.iloc[:450])
+        assert streams._engines["THYAO.IS_1m"] is engine
+        assert_matches_batch(values, bars.iloc[:450])
+
+        values = streams.sync("THYAO.IS", "1m", bars.iloc[100:500])
+        assert streams._engines["THYAO.IS_1m"] is not engine
+        assert_matches_batch(values, bars.iloc[100:500])
+
+    def test_empty_frame(self):
+        """Nothing to report without bars"""
+        assert IndicatorStreams().sync("THYAO.IS", "1m", pd.DataFrame()) == {}
+
+    def test_last_subscription_drops_the_state(self, bars):
+        """State stays while any stream of the ticker runs and is freed after the last one"""
+        streams = IndicatorStreams()
+
+        with streams.subscription("THYAO.IS", "1m"):
+            with streams.subscription("THYAO.IS", "1m"):
+                streams.sync("THYAO.IS", "1m", bars.iloc[:300])
+            assert "THYAO.IS_1m" in streams._engines
+            with pytest.raises(RuntimeError):
+                with streams.subscription("GARAN.IS", "1m"):
+                    streams.sync("GARAN.IS", "1m", bars.iloc[:300])
+                    raise RuntimeError("client went away")
+            assert "GARAN.IS_1m" not in streams._engines
+
+        assert streams._engines == {} and streams._subscribers == {}
@@ -0,0 +1,94 @@
+"""
+Indicator Kernel Tests
+The shared NumPy kernels must reproduce the pandas formulas they replaced
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import indicator_kernels as kernels
+
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(3)
+    return 100 + np.cumsum(rng.normal(0, 1, 300))
+
+
+class TestIndicatorKernels:
+    """Test kernels against pandas and hand-computed values"""
+
+    def test_rolling_and_ewm_match_pandas(self, close):
+        """Rolling windows and both EMA forms equal pandas, warm-up NaNs included"""
+        series = pd.Series(close)
+
+        np.testing.assert_allclose(kernels.sma(close, 20), series.rolling(20).mean(), rtol=1e-12)
+        np.testing.assert_allclose(kernels.rolling_std(close, 20), series.rolling(20).std(), rtol=1e-9)
+        np.testing.assert_allclose(kernels.rolling_max(close, 14), series.rolling(14).max())
+        for adjust in (False, True):
+            np.testing.assert_allclose(kernels.ema(close, 21, adjust), series.ewm(span=21, adjust=adjust).mean())
+
+    def test_rolling_windows_skip_gaps(self):
+        """A window holding a missing value is NaN, the next full window is exact"""
+        values = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0])
+        expected = pd.Series(values).rolling(3)
+
+        np.testing.assert_allclose(kernels.rolling_mean(values, 3), expected.mean())
+        np.testing.assert_allclose(kernels.rolling_std(values, 3), expected.std())
+
+    def test_flat_windows_are_exact(self, close):
+        """A flat tail gives exact zero gains, RSI 0.0 and std 0.0 like pandas, never -4e-16"""
+        flat = np.concatenate([close[:60], np.full(20, 100.0)])
+        gain = np.maximum(kernels.diff(flat), 0.0)
+        gain[0] = np.nan
+        expected = pd.Series(gain).rolling(14).mean().to_numpy()
+
+        assert (kernels.rolling_mean(gain, 14)[-5:] == 0.0).all()
+        assert (kernels.rolling_mean(flat, 14)[-5:] == 100.0).all()
+        assert (kernels.rolling_sum(gain, 14)[-5:] == 0.0).all()
+        assert (kernels.rolling_std(flat, 14)[-5:] == 0.0).all()
+        assert (kernels.rsi(flat)[-5:] == 0.0).all()
+        np.testing.assert_allclose(kernels.rolling_mean(gain, 14), expected, rtol=1e-12, atol=1e-12)
+        assert (kernels.rolling_mean(gain, 14)[14:] >= 0).all()
+
+    def test_columns_are_independent_series(self, close):
+        """A (time x series) input gives each column its 1-D result"""
+        panel = np.column_stack([close, close[::-1], close * 2])
+        result = kernels.rsi(panel, 14)
+
+        for i in range(panel.shape[1]):
+            np.testing.assert_allclose(result[:, i], kernels.rsi(panel[:, i], 14), rtol=1e-9)
+
+    def test_small_golden_values(self):
+        """Hand-checked values on a short series"""
+        close = np.array([1.0, 2.0, 3.0, 2.0, 4.0])
+        high = close + 1
+        low = close - 1
+
+        # Changes +1,+1,-1,+2: average gain 1, average loss 0.25
+        assert kernels.rsi(close, 4)[-1] == pytest.approx(80.0)
+        # True ranges 2,2,2,2,3 (first bar uses high-low)
+        np.testing.assert_allclose(kernels.true_range(high, low, close), [2, 2, 2, 2, 3])
+        assert kernels.atr(high, low, close, 2)[-1] == pytest.approx(2.5)
+        assert np.isnan(kernels.sma(close, 6)).all()
+
+    def test_sma_seeded_ema_matches_loop(self, close):
+        """The closed form equals the classic per-bar recursion"""
+        period = 10
+        k = 2 / (period + 1)
+        expected = close[:period].mean()
+        for price in close[period:]:
+            expected = price * k + expected * (1 - k)
+
+        assert kernels.ema_sma_seeded(close, period) == pytest.approx(expected, rel=1e-12)
+        assert np.isnan(kernels.ema_sma_seeded(close[:5], period))
+
+    def test_obv_matches_signed_volume_sum(self, close):
+        """OBV equals the old per-bar sign, gaps adding nothing"""
+        close = close.copy()
+        close[[50, 51]] = np.nan
+        volume = np.linspace(1e5, 2e5, len(close))
+        sign = pd.Series(close).diff().apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0))
+        expected = (sign * volume).fillna(0).cumsum()
+
+        np.testing.assert_allclose(kernels.obv(close, volume), expected)
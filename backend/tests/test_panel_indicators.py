@@ -0,0 +1,56 @@
+"""
+Panel Indicator Tests
+The whole-universe pass must give every ticker its per-ticker batch values
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.panel_indicators import INDICATOR_COLUMNS, PanelIndicators
+from app.services.synthetic_market import SyntheticMarket
+from app.services.technical_analysis import TechnicalAnalysis
+
+
+END = pd.Timestamp("2026-10-16 18:00", tz="Europe/Istanbul")
+
+
+@pytest.fixture
+def frames():
+    """A universe whose tickers have different history lengths"""
+    market = SyntheticMarket(seed=11)
+    frames = market.generate(market.universe(12), "1h", bars=240, end=END)
+    return {ticker: df.iloc[i * 15:] for i, (ticker, df) in enumerate(frames.items())}
+
+
+class TestPanelIndicators:
+    """Test the vectorized (time x ticker) indicator pass"""
+
+    def test_matches_per_ticker_batch(self, frames):
+        """Every column equals calculate_all_indicators, NaN warm-up included"""
+        panel = PanelIndicators.from_frames(frames)
+        ta = TechnicalAnalysis()
+
+        assert panel.values.shape == (240, len(frames), len(INDICATOR_COLUMNS))
+        for ticker, df in frames.items():
+            expected = ta.calculate_all_indicators(df)[INDICATOR_COLUMNS]
+            result = panel.frame(ticker)
+            assert result.index.equals(df.index)
+            np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+    def test_latest_and_long_frame(self, frames):
+        """latest() is the last row and to_frame() stacks every ticker's bars"""
+        panel = PanelIndicators.from_frames(frames)
+        ticker = next(iter(frames))
+
+        assert panel.latest(ticker) == pytest.approx(panel.frame(ticker).iloc[-1].to_dict(), nan_ok=True)
+        assert len(panel.to_frame()) == sum(len(df) for df in frames.values())
+        assert "MISSING.IS" not in panel
+
+    def test_float32_storage(self, frames):
+        """dtype=np.float32 stores the same values in half the bytes"""
+        full = PanelIndicators.from_frames(frames)
+        compact = PanelIndicators.from_frames(frames, dtype=np.float32)
+
+        assert compact.values.dtype == np.float32
+        assert compact.values.nbytes * 2 == full.values.nbytes
+        np.testing.assert_allclose(compact.values, full.values, rtol=1e-6, equal_nan=True)
@@ -0,0 +1,89 @@
+"""
+Portfolio Backtester Tests
+Shared cash, pick and sector limits, and the hybrid partial exits
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.hybrid_strategy import HybridRiskManagement, simulate_hybrid_trade
+from app.services.portfolio_backtester import PortfolioBacktester, align_panel
+
+
+INDEX = pd.date_range("2026-09-01", periods=6, freq="B", tz="Europe/Istanbul")
+
+
+def signal_frame(bars, entry=100.0, stop=98.0, score=80.0):
+    """One signal on the given bar with 1:2.5 and 1:4 targets"""
+    frame = pd.DataFrame(np.nan, index=INDEX, columns=["strength", "entry_price", "stop_loss", "take_profit_1", "take_profit_2"])
+    risk = entry - stop
+    frame.iloc[bars] = [score, entry, stop, entry + 2.5 * risk, entry + 4 * risk]
+    return frame
+
+
+def flat_bars(highs=None, lows=None, close=100.0):
+    highs = highs or [100.5] * len(INDEX)
+    lows = lows or [99.5] * len(INDEX)
+    return pd.DataFrame({"high": highs, "low": lows, "close": close}, index=INDEX)
+
+
+def frictionless(**kwargs):
+    return PortfolioBacktester(initial_capital=100000, commission=0.0, slippage_pct=0.0, **kwargs)
+
+
+class TestPortfolioBacktester:
+    """Test the shared-capital simulation"""
+
+    @pytest.mark.parametrize("highs,lows", [
+        ([100.5, 100.5, 105.5, 108.5, 100.5, 100.5], [99.5, 99.5, 99.5, 100.5, 99.5, 99.5]),
+        ([100.5, 100.5, 105.5, 100.5, 100.5, 100.5], [99.5, 99.5, 101.0, 99.8, 99.5, 99.5]),
+        ([100.5, 101.0, 100.5, 100.5, 100.5, 100.5], [99.5, 97.5, 99.5, 99.5, 99.5, 99.5]),
+    ])
+    def test_exits_follow_simulate_hybrid_trade(self, highs, lows):
+        """TP1 half, break-even stop and TP2 give the same return as the single-trade helper"""
+        result = frictionless().run({"THYAO.IS": flat_bars(highs, lows)}, {"THYAO.IS": signal_frame(0)})
+        trade = result["trades"][0]
+        expected = simulate_hybrid_trade(100.0, 98.0, 105.0, 108.0, highs[1:], lows[1:])
+
+        assert trade["exit_type"] == expected["exit_type"]
+        assert trade["exit_price"] == expected["exit_price"]
+        assert trade["profit_percent"] == pytest.approx(expected["total_pnl_pct"], abs=0.01)
+
+    def test_daily_picks_and_sector_caps(self):
+        """Best scores first, one name per sector, at most max_picks_per_day"""
+        tickers = ["GARAN.IS", "AKBNK.IS", "THYAO.IS", "ASELS.IS"]
+        frames = {t: flat_bars() for t in tickers}
+        signals = {t: signal_frame(0, score=score) for t, score in zip(tickers, [85, 90, 80, 78])}
+        params = HybridRiskManagement(max_picks_per_day=2)
+
+        result = frictionless(params=params, max_hold_bars=1).run(frames, signals)
+
+        assert sorted(t["ticker"] for t in result["trades"]) == ["AKBNK.IS", "THYAO.IS"]
+        assert result["equity_curve"][0]["positions"] == 2
+
+    def test_shared_cash_commission_and_slippage(self):
+        """Cash never goes negative and the final capital is the initial plus every trade's profit"""
+        rng = np.random.default_rng(3)
+        tickers = ["GARAN.IS", "THYAO.IS", "ASELS.IS", "BIMAS.IS", "TUPRS.IS", "EREGL.IS", "FROTO.IS"]
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(INDEX), len(tickers))), axis=0))
+        high, low = close * 1.02, close * 0.98
+        score = np.where(rng.random(close.shape) < 0.6, 80.0, np.nan)
+        bt = PortfolioBacktester(initial_capital=50000, commission=0.002, slippage_pct=0.1)
+
+        result = bt.run_arrays(INDEX, tickers, high, low, close, score, close, close * 0.98, close * 1.05, close * 1.08)
+
+        assert min(point["cash"] for point in result["equity_curve"]) >= 0
+        assert max(point["positions"] for point in result["equity_curve"]) <= 5
+        total = sum(t["profit"] for t in result["trades"])
+        assert result["summary"]["final_capital"] == pytest.approx(50000 + total, abs=0.01 * len(result["trades"]) + 0.01)
+        assert all(t["profit"] < 0 for t in result["trades"] if t["exit_type"] == "STOP_LOSS")
+
+    def test_align_panel_fills_missing_rows(self):
+        """Tickers without a bar on a date are NaN there"""
+        frames = {"A.IS": flat_bars(), "B.IS": flat_bars().iloc[2:]}
+
+        index, tickers, arrays = align_panel(frames, ["close", "volume"])
+
+        assert index.equals(INDEX) and tickers == ["A.IS", "B.IS"]
+        assert np.isnan(arrays["close"][:2, 1]).all() and not np.isnan(arrays["close"][2:]).any()
+        assert np.isnan(arrays["volume"]).all()
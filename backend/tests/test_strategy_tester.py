@@ -0,0 +1,101 @@
+"""
+Strategy Tester Tests
+Point-in-time replay of the daily strategy from history loaded once
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from app.services.strategy_tester import MARKET_INDEX, StrategyTester, bars_before, history_period
+from app.services.synthetic_market import SyntheticMarket
+
+
+END = pd.Timestamp("2026-10-16 18:00", tz="Europe/Istanbul")
+TICKERS = ["AKBNK.IS", "ASELS.IS", "BIMAS.IS", "EREGL.IS", "THYAO.IS", "TUPRS.IS"]
+
+
+@pytest.fixture
+def market():
+    return SyntheticMarket(seed=7).generate(TICKERS + [MARKET_INDEX], "1d", bars=400, end=END)
+
+
+@pytest.fixture
+def tester(market, monkeypatch):
+    """Tester whose history comes from the synthetic market; live paths raise"""
+    instance = StrategyTester()
+    instance.screener.bist30_tickers = TICKERS
+    instance.fetch_calls = []
+
+    def fake_fetch_many(tickers, interval="1d", period="3mo", live_only=False):
+        instance.fetch_calls.append((tuple(tickers), interval, period))
+        return {t: market[t] for t in tickers}
+
+    def live_call(*args, **kwargs):
+        raise AssertionError("live data requested during a point-in-time replay")
+
+    monkeypatch.setattr(instance.data_fetcher, "fetch_many", fake_fetch_many)
+    monkeypatch.setattr(instance.data_fetcher, "fetch_realtime_data", live_call)
+    monkeypatch.setattr(instance.screener, "get_top_picks", live_call)
+    monkeypatch.setattr(instance.screener, "is_market_uptrend", live_call)
+    return instance
+
+
+class TestHistoryHelpers:
+    """Test the period and as-of position helpers"""
+
+    def test_history_period_covers_the_warmup(self):
+        now = datetime(2026, 10, 17)
+
+        assert history_period("2026-10-01", now=now) == "1y"
+        assert history_period("2025-12-01", now=now) == "2y"
+        assert history_period("2015-01-01", now=now) == "max"
+
+    def test_bars_before_excludes_the_date_itself(self, market):
+        index = market["THYAO.IS"].index
+        date = index[-5].strftime("%Y-%m-%d")
+
+        assert bars_before(index, date) == len(index) - 5
+        assert bars_before(index.tz_localize(None), date) == len(index) - 5
+
+
+class TestPointInTimeReplay:
+    """Test backtest_daily_strategy with point_in_time=True"""
+
+    def test_history_is_loaded_once(self, tester):
+        """Two grouped fetches for the whole run, none per replayed day"""
+        results = tester.backtest_daily_strategy("2026-08-03", "2026-10-16", min_score=50)
+
+        assert [call[0] for call in tester.fetch_calls] == [tuple(TICKERS), (MARKET_INDEX,)]
+        assert results["trades"]
+        assert all(t["date"] >= "2026-08-03" for t in results["trades"])
+
+    def test_picks_ignore_later_bars(self, tester, market):
+        """The pick for a morning is the same when every bar from that day on is removed"""
+        date = "2026-09-15"
+        full = tester.load_history("2026-08-03")
+        for ticker in TICKERS + [MARKET_INDEX]:
+            market[ticker] = market[ticker][market[ticker].index < pd.Timestamp(date, tz="Europe/Istanbul")]
+        truncated = tester.load_history("2026-08-03")
+
+        pick = tester._get_best_pick_as_of(full, date, min_score=0)
+        same = tester._get_best_pick_as_of(truncated, date, min_score=0)
+        assert pick is not None
+        assert (pick["ticker"], pick["score"], pick["timestamp"]) == (same["ticker"], same["score"], same["timestamp"])
+        assert pick["levels"] == pytest.approx(same["levels"])
+        assert tester._market_uptrend_as_of(full, date) == tester._market_uptrend_as_of(truncated, date)
+        assert pick["timestamp"] < date
+
+    def test_trade_closes_on_the_days_own_bar(self, tester, market):
+        """Stop, target and close come from the replayed day's high/low/close"""
+        history = tester.load_history("2026-08-03")
+        frame = market["THYAO.IS"]
+        day = frame[frame.index.strftime("%Y-%m-%d") == "2026-09-15"].iloc[0]
+
+        bar = tester._bar_on_date(history, "THYAO.IS", "2026-09-15")
+        trade = tester._simulate_trade("THYAO.IS", day["open"], day["low"] - 1, day["high"] + 1,
+                                       "2026-09-15", capital=10000, risk_pct=0.01, bar=bar)
+
+        assert bar == (day["high"], day["low"], day["close"])
+        assert trade["exit_price"] == round(day["close"] * 0.999, 2)
+        assert tester._bar_on_date(history, "THYAO.IS", "2026-09-13") is None
@@ -0,0 +1,59 @@
+"""
+Swing Level Tests
+Vectorized swing detection and level clustering against the plain loops
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.swing_levels import rolling_strongest_level, strongest_level, swing_points
+
+
+@pytest.fixture
+def lows():
+    rng = np.random.default_rng(9)
+    return 100 + np.cumsum(rng.normal(0, 1, 400))
+
+
+def loop_strongest(levels, tolerance):
+    """Reference: count touches of every level against every other"""
+    best, most = None, 0
+    for level in levels:
+        touches = sum(abs(other - level) / level < tolerance for other in levels)
+        if touches > most:
+            best, most = level, touches
+    return best, most
+
+
+class TestSwingLevels:
+    """Test swing points and support/resistance clustering"""
+
+    def test_swing_points_match_centered_window(self, lows):
+        """A swing is the extreme of its centered window, like rolling(center=True)"""
+        series = pd.Series(lows)
+        for window in (5, 20):
+            expected = (series == series.rolling(window, center=True).min()).to_numpy()
+            left = window // 2
+            np.testing.assert_array_equal(swing_points(lows, left, window - 1 - left), expected)
+
+        highs = swing_points(lows, 2, kind="high")
+        assert highs.any() and not (highs & swing_points(lows, 2)).any()
+
+    def test_strongest_level_matches_loop(self, lows):
+        """The sorted sweep finds the level and touch count of the pairwise loop"""
+        levels = lows[swing_points(lows, 2)]
+        for tolerance in (0.005, 0.015, 0.05):
+            assert strongest_level(levels, tolerance) == pytest.approx(loop_strongest(levels, tolerance))
+        assert strongest_level([], 0.015) == (None, 0)
+
+    def test_rolling_levels_use_only_the_trailing_window(self, lows):
+        """Every bar gets the strongest swing of its own last 30 bars"""
+        levels, touches = rolling_strongest_level(lows, window=30, order=2, tolerance=0.015)
+
+        for t in range(0, len(lows), 7):
+            window = lows[max(0, t - 29):t + 1]
+            expected = loop_strongest(window[swing_points(window, 2)], 0.015)
+            if expected[0] is None:
+                assert touches[t] == 0 and np.isnan(levels[t])
+            else:
+                assert (levels[t], touches[t]) == pytest.approx(expected)
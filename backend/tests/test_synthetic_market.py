@@ -0,0 +1,95 @@
+"""
+Synthetic Market Tests
+Determinism, shape and cross-ticker behaviour of the mock data generator
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.synthetic_market import EPOCH, SyntheticMarket, bar_count
+
+
+END = pd.Timestamp("2026-10-16 18:00", tz="Europe/Istanbul")
+
+
+@pytest.fixture
+def market():
+    """Generator with a fixed seed"""
+    return SyntheticMarket(seed=7, base_prices={"THYAO.IS": 320.0})
+
+
+class TestSyntheticMarket:
+    """Test generated OHLCV universes"""
+
+    def test_same_seed_same_data(self, market):
+        """Repeated calls and fresh generators return identical frames"""
+        first = market.generate(["THYAO.IS"], "1d", "3mo", end=END)["THYAO.IS"]
+        again = SyntheticMarket(seed=7, base_prices={"THYAO.IS": 320.0}).generate(
+            ["THYAO.IS"], "1d", "3mo", end=END
+        )["THYAO.IS"]
+        other_seed = SyntheticMarket(seed=8).generate(["THYAO.IS"], "1d", "3mo", end=END)["THYAO.IS"]
+
+        assert first.equals(again)
+        assert not first["close"].equals(other_seed["close"])
+
+    def test_ticker_independent_of_universe(self, market):
+        """A ticker's bars do not depend on the other requested tickers"""
+        alone = market.generate(["GARAN.IS"], "1h", bars=200, end=END)["GARAN.IS"]
+        together = market.generate(market.universe(50) + ["GARAN.IS"], "1h", bars=200, end=END)
+
+        assert alone.equals(together["GARAN.IS"])
+
+    def test_bars_are_valid_ohlcv(self, market):
+        """High/low bracket open/close, volume is positive, index is sorted"""
+        frames = market.generate(market.universe(20), "5m", "5d", end=END)
+
+        for df in frames.values():
+            assert len(df) == bar_count("5m", "5d")
+            assert df.index.is_monotonic_increasing
+            assert str(df.index.tz) == "Europe/Istanbul"
+            assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+            assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+            assert (df["volume"] > 0).all()
+
+    def test_intraday_bars_stay_in_session(self, market):
+        """Intraday bars fall on weekdays between 10:00 and 18:00"""
+        df = market.generate(["THYAO.IS"], "15m", "1mo", end=END)["THYAO.IS"]
+
+        assert (df.index.dayofweek < 5).all()
+        assert df.index.hour.min() >= 10
+        assert df.index.hour.max() < 18
+
+    def test_tickers_are_correlated(self, market):
+        """The shared market factor gives positive average correlation"""
+        opens, highs, lows, closes, volumes = market.generate_arrays(market.universe(40), "1d", 500)
+        returns = np.diff(np.log(closes), axis=0)
+        corr = np.corrcoef(returns.T)
+
+        assert closes.shape == (500, 40)
+        assert corr[np.triu_indices(40, 1)].mean() > 0.2
+
+    def test_base_price_anchors_the_epoch(self, market):
+        """Known tickers sit at their configured price at EPOCH and move from there"""
+        df = market.generate(["THYAO.IS"], "1d", "1y", end=END)["THYAO.IS"]
+        later = market.generate(["THYAO.IS"], "1d", "1y", end=END + pd.Timedelta(days=7))["THYAO.IS"]
+
+        assert df.loc[EPOCH, "close"] == pytest.approx(320.0)
+        assert df["close"].iloc[-1] != pytest.approx(320.0)
+        assert later["close"].iloc[-1] != df["close"].iloc[-1]
+
+    @pytest.mark.parametrize("interval,bars,days", [("1m", 600, 3), ("1h", 100, 3), ("1d", 300, 3), ("1wk", 50, 14)])
+    def test_later_end_extends_history(self, market, interval, bars, days):
+        """Two calls with different ends agree on every bar they share"""
+        first = market.generate(["THYAO.IS", "GARAN.IS"], interval, bars=bars, end=END)
+        later = market.generate(["THYAO.IS"], interval, bars=bars, end=END + pd.Timedelta(days=days, minutes=7))
+        shared = first["THYAO.IS"].index.intersection(later["THYAO.IS"].index)
+
+        assert len(shared) > 0 and later["THYAO.IS"].index[-1] > first["THYAO.IS"].index[-1]
+        assert first["THYAO.IS"].loc[shared].equals(later["THYAO.IS"].loc[shared])
+
+    def test_intraday_sessions_close_at_the_daily_close(self, market):
+        """The last hourly bar of a session closes where the daily bar does"""
+        daily = market.generate(["THYAO.IS"], "1d", bars=5, end=END)["THYAO.IS"]
+        hourly = market.generate(["THYAO.IS"], "1h", bars=40, end=END)["THYAO.IS"]
+
+        np.testing.assert_allclose(hourly["close"][hourly.index.hour == 17].tail(5), daily["close"])
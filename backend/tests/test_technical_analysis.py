@@ -0,0 +1,189 @@
+"""
+Technical Analysis Tests
+Lazy indicator selection, indicator memo, compact frames, latest values
+and trend channels
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.frame_cache import frame_nbytes
+from app.services.synthetic_market import SyntheticMarket
+from app.services.technical_analysis import TechnicalAnalysis, TrendChannelIndicator
+
+
+END = pd.Timestamp("2026-10-16 18:00", tz="Europe/Istanbul")
+
+
+@pytest.fixture
+def ta():
+    return TechnicalAnalysis()
+
+
+@pytest.fixture
+def bars():
+    """One year of daily bars"""
+    return SyntheticMarket(seed=5).generate(["THYAO.IS"], "1d", "1y", end=END)["THYAO.IS"]
+
+
+class TestIndicatorSelection:
+    """Test calculate() with named indicator sets"""
+
+    def test_only_requested_columns(self, ta, bars):
+        """RSI and MACD add their own columns and nothing else"""
+        df = ta.calculate(bars, ["rsi", "macd"])
+
+        added = [c for c in df.columns if c not in bars.columns]
+        assert added == ["rsi", "macd", "macd_signal", "macd_histogram"]
+        assert list(bars.columns) == ["open", "high", "low", "close", "volume"]
+
+    def test_prerequisites_and_aliases(self, ta):
+        """Columns and groups resolve to registry entries, prerequisites come first"""
+        assert ta.resolve_indicators(["bb_upper"]) == ["sma_20", "bollinger"]
+        assert ta.resolve_indicators(["ema", "stoch_d"]) == ["ema_9", "ema_21", "ema_50", "ema_200", "stochastic"]
+        assert ta.resolve_indicators(None) == list(TechnicalAnalysis.INDICATOR_REGISTRY)
+
+        with pytest.raises(ValueError):
+            ta.resolve_indicators(["ichimoku_cloud"])
+
+    def test_subset_matches_full_calculation(self, ta, bars):
+        """Selected columns have the same values as calculate_all_indicators"""
+        full = ta.calculate_all_indicators(bars)
+        subset = ta.calculate(bars, ["bollinger", "ema_21", "adx"])
+
+        for column in subset.columns:
+            np.testing.assert_array_equal(subset[column].to_numpy(), full[column].to_numpy())
+
+
+class TestIndicatorMemo:
+    """Test memoized indicator frames keyed by the last bar"""
+
+    def test_unchanged_bars_hit_the_memo(self, ta, bars):
+        """A second request for the same bars is served without recomputing"""
+        TechnicalAnalysis.clear_memo()
+        before = TechnicalAnalysis.get_memo_stats()
+
+        first = ta.calculate_all_indicators(bars, key="THYAO.IS_1d_1y")
+        second = TechnicalAnalysis().calculate_all_indicators(bars.copy(), key="THYAO.IS_1d_1y")
+
+        stats = TechnicalAnalysis.get_memo_stats()
+        assert stats['hits'] - before['hits'] == 1
+        assert stats['misses'] - before['misses'] == 1
+        pd.testing.assert_frame_equal(first, second)
+        # Served frames are read-only views of the memo
+        with pytest.raises(ValueError):
+            second['rsi'].values[-1] = 0.0
+
+    def test_new_bar_data_recomputes(self, ta, bars):
+        """A changed last close or a different indicator set is a miss"""
+        TechnicalAnalysis.clear_memo()
+        ta.calculate(bars, ["rsi"], key="THYAO.IS_1d_1y")
+
+        forming = bars.copy()
+        forming.iloc[-1, forming.columns.get_loc('close')] += 1.0
+        before = TechnicalAnalysis.get_memo_stats()
+        updated = ta.calculate(forming, ["rsi"], key="THYAO.IS_1d_1y")
+        ta.calculate(bars, ["macd"], key="THYAO.IS_1d_1y")
+
+        stats = TechnicalAnalysis.get_memo_stats()
+        assert stats['misses'] - before['misses'] == 2
+        assert stats['hits'] == before['hits']
+        assert updated['rsi'].iat[-1] == ta.calculate(forming, ["rsi"])['rsi'].iat[-1]
+
+
+class TestCompactFrames:
+    """Test float32 indicator frames"""
+
+    def test_one_float32_block_with_half_the_memory(self, ta, bars):
+        """Compact frames hold the float64 values, rounded, in one block"""
+        full = ta.calculate_all_indicators(bars)
+        compact = ta.calculate_all_indicators(bars, compact=True)
+
+        assert list(compact.columns) == list(full.columns)
+        assert set(compact.dtypes) == {np.dtype(np.float32)}
+        assert compact._mgr.nblocks == 1
+        assert compact['close'].to_numpy().flags['C_CONTIGUOUS']
+        assert frame_nbytes(compact) < 0.6 * frame_nbytes(full)
+        np.testing.assert_allclose(compact.to_numpy(), full.to_numpy(), rtol=1e-6, equal_nan=True)
+
+    def test_memo_keeps_precisions_apart(self, ta, bars):
+        """The memo stores the compact block as it is, under its own key"""
+        TechnicalAnalysis.clear_memo()
+        ta.calculate(bars, ["rsi"], key="THYAO.IS_1d_1y")
+        compact = ta.calculate(bars, ["rsi"], key="THYAO.IS_1d_1y", compact=True)
+        cached = ta.calculate(bars, ["rsi"], key="THYAO.IS_1d_1y", compact=True)
+
+        assert TechnicalAnalysis.get_memo_stats()['entries'] == 2
+        assert compact['rsi'].dtype == np.float32 and cached._mgr.nblocks == 1
+        with pytest.raises(ValueError):
+            cached['rsi'].values[-1] = 0.0
+
+
+class TestLatestIndicators:
+    """Test the last-row extraction used by the screener and websocket"""
+
+    def test_fast_path_matches_row_lookup(self, ta, bars):
+        """Array read and Series lookup give the same nested values"""
+        df = ta.calculate_all_indicators(bars)
+        latest = ta.get_latest_indicators(df)
+
+        assert latest == ta.format_latest_indicators(df.iloc[-1])
+        assert list(latest) == list(TechnicalAnalysis.LATEST_GROUPS)
+        assert latest['momentum']['rsi'] == df['rsi'].iat[-1]
+        assert type(latest['trend']['ema_9']) is float
+
+    def test_mixed_and_single_block_frames(self, ta, bars):
+        """Integer and text columns give the same values; layouts are cached in a bounded LRU"""
+        df = ta.calculate_all_indicators(bars)
+        mixed = df.assign(volume=df['volume'].astype('int64'), bar=np.arange(len(df)))
+        expected = ta.format_latest_indicators(df.iloc[-1])
+
+        assert ta.get_latest_indicators(mixed) == expected
+        assert ta.get_latest_indicators(mixed.assign(ticker="THYAO.IS")) == expected
+        assert ta.get_latest_indicators(ta.calculate_all_indicators(bars, key="THYAO.IS_1d_1y")) == expected
+        np.testing.assert_array_equal(TechnicalAnalysis.latest_values(df), TechnicalAnalysis.latest_values(mixed))
+        assert TechnicalAnalysis._latest_layout.cache_info().maxsize == 64
+
+    def test_memo_hits_return_the_stored_row(self, ta, bars, monkeypatch):
+        """calculate_with_latest reads the last row once, when the memo entry is stored"""
+        TechnicalAnalysis.clear_memo()
+        frame, latest = ta.calculate_with_latest(bars, key="THYAO.IS_1d_1y")
+
+        def unexpected_read(df):
+            raise AssertionError("last row read again on a memo hit")
+
+        monkeypatch.setattr(TechnicalAnalysis, "latest_values", unexpected_read)
+        cached_frame, cached = ta.calculate_with_latest(bars.copy(), key="THYAO.IS_1d_1y")
+
+        assert latest == cached == ta.format_latest_indicators(frame.iloc[-1])
+        pd.testing.assert_frame_equal(frame, cached_frame)
+        assert ta.calculate_with_latest(bars, ["rsi"])[1]['momentum']['rsi'] == latest['momentum']['rsi']
+
+    def test_missing_and_warm_up_values_are_none(self, ta, bars):
+        """Columns not calculated or still NaN come out as None"""
+        latest = ta.get_latest_indicators(ta.calculate(bars.iloc[:16], ["rsi", "sma_20"]))
+
+        assert latest['momentum']['rsi'] is not None
+        assert latest['trend']['sma_20'] is None
+        assert latest['volume'] == {'obv': None, 'vwap': None, 'mfi': None}
+
+
+class TestTrendChannel:
+    """Test the per-bar trend channel"""
+
+    def test_rolling_rows_match_last_bar_analysis(self, bars):
+        """Row t equals the channel of the frame that ends at bar t"""
+        rolling = TrendChannelIndicator(bars, 20).get_rolling_channel()
+
+        assert rolling['support'].iloc[:19].isna().all() and rolling['trend'].iloc[18] is None
+        for t in (19, 60, 150, len(bars) - 1):
+            indicator = TrendChannelIndicator(bars.iloc[:t + 1], 20)
+            position = indicator.get_price_position_in_channel()
+            row = rolling.iloc[t]
+
+            assert row['support'] == pytest.approx(position['support'], rel=1e-9)
+            assert row['resistance'] == pytest.approx(position['resistance'], rel=1e-9)
+            assert row['position'] == pytest.approx(position['position'], abs=1e-7)
+            assert row['width_percent'] == pytest.approx(indicator.calculate_channel_width()['width_percent'], rel=1e-9)
+            assert row['trend'] == indicator.get_trend_direction()
+            assert row['breakout'] == indicator.detect_breakout()['type']
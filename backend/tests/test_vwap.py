@@ -0,0 +1,91 @@
+"""
+Session VWAP Tests
+Session resets, anchored VWAP and the incremental engine against the batch path
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import indicator_kernels as kernels
+from app.services.synthetic_market import SyntheticMarket
+from app.services.technical_analysis import TechnicalAnalysis
+from app.services.vwap import VwapEngine, anchored_vwap, session_ids
+
+
+END = pd.Timestamp("2026-10-16 18:00", tz="Europe/Istanbul")
+
+
+@pytest.fixture
+def bars():
+    """Four sessions of 5m bars"""
+    return SyntheticMarket(seed=8).generate(["THYAO.IS"], "5m", bars=380, end=END)["THYAO.IS"]
+
+
+def typical_vwap(df):
+    tp = (df['high'] + df['low'] + df['close']) / 3
+    return (tp * df['volume']).sum() / df['volume'].sum()
+
+
+class TestSessionVwap:
+    """Test the batch session and anchored VWAP"""
+
+    def test_restarts_every_session(self, bars):
+        """Each bar's VWAP only averages its own Istanbul trading day"""
+        vwap = TechnicalAnalysis().calculate(bars, ['vwap'])['vwap']
+        days = bars.index.normalize()
+
+        assert len(days.unique()) == 4
+        for day in days.unique():
+            session = bars[days == day]
+            assert vwap[session.index[0]] == pytest.approx(typical_vwap(session.iloc[:1]))
+            assert vwap[session.index[-1]] == pytest.approx(typical_vwap(session))
+
+    def test_daily_bars_average_the_whole_frame(self):
+        """Bars on separate days form one session, like before"""
+        daily = SyntheticMarket(seed=8).generate(["THYAO.IS"], "1d", "3mo", end=END)["THYAO.IS"]
+
+        assert session_ids(daily.index) is None
+        vwap = TechnicalAnalysis().calculate(daily, ['vwap'])['vwap']
+        assert vwap.iat[-1] == pytest.approx(typical_vwap(daily))
+
+    def test_anchored_from_timestamp(self, bars):
+        """The anchored VWAP starts at the first bar at or after the anchor"""
+        anchor = bars.index[100] - pd.Timedelta(minutes=2)
+        result = anchored_vwap(bars, anchor.tz_localize(None))
+
+        assert result.iloc[:100].isna().all()
+        assert result.iat[-1] == pytest.approx(typical_vwap(bars.iloc[100:]))
+
+    def test_session_cumsum_columns(self):
+        """Each column restarts on its own session changes"""
+        values = np.ones((5, 2))
+        sessions = np.array([[0, 7], [0, 7], [1, 7], [1, 8], [1, 8]])
+
+        np.testing.assert_array_equal(kernels.session_cumsum(values, sessions), [[1, 1], [2, 2], [1, 3], [2, 1], [3, 2]])
+
+
+class TestVwapEngine:
+    """Test the incremental VWAP engine"""
+
+    def test_matches_batch_at_every_bar(self, bars):
+        """Streaming bars, including a forming candle, gives the batch values"""
+        anchor = bars.index[150]
+        expected = TechnicalAnalysis().calculate(bars, ['vwap'])['vwap'].to_numpy()
+        expected_anchor = anchored_vwap(bars, anchor).to_numpy()
+
+        engine = VwapEngine(anchors={'open': anchor})
+        for i, (ts, row) in enumerate(bars.iterrows()):
+            engine.update(ts, row['open'], row['open'], row['open'], row['volume'] / 3)
+            values = engine.update(ts, row['high'], row['low'], row['close'], row['volume'])
+
+            assert values['vwap'] == pytest.approx(expected[i], rel=1e-9)
+            np.testing.assert_allclose(values['anchored_open'], expected_anchor[i], rtol=1e-9)
+
+    def test_anchor_on_next_bar(self, bars):
+        """anchor() without a time starts with the next new bar"""
+        engine = VwapEngine.from_frame(bars.iloc[:200])
+        engine.anchor('entry')
+        row = bars.iloc[200]
+        values = engine.update(bars.index[200], row['high'], row['low'], row['close'], row['volume'])
+
+        assert values['anchored_entry'] == pytest.approx((row['high'] + row['low'] + row['close']) / 3)
@@ -8,10 +8,14 @@ import pandas as pd
 import numpy as np
 from typing import Tuple, List, Dict
 
+from app.services import indicator_kernels as kernels
+from app.services.candlestick_patterns import BULLISH_PATTERNS, scan_bullish_patterns
+from app.services.swing_levels import rolling_strongest_level, strongest_level, swing_points
 
-def check_bullish_candlestick_patterns(df: pd.DataFrame, idx: int) -> Tuple[bool, List[str], int]:
+
+def check_bullish_candlestick_patterns(df: pd.DataFrame, idx: int, prepared: Dict = None) -> Tuple[bool, List[str], int]:
     """
-    YÜKSELİŞ MUM KALIPLARIsend
+    YÜKSELİŞ MUM KALIPLARI
     
     En güçlü 5 bullish pattern:
     1. Bullish Engulfing - En güçlü geri dönüş
@@ -20,74 +24,38 @@ def check_bullish_candlestick_patterns(df: pd.DataFrame, idx: int) -> Tuple[bool
     4. Three White Soldiers - Güçlü momentum
     5. Piercing Pattern - Geri dönüş konfirmasyonu
     
+    Tüm seri scan_bullish_patterns ile tek geçişte taranır; burada sadece
+    idx satırına bakılır.
+    
+    Args:
+        prepared: prepare_boosters(df) sonucu (yoksa sadece son 3 mum taranır)
+    
     Returns:
         (has_pattern, pattern_names, score)
     """
     if idx < 3:
         return False, [], 0
     
-    patterns = []
-    score = 0
-    
-    # Son 3 mumu al
-    bars = df.iloc[idx-2:idx+1]
-    
-    o1, h1, l1, c1 = bars.iloc[0][['Open', 'High', 'Low', 'Close']]
-    o2, h2, l2, c2 = bars.iloc[1][['Open', 'High', 'Low', 'Close']]
-    o3, h3, l3, c3 = bars.iloc[2][['Open', 'High', 'Low', 'Close']]
-    
-    body1 = abs(c1 - o1)
-    body2 = abs(c2 - o2)
-    body3 = abs(c3 - o3)
-    
-    # 1. BULLISH ENGULFING (En güçlü - 40 puan)
-    if (c2 < o2) and (c3 > o3) and (c3 > o2) and (o3 < c2) and (body3 > body2 * 1.5):
-        patterns.append("Bullish Engulfing")
-        score += 40
-    
-    # 2. MORNING STAR (35 puan)
-    if (c1 < o1) and (body2 < body1 * 0.3) and (c3 > o3) and (c3 > (o1 + c1) / 2):
-        patterns.append("Morning Star")
-        score += 35
-    
-    # 3. HAMMER (30 puan)
-    lower_shadow = min(o3, c3) - l3
-    upper_shadow = h3 - max(o3, c3)
-    if body3 > 0 and lower_shadow > body3 * 2 and upper_shadow < body3 * 0.5:
-        patterns.append("Hammer")
-        score += 30
-    
-    # 4. THREE WHITE SOLDIERS (35 puan)
-    if (c1 > o1) and (c2 > o2) and (c3 > o3) and (c3 > c2 > c1):
-        # Her biri öncekinden yüksek kapanış
-        if (c2 > c1 * 1.005) and (c3 > c2 * 1.005):
-            patterns.append("Three White Soldiers")
-            score += 35
-    
-    # 5. PIERCING PATTERN (30 puan)
-    if (c1 < o1) and (c2 > o2) and (o2 < c1) and (c2 > (o1 + c1) / 2) and (c2 < o1):
-        patterns.append("Piercing Pattern")
-        score += 30
-    
-    # 6. BULLISH HARAMI (25 puan)
-    if (c1 < o1) and (c2 > o2) and (o2 > c1) and (c2 < o1) and (body2 < body1 * 0.7):
-        patterns.append("Bullish Harami")
-        score += 25
-    
-    # 7. DOJI AT SUPPORT (20 puan)
-    if body3 < (h3 - l3) * 0.1:  # Very small body
-        # Check if at support (low volume area)
-        recent_low = df['Low'].iloc[max(0, idx-20):idx].min()
-        if abs(l3 - recent_low) / recent_low < 0.02:
-            patterns.append("Doji at Support")
-            score += 20
+    if prepared is not None:
+        patterns, row = prepared['patterns'], idx
+    else:
+        # Sadece son 3 mum taranır; doji desteği önceki 20 barın dibi
+        opens, highs, lows, closes = (df[col].to_numpy()[idx-2:idx+1] for col in ('Open', 'High', 'Low', 'Close'))
+        support = np.array([np.nan, np.nan, df['Low'].to_numpy()[max(0, idx-20):idx].min()])
+        patterns, row = scan_bullish_patterns(opens, highs, lows, closes, support=support), 2
     
-    has_pattern = len(patterns) > 0
+    names = [name for name, hits in patterns.items() if hits[row]]
+    score = sum(BULLISH_PATTERNS[name] for name in names)
     
-    return has_pattern, patterns, score
+    return len(names) > 0, names, score
+
+
+def scan_frame_patterns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Bir OHLC tablosunun tüm barları için mum kalıpları"""
+    return scan_bullish_patterns(df['Open'].to_numpy(), df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy())
 
 
-def check_support_resistance_quality(df: pd.DataFrame, idx: int) -> Tuple[bool, int, List[str]]:
+def check_support_resistance_quality(df: pd.DataFrame, idx: int, prepared: Dict = None) -> Tuple[bool, int, List[str]]:
     """
     DESTEK/DİRENÇ KALİTE KONTROLÜ
     
@@ -96,6 +64,9 @@ def check_support_resistance_quality(df: pd.DataFrame, idx: int) -> Tuple[bool,
     - Son 2 dokunuşta tutmuş
     - İdeal mesafede
     
+    Args:
+        prepared: prepare_boosters(df) sonucu (opsiyonel, backtest için)
+    
     Returns:
         (quality_ok, score, reasons)
     """
@@ -105,13 +76,15 @@ def check_support_resistance_quality(df: pd.DataFrame, idx: int) -> Tuple[bool,
     reasons = []
     score = 0
     
-    highs = df['High'][:idx+1]
-    lows = df['Low'][:idx+1]
-    closes = df['Close'][:idx+1]
-    current_price = closes.iloc[-1]
+    highs = df['High'].to_numpy()[:idx+1]
+    lows = df['Low'].to_numpy()[:idx+1]
+    current_price = df['Close'].to_numpy()[idx]
     
     # === DESTEK KONTROLÜ ===
-    support_level, support_touches = find_support_level(lows.tail(30), tolerance=0.015)
+    if prepared is not None:
+        support_level, support_touches = _prepared_level(prepared, 'support', idx)
+    else:
+        support_level, support_touches = find_support_level(lows[-30:], tolerance=0.015)
     
     if support_level:
         dist_from_support = ((current_price - support_level) / support_level) * 100
@@ -134,7 +107,10 @@ def check_support_resistance_quality(df: pd.DataFrame, idx: int) -> Tuple[bool,
             reasons.append(f"⚠️ Destekten uzak (%{dist_from_support:.1f})")
     
     # === DİRENÇ KONTROLÜ ===
-    resistance_level, resistance_touches = find_resistance_level(highs.tail(30), tolerance=0.015)
+    if prepared is not None:
+        resistance_level, resistance_touches = _prepared_level(prepared, 'resistance', idx)
+    else:
+        resistance_level, resistance_touches = find_resistance_level(highs[-30:], tolerance=0.015)
     
     if resistance_level:
         dist_to_resistance = ((resistance_level - current_price) / current_price) * 100
@@ -160,8 +136,8 @@ def check_support_resistance_quality(df: pd.DataFrame, idx: int) -> Tuple[bool,
     # === BREAKOUT KONTROLÜ ===
     # Son 5 günde önemli bir breakout var mı?
     if idx >= 25:
-        prev_resistance = highs.iloc[idx-25:idx-5].max()
-        recent_high = highs.iloc[-5:].max()
+        prev_resistance = highs[idx-25:idx-5].max()
+        recent_high = highs[-5:].max()
         
         if recent_high > prev_resistance * 1.02:  # %2+ breakout
             score += 15
@@ -172,92 +148,90 @@ def check_support_resistance_quality(df: pd.DataFrame, idx: int) -> Tuple[bool,
     return quality_ok, score, reasons
 
 
-def find_support_level(lows: pd.Series, tolerance: float = 0.015, min_touches: int = 3) -> Tuple[float, int]:
+def find_support_level(lows, tolerance: float = 0.015, min_touches: int = 3) -> Tuple[float, int]:
     """
     En güçlü destek seviyesini bul
     
+    Args:
+        lows: Dip fiyatları (Series veya dizi)
+    
     Returns:
         (support_level, touch_count)
     """
+    lows = np.asarray(lows, dtype=float)
     if len(lows) < 10:
         return None, 0
     
-    # Swing low'ları bul
-    swing_lows = []
-    for i in range(2, len(lows)-2):
-        if lows.iloc[i] <= lows.iloc[i-1] and lows.iloc[i] <= lows.iloc[i+1]:
-            if lows.iloc[i] <= lows.iloc[i-2] and lows.iloc[i] <= lows.iloc[i+2]:
-                swing_lows.append((i, lows.iloc[i]))
-    
-    if len(swing_lows) < min_touches:
-        return None, 0
-    
-    # En çok dokunulan seviyeyi bul
-    best_level = None
-    max_touches = 0
-    
-    for idx, level in swing_lows:
-        touches = 0
-        for _, other_level in swing_lows:
-            if abs(other_level - level) / level < tolerance:
-                touches += 1
-        
-        if touches > max_touches:
-            max_touches = touches
-            best_level = level
-    
-    if max_touches >= min_touches:
-        return best_level, max_touches
+    # Swing low'lar (her iki yanda 2 bar) ve en çok dokunulan seviye
+    level, touches = strongest_level(lows[swing_points(lows, 2, kind='low')], tolerance)
+    if touches >= min_touches:
+        return level, touches
     
     return None, 0
 
 
-def find_resistance_level(highs: pd.Series, tolerance: float = 0.015, min_touches: int = 3) -> Tuple[float, int]:
+def find_resistance_level(highs, tolerance: float = 0.015, min_touches: int = 3) -> Tuple[float, int]:
     """
     En güçlü direnç seviyesini bul
     
+    Args:
+        highs: Tepe fiyatları (Series veya dizi)
+    
     Returns:
         (resistance_level, touch_count)
     """
+    highs = np.asarray(highs, dtype=float)
     if len(highs) < 10:
         return None, 0
     
-    # Swing high'ları bul
-    swing_highs = []
-    for i in range(2, len(highs)-2):
-        if highs.iloc[i] >= highs.iloc[i-1] and highs.iloc[i] >= highs.iloc[i+1]:
-            if highs.iloc[i] >= highs.iloc[i-2] and highs.iloc[i] >= highs.iloc[i+2]:
-                swing_highs.append((i, highs.iloc[i]))
-    
-    if len(swing_highs) < min_touches:
-        return None, 0
-    
-    # En çok dokunulan seviyeyi bul
-    best_level = None
-    max_touches = 0
+    # Swing high'lar (her iki yanda 2 bar) ve en çok dokunulan seviye
+    level, touches = strongest_level(highs[swing_points(highs, 2, kind='high')], tolerance)
+    if touches >= min_touches:
+        return level, touches
     
-    for idx, level in swing_highs:
-        touches = 0
-        for _, other_level in swing_highs:
-            if abs(other_level - level) / level < tolerance:
-                touches += 1
-        
-        if touches > max_touches:
-            max_touches = touches
-            best_level = level
+    return None, 0
+
+
+def prepare_boosters(df: pd.DataFrame) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Tüm seri için booster ön hesaplaması (backtest'te her hisse için bir kez)
     
-    if max_touches >= min_touches:
-        return best_level, max_touches
+    Her bar için mum kalıpları, RSI/MACD histogramı ve son 30 barın en
+    güçlü destek/direnç seviyesi tek geçişte bulunur (hepsi sadece geçmiş
+    barları kullanır); check_* fonksiyonları (df, idx, prepared) ile sadece
+    idx satırını okur.
     
+    Returns:
+        {'patterns': {kalıp: bool dizisi}, 'rsi', 'macd_histogram',
+         'support': (levels, touches), 'resistance': (levels, touches)}
+    """
+    close = df['Close'].to_numpy()
+    return {
+        'patterns': scan_frame_patterns(df),
+        'rsi': kernels.rsi(close, 14),
+        'macd_histogram': kernels.macd(close, 12, 26, 9)[2],
+        'support': rolling_strongest_level(df['Low'].to_numpy(), window=30, order=2, tolerance=0.015, kind='low'),
+        'resistance': rolling_strongest_level(df['High'].to_numpy(), window=30, order=2, tolerance=0.015, kind='high'),
+    }
+
+
+def _prepared_level(prepared: Dict, side: str, idx: int, min_touches: int = 3) -> Tuple[float, int]:
+    """Ön hesaplanmış seviyeyi find_*_level ile aynı biçimde döndür"""
+    levels, touches = prepared[side]
+    if touches[idx] >= min_touches:
+        return float(levels[idx]), int(touches[idx])
     return None, 0
 
 
-def check_momentum_alignment(df: pd.DataFrame, idx: int) -> Tuple[bool, int, List[str]]:
+def check_momentum_alignment(df: pd.DataFrame, idx: int, prepared: Dict = None) -> Tuple[bool, int, List[str]]:
     """
     ÇOKLU MOMENTUM UYUMU
     
     RSI, MACD ve Stochastic aynı yönde mi?
     
+    Args:
+        prepared: prepare_boosters(df) sonucu (RSI/MACD tüm seri için hazır)
+    
     Returns:
         (aligned, score, reasons)
     """
@@ -267,11 +241,13 @@ def check_momentum_alignment(df: pd.DataFrame, idx: int) -> Tuple[bool, int, Lis
     reasons = []
     score = 0
     
-    close = df['Close'][:idx+1]
+    close = df['Close'].to_numpy()[:idx+1]
     
-    # 1. RSI Momentum (14 ve 28 period)
-    rsi_14 = calculate_rsi(close, 14).iloc[-1]
-    rsi_14_prev = calculate_rsi(close, 14).iloc[-2]
+    # 1. RSI Momentum (14 ve 28 period) - tek hesap, son iki değer
+    if prepared is not None:
+        rsi_14_prev, rsi_14 = prepared['rsi'][idx-1:idx+1]
+    else:
+        rsi_14_prev, rsi_14 = kernels.rsi(close, 14)[-2:]
     
     rsi_momentum_up = rsi_14 > rsi_14_prev and 35 <= rsi_14 <= 65
     
@@ -284,12 +260,11 @@ def check_momentum_alignment(df: pd.DataFrame, idx: int) -> Tuple[bool, int, Lis
     
     # 2. MACD Histogram
     try:
-        macd_line = calculate_ema(close, 12) - calculate_ema(close, 26)
-        signal_line = calculate_ema(macd_line, 9)
-        histogram = macd_line - signal_line
-        
-        hist_current = histogram.iloc[-1]
-        hist_prev = histogram.iloc[-2]
+        if prepared is not None:
+            histogram = prepared['macd_histogram'][:idx+1]
+        else:
+            _, _, histogram = kernels.macd(close, 12, 26, 9)
+        hist_prev, hist_current = histogram[-2:]
         
         macd_improving = hist_current > hist_prev and hist_current > 0
         
@@ -303,11 +278,11 @@ def check_momentum_alignment(df: pd.DataFrame, idx: int) -> Tuple[bool, int, Lis
         pass
     
     # 3. Price momentum (son 5 gün slope)
-    recent_close = close.tail(5)
-    price_momentum_up = recent_close.iloc[-1] > recent_close.iloc[0]
+    recent_close = close[-5:]
+    price_momentum_up = recent_close[-1] > recent_close[0]
     
     if price_momentum_up:
-        pct_change = ((recent_close.iloc[-1] - recent_close.iloc[0]) / recent_close.iloc[0]) * 100
+        pct_change = ((recent_close[-1] - recent_close[0]) / recent_close[0]) * 100
         if pct_change > 2:
             score += 25
             reasons.append(f"✅ Güçlü fiyat momentumu (+%{pct_change:.1f})")
@@ -321,22 +296,18 @@ def check_momentum_alignment(df: pd.DataFrame, idx: int) -> Tuple[bool, int, Lis
 
 
 def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
-    """RSI hesapla"""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / (loss + 1e-10)
-    return 100 - (100 / (1 + rs))
+    """RSI hesapla (ortak çekirdek: app.services.indicator_kernels)"""
+    return pd.Series(kernels.rsi(prices.to_numpy(), period), index=prices.index)
 
 
 def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
-    """EMA hesapla"""
-    return prices.ewm(span=period, adjust=False).mean()
+    """EMA hesapla (ortak çekirdek: app.services.indicator_kernels)"""
+    return pd.Series(kernels.ema(prices.to_numpy(), period), index=prices.index)
 
 
 # ================== HIZLI ENTEGRASYON ==================
 
-def apply_win_rate_boosters(df: pd.DataFrame, idx: int, current_score: int) -> Tuple[int, List[str]]:
+def apply_win_rate_boosters(df: pd.DataFrame, idx: int, current_score: int, prepared: Dict = None) -> Tuple[int, List[str]]:
     """
     Tüm booster'ları uygula ve skoru güncelle
     
@@ -346,6 +317,10 @@ def apply_win_rate_boosters(df: pd.DataFrame, idx: int, current_score: int) -> T
         if final_score >= 75:  # Yükseltilmiş threshold
             # Trade'e gir
     
+    Args:
+        prepared: prepare_boosters(df) sonucu - aynı seride çok sayıda idx
+            değerlendirilecekse bir kez hesaplanıp verilir
+    
     Returns:
         (boosted_score, all_reasons)
     """
@@ -353,19 +328,19 @@ def apply_win_rate_boosters(df: pd.DataFrame, idx: int, current_score: int) -> T
     bonus_score = 0
     
     # 1. Candlestick Pattern Boost (+40 puan max)
-    has_pattern, patterns, pattern_score = check_bullish_candlestick_patterns(df, idx)
+    has_pattern, patterns, pattern_score = check_bullish_candlestick_patterns(df, idx, prepared)
     if has_pattern:
         bonus_score += min(pattern_score, 40)
         all_reasons.append(f"📊 Pattern: {', '.join(patterns)}")
     
     # 2. S/R Quality Boost (+55 puan max)
-    sr_ok, sr_score, sr_reasons = check_support_resistance_quality(df, idx)
+    sr_ok, sr_score, sr_reasons = check_support_resistance_quality(df, idx, prepared)
     if sr_ok:
         bonus_score += min(sr_score, 55)
         all_reasons.extend(sr_reasons)
     
     # 3. Momentum Alignment Boost (+35 puan max)
-    momentum_ok, momentum_score, momentum_reasons = check_momentum_alignment(df, idx)
+    momentum_ok, momentum_score, momentum_reasons = check_momentum_alignment(df, idx, prepared)
     if momentum_ok:
         bonus_score += min(momentum_score, 35)
         all_reasons.extend(momentum_reasons)
@@ -1,9 +1,23 @@
 #!/usr/bin/env python3
+import os
+import importlib.util
 import yfinance as yf
 import json
 from datetime import datetime
 import psycopg2
 
+
+def load_kernels():
+    """Load backend indicator_kernels by file path (the app package __init__ pulls in settings and services)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend', 'app', 'services', 'indicator_kernels.py')
+    spec = importlib.util.spec_from_file_location('indicator_kernels', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+kernels = load_kernels()
+
 SYMBOLS = [
     'THYAO.IS', 'GARAN.IS', 'ASELS.IS', 'EREGL.IS', 'FROTO.IS',
     'AKBNK.IS', 'YKBNK.IS', 'KCHOL.IS', 'SAHOL.IS', 'SISE.IS',
@@ -17,11 +31,7 @@ data = yf.download(SYMBOLS, period='3mo', group_by='ticker', threads=True, progr
 def ema(prices, period):
     if len(prices) < period:
         return prices[-1] if prices else 0
-    mult = 2 / (period + 1)
-    result = sum(prices[:period]) / period
-    for p in prices[period:]:
-        result = (p * mult) + (result * (1 - mult))
-    return result
+    return kernels.ema_sma_seeded(prices, period)
 
 picks = []
 for symbol in SYMBOLS:
@@ -42,14 +52,7 @@ for symbol in SYMBOLS:
         ema200 = ema(closes, 200) if len(closes) >= 200 else ema50
         
         # RSI
-        gains, losses = [], []
-        for i in range(1, min(15, len(closes))):
-            diff = closes[-i] - closes[-i-1]
-            if diff > 0: gains.append(diff)
-            else: losses.append(abs(diff))
-        avg_gain = sum(gains) / 14 if gains else 0
-        avg_loss = sum(losses) / 14 if losses else 0.0001
-        rsi = 100 - (100 / (1 + (avg_gain / avg_loss)))
+        rsi = float(kernels.rsi(closes[-15:], 14)[-1])
         
         # MACD
         ema12 = ema(closes, 12)
@@ -60,12 +63,8 @@ for symbol in SYMBOLS:
         
         # ATR
         atr_val = curr * 0.025
-        if len(closes) >= 14:
-            trs = []
-            for i in range(-14, 0):
-                tr = max(highs[i] - lows[i], abs(highs[i] - closes[i-1]), abs(lows[i] - closes[i-1]))
-                trs.append(tr)
-            atr_val = sum(trs) / len(trs)
+        if len(closes) >= 15:
+            atr_val = float(kernels.atr(highs[-15:], lows[-15:], closes[-15:], 14)[-1])
         
         # SCORING (Backend ile senkron)
         score = 0